@@ -2,13 +2,71 @@ import os
 import re
 import json
 import logging
+from functools import lru_cache
 
 import openai
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _  # <-- Added for i18n
 
+from .response_cache import response_cache
+
+try:
+    import tiktoken
+except ImportError:  # Token counts fall back to an estimate
+    tiktoken = None
+
 logger = logging.getLogger(__name__)
 
+_MISSING = object()
+
+# Without tiktoken: one token per word, group of up to three digits or symbol
+_TOKEN_ESTIMATE_PATTERN = re.compile(r"[A-Za-z]+|\d{1,3}|[^\sA-Za-z\d]")
+# Per-message framing tokens of the chat format (role, separators) and the reply primer
+MESSAGE_OVERHEAD_TOKENS = 4
+REPLY_PRIMER_TOKENS = 3
+
+
+@lru_cache(maxsize=16)
+def _encoding(model: str):
+    """
+    The tiktoken encoding for `model`, or None when it can't be loaded.
+    tiktoken downloads the BPE file on first use (set TIKTOKEN_CACHE_DIR to
+    ship it), so offline workers get None once and use the estimate.
+    """
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        logger.warning(f"No tiktoken encoding for {model}; estimating token counts.", exc_info=True)
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-3.5-turbo") -> int:
+    """
+    Number of tokens `model` reads for `text`: exact when the tiktoken
+    encoding is available, otherwise an estimate close to cl100k for
+    prompt-style text.
+    """
+    encoding = _encoding(model)
+    if encoding is not None:
+        # Special-token text in user content is counted as plain text, not rejected
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(_TOKEN_ESTIMATE_PATTERN.findall(text))
+
+
+def count_message_tokens(messages, model: str = "gpt-3.5-turbo") -> int:
+    """
+    Prompt tokens of a chat_completion request.
+    """
+    return REPLY_PRIMER_TOKENS + sum(
+        MESSAGE_OVERHEAD_TOKENS + count_tokens(str(message.get("content", "")), model) for message in messages
+    )
+
+
 # Read API key from environment or Django settings
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "") or getattr(settings, "OPENAI_API_KEY", None)
 openai.api_key = OPENAI_API_KEY
@@ -62,6 +120,86 @@ def get_structure_openai_response(ai_response: str):
     return ai_response
 
 
+class JSONSectionParser:
+    """
+    Incremental parser for a JSON object that arrives in pieces (a streamed
+    completion). feed() returns every top-level (key, value) pair whose
+    value completed in that piece, so each section can be used as soon as
+    it closes instead of after the whole response.
+
+    Anything before the opening brace (e.g. a ```json fence) and after the
+    closing one is ignored. A value that isn't valid JSON is passed through
+    get_structure_openai_response.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.finished = False
+        self._in_string = False
+        self._escaped = False
+        self._buffer = []
+        self._pending_key = None
+        self._key = None
+
+    def feed(self, text: str):
+        sections = []
+        for char in text:
+            if self.finished:
+                break
+            if self.depth == 0:
+                if char == "{":
+                    self.depth = 1
+                continue
+
+            if self._in_string:
+                self._buffer.append(char)
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self.depth == 1 and self._key is None:
+                        self._pending_key = json.loads("".join(self._buffer))
+                        self._buffer = []
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._buffer.append(char)
+            elif self.depth == 1 and char == ":":
+                self._key, self._pending_key = self._pending_key, None
+                self._buffer = []
+            elif self.depth == 1 and char in ",}":
+                if self._key is not None:
+                    sections.append(self._emit())
+                self._buffer = []
+                if char == "}":
+                    self.depth = 0
+                    self.finished = True
+            elif char in "{[":
+                self.depth += 1
+                self._buffer.append(char)
+            elif char in "}]":
+                self.depth -= 1
+                self._buffer.append(char)
+                if self.depth == 1 and self._key is not None:
+                    # A nested section just closed: no need to wait for the comma
+                    sections.append(self._emit())
+            else:
+                self._buffer.append(char)
+        return sections
+
+    def _emit(self):
+        text = "".join(self._buffer).strip()
+        try:
+            value = json.loads(text)
+        except ValueError:
+            value = get_structure_openai_response(text)
+        key, self._key, self._buffer = self._key, None, []
+        return key, value
+
+
 class OpenAIAPI:
     """
     A wrapper around OpenAI's completion and embedding APIs.
@@ -70,16 +208,39 @@ class OpenAIAPI:
     def __init__(self):
         if not OPENAI_API_KEY:
             logger.warning("OpenAI API key not set; requests will fail.")
+        self._client = None
+
+    @property
+    def client(self) -> "openai.OpenAI":
+        """
+        The openai>=1.0 client, created on first use.
+        """
+        if self._client is None:
+            self._client = openai.OpenAI(api_key=OPENAI_API_KEY)
+        return self._client
 
-    def chat_completion(self, messages, model="gpt-3.5-turbo", temperature=0.7):
+    def chat_completion(self, messages, model="gpt-3.5-turbo", temperature=0.7, cache_timeout=None):
         """
         Given a list of messages (Django-style: [{"role":"user","content":"..."}]),
         call the OpenAI ChatCompletion API and return the assistant's content as a string.
+
+        With a cache_timeout (seconds), a successful response is cached for that
+        long and the same messages and parameters are answered from the cache.
         """
 
         if not OPENAI_API_KEY:
             return _("OpenAI API key is missing. Please set OPENAI_API_KEY.")
 
+        if cache_timeout:
+            key = response_cache.make_key(messages, model=model, temperature=temperature)
+            cached = response_cache.get(key, _MISSING)
+            if cached is not _MISSING:
+                return cached
+            structured = self.chat_completion(messages, model=model, temperature=temperature)
+            if not (isinstance(structured, dict) and "error" in structured):
+                response_cache.set(key, structured, cache_timeout)
+            return structured
+
         try:
             response = openai.ChatCompletion.create(
                 model=model,
@@ -93,6 +254,62 @@ class OpenAIAPI:
             logger.error(_("OpenAI chat_completion error: %s") % str(e))
             return {"error": _("OpenAI request failed"), "detail": str(e)}
 
+    def chat_completion_stream(self, messages, model="gpt-3.5-turbo", temperature=0.7, cache_timeout=None):
+        """
+        Like chat_completion, but streamed: yields the assistant's content as
+        text pieces as they arrive, unparsed. Yields nothing more once the
+        request fails (the error is logged).
+
+        With a cache_timeout, a completed stream is cached as one text and a
+        cached response is replayed as a single piece.
+        """
+
+        if not OPENAI_API_KEY:
+            logger.warning("OpenAI API key is missing.")
+            return
+
+        if cache_timeout:
+            key = response_cache.make_key(messages, model=model, temperature=temperature, stream=True)
+            cached = response_cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+            pieces = []
+            completed = False
+            for text in self._stream(messages, model, temperature):
+                if text is None:
+                    completed = True
+                    break
+                pieces.append(text)
+                yield text
+            if completed and pieces:
+                response_cache.set(key, "".join(pieces), cache_timeout)
+            return
+
+        for text in self._stream(messages, model, temperature):
+            if text is not None:
+                yield text
+
+    def _stream(self, messages, model, temperature):
+        """
+        The streamed text pieces, then None if the response completed.
+        """
+        try:
+            response = self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                stream=True,
+            )
+            for chunk in response:
+                # Some chunks (e.g. the final usage one) carry no choices
+                text = chunk.choices[0].delta.content if chunk.choices else None
+                if text:
+                    yield text
+            yield None
+        except Exception as e:
+            logger.error(_("OpenAI chat_completion_stream error: %s") % str(e))
+
     def generate_embedding(self, text, model="text-embedding-ada-002"):
         """
         Generate an embedding vector for the provided text using the OpenAI embedding API.
@@ -0,0 +1,67 @@
+import hashlib
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from predictions.services.chart_cache import ChartCache
+
+DEFAULT_MAXSIZE = 1024
+DEFAULT_TIMEOUT = 60 * 60 * 24 * 30  # 30 days
+
+
+def normalize_messages(messages: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """
+    Messages reduced to what the model sees: role and content, with runs of
+    whitespace collapsed, so formatting-only differences share an entry.
+    """
+    return [
+        {"role": str(message.get("role", "")), "content": " ".join(str(message.get("content", "")).split())}
+        for message in messages
+    ]
+
+
+class ResponseCache(ChartCache):
+    """
+    Content-addressed cache of LLM responses.
+
+    The key is a SHA-256 of the normalized messages and the model
+    parameters, so identical requests (retries, regenerations, people who
+    share a birth moment) are answered without another API call. Shared
+    entries carry their wall-clock expiry, so a local copy never outlives
+    the per-reading-type timeout it was stored with.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = None,
+        timeout: Optional[int] = None,
+        cache_alias: Optional[str] = None,
+        key_prefix: str = "llm-response",
+    ):
+        super().__init__(
+            maxsize=maxsize or getattr(settings, "LLM_RESPONSE_CACHE_SIZE", DEFAULT_MAXSIZE),
+            timeout=timeout or getattr(settings, "LLM_RESPONSE_CACHE_TIMEOUT", DEFAULT_TIMEOUT),
+            cache_alias=cache_alias or getattr(settings, "LLM_RESPONSE_CACHE_ALIAS", "default"),
+            key_prefix=key_prefix,
+        )
+
+    def make_key(self, messages: List[Dict[str, Any]], **params: Any) -> str:
+        payload = json.dumps(
+            {"messages": normalize_messages(messages), "params": params},
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return f"{self.key_prefix}:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+    def _pack_shared(self, value: Any, timeout: float) -> Tuple[float, Any]:
+        return time.time() + timeout, value
+
+    def _unpack_shared(self, entry: Tuple[float, Any]) -> Tuple[Any, float]:
+        expires_at, value = entry
+        return value, expires_at - time.time()
+
+
+response_cache = ResponseCache()
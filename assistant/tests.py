@@ -1,3 +1,78 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase
+from openai.types.chat import ChatCompletionChunk
+
+from assistant import openai_utils
+from assistant.response_cache import ResponseCache
+
+
+class ResponseCacheTests(SimpleTestCase):
+    MESSAGES = [{"role": "user", "content": "This is the user's birth chart:\n{...}"}]
+
+    def setUp(self):
+        self.cache = ResponseCache(maxsize=2, timeout=60, key_prefix="test-llm-response")
+        self.cache.clear(shared=True)
+        patches = [
+            mock.patch.object(openai_utils, "response_cache", self.cache),
+            mock.patch.object(openai_utils, "OPENAI_API_KEY", "test-key"),
+            mock.patch.object(openai_utils.openai, "ChatCompletion", create=True),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.create = openai_utils.openai.ChatCompletion.create
+        self.create.return_value.choices = [mock.Mock(message={"content": '{"today_reading": {}}'})]
+
+    def test_identical_requests_are_answered_from_the_cache(self):
+        api = openai_utils.OpenAIAPI()
+        first = api.chat_completion(self.MESSAGES, cache_timeout=60)
+        # Whitespace-only differences share the entry
+        reformatted = [{"role": "user", "content": "This is the user's  birth chart:\n\n{...}"}]
+        second = api.chat_completion(reformatted, cache_timeout=60)
+
+        self.assertEqual(first, {"today_reading": {}})
+        self.assertEqual(second, first)
+        self.create.assert_called_once()
+        self.assertEqual(self.cache.stats()["hit_rate"], 0.5)
+
+        api.chat_completion(self.MESSAGES, temperature=0.2, cache_timeout=60)
+        api.chat_completion(self.MESSAGES)
+        self.assertEqual(self.create.call_count, 3)
+
+    def test_failures_are_not_cached_and_entries_expire(self):
+        api = openai_utils.OpenAIAPI()
+        self.create.side_effect = RuntimeError("timeout")
+        self.assertIn("error", api.chat_completion(self.MESSAGES, cache_timeout=60))
+        self.create.side_effect = None
+        api.chat_completion(self.MESSAGES, cache_timeout=60)
+        self.assertEqual(self.create.call_count, 2)
+
+        key = self.cache.make_key(self.MESSAGES, model="gpt-3.5-turbo", temperature=0.7)
+        with mock.patch("assistant.response_cache.time") as clock, \
+                mock.patch("predictions.services.chart_cache.time") as local_clock:
+            local_clock.monotonic.return_value = 1e12
+            clock.time.return_value = 1e12
+            self.assertIsNone(self.cache.get(key))
+
+
+class ChatCompletionStreamTests(SimpleTestCase):
+    MESSAGES = [{"role": "user", "content": "Sections as JSON"}]
+
+    @staticmethod
+    def _chunk(content=None, choices=True):
+        return ChatCompletionChunk(
+            id="chunk", created=0, model="gpt-3.5-turbo", object="chat.completion.chunk",
+            choices=[{"index": 0, "delta": {"content": content}}] if choices else [],
+        )
+
+    def test_stream_reads_openai_v1_chunks(self):
+        chunks = [self._chunk('{"a": '), self._chunk(None), self._chunk("1}"), self._chunk(choices=False)]
+        with mock.patch.object(openai_utils, "OPENAI_API_KEY", "test-key"), \
+                mock.patch.object(openai_utils.openai, "OpenAI") as client_cls:
+            client_cls.return_value.chat.completions.create.return_value = iter(chunks)
+            pieces = list(openai_utils.OpenAIAPI().chat_completion_stream(self.MESSAGES))
+
+        self.assertEqual(pieces, ['{"a": ', "1}"])
+        client_cls.assert_called_once_with(api_key="test-key")
+        self.assertTrue(client_cls.return_value.chat.completions.create.call_args.kwargs["stream"])
@@ -1,5 +1,6 @@
 import os
 from celery import Celery
+from celery.signals import worker_process_init
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.config')
 os.environ.setdefault('DJANGO_CONFIGURATION', 'Local')
@@ -9,4 +10,11 @@ importer.install()
 
 app = Celery('core')
 app.config_from_object('django.conf:settings', namespace='CELERY')
-app.autodiscover_tasks()
\ No newline at end of file
+app.autodiscover_tasks()
+
+
+@worker_process_init.connect
+def warm_up_astronomy(**kwargs):
+    # Each pool process warms up before taking its first chart task
+    from predictions.services.warmup import warm_up_on_boot
+    warm_up_on_boot("celery")
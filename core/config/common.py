@@ -3,6 +3,7 @@ from distutils.util import strtobool
 from os.path import join, dirname, abspath
 
 import dj_database_url
+from celery.schedules import crontab
 from configurations import Configuration
 import sentry_sdk
 from sentry_sdk.integrations.django import DjangoIntegration
@@ -180,6 +181,71 @@ class Common(Configuration):
     # Celery
     CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://redis:6379/0')
     CELERY_RESULT_BACKEND = 'django-db'  # Django Celery Results
+    CELERY_BEAT_SCHEDULE = {
+        'warm-daily-transit-snapshot': {
+            'task': 'warm_daily_transit_snapshot',
+            'schedule': crontab(hour=0, minute=1),
+        },
+    }
+
+    # Skyfield ephemeris data used by predictions.services.AstroService
+    SKYFIELD_DATA_DIR = os.getenv('SKYFIELD_DATA_DIR', join(dirname(BASE_DIR), 'skyfield_data'))
+    SKYFIELD_EPHEMERIS = os.getenv('SKYFIELD_EPHEMERIS', 'de421.bsp')
+    # Load the ephemeris and compute a reference chart when gunicorn / Celery workers boot
+    ASTRO_WARM_UP_ON_BOOT = strtobool(os.getenv('ASTRO_WARM_UP_ON_BOOT', 'yes'))
+    # Trimmed, memory-mapped ephemeris built by `manage.py build_ephemeris_bundle`;
+    # used instead of SKYFIELD_EPHEMERIS whenever the file exists
+    SKYFIELD_EPHEMERIS_BUNDLE = os.getenv(
+        'SKYFIELD_EPHEMERIS_BUNDLE', join(SKYFIELD_DATA_DIR, 'ephemeris-bundle.bsp')
+    )
+    # House system for birth charts: placidus, whole_sign or equal
+    CHART_HOUSE_SYSTEM = os.getenv('CHART_HOUSE_SYSTEM', 'placidus')
+    # Sidereal ayanamsa applied to charts and transits: lahiri, raman, krishnamurti (kp) or tropical
+    CHART_AYANAMSA = os.getenv('CHART_AYANAMSA', 'lahiri')
+    # Offline GeoNames dump (e.g. cities15000.txt) used to resolve free-text places of birth;
+    # countryInfo.txt and admin1CodesASCII.txt beside it let "Mumbai, India" match by name
+    GAZETTEER_PATH = os.getenv('GAZETTEER_PATH', join(dirname(BASE_DIR), 'geodata', 'cities15000.txt'))
+    GAZETTEER_CACHE_SIZE = int(os.getenv('GAZETTEER_CACHE_SIZE', '10000'))
+    # Sign ingress / nakshatra / station index built by `manage.py build_transit_index`
+    TRANSIT_INDEX_DIR = os.getenv('TRANSIT_INDEX_DIR', os.path.join(SKYFIELD_DATA_DIR, 'transit_index'))
+
+    # Birth chart cache (in-process LRU in front of CACHES[BIRTH_CHART_CACHE_ALIAS])
+    BIRTH_CHART_CACHE_ALIAS = os.getenv('BIRTH_CHART_CACHE_ALIAS', 'default')
+    BIRTH_CHART_CACHE_SIZE = int(os.getenv('BIRTH_CHART_CACHE_SIZE', '4096'))
+    BIRTH_CHART_CACHE_TIMEOUT = int(os.getenv('BIRTH_CHART_CACHE_TIMEOUT', str(60 * 60 * 24 * 30)))
+    # Grid the cache keys snap to: seconds of birth time and degrees of latitude/longitude
+    BIRTH_CHART_CACHE_TIME_RESOLUTION = int(os.getenv('BIRTH_CHART_CACHE_TIME_RESOLUTION', '60'))
+    BIRTH_CHART_CACHE_COORD_RESOLUTION = float(os.getenv('BIRTH_CHART_CACHE_COORD_RESOLUTION', '0.01'))
+
+    # Daily transit snapshot shared by every today_reading
+    TRANSIT_SNAPSHOT_CACHE_TIMEOUT = int(os.getenv('TRANSIT_SNAPSHOT_CACHE_TIMEOUT', str(60 * 60 * 36)))
+    # Largest range (in points) the transit series endpoint streams per request
+    TRANSIT_SERIES_MAX_POINTS = int(os.getenv('TRANSIT_SERIES_MAX_POINTS', '100000'))
+
+    # LLM response cache (in-process LRU in front of CACHES[LLM_RESPONSE_CACHE_ALIAS])
+    LLM_RESPONSE_CACHE_ALIAS = os.getenv('LLM_RESPONSE_CACHE_ALIAS', 'default')
+    LLM_RESPONSE_CACHE_SIZE = int(os.getenv('LLM_RESPONSE_CACHE_SIZE', '1024'))
+    LLM_RESPONSE_CACHE_TIMEOUT = int(os.getenv('LLM_RESPONSE_CACHE_TIMEOUT', str(60 * 60 * 24 * 30)))
+    # Per reading type overrides of LLM_RESPONSE_CACHE_TIMEOUT, in seconds (0 disables caching)
+    READING_RESPONSE_CACHE_TIMEOUTS = {
+        'today_reading': int(os.getenv('TODAY_READING_CACHE_TIMEOUT', str(60 * 60 * 24))),
+    }
+
+    # Daily readings from one LLM call per chart class (these chart factors) and language
+    DAILY_READING_BY_CLASS = strtobool(os.getenv('DAILY_READING_BY_CLASS', 'no'))
+    DAILY_READING_CLASS_FACTORS = os.getenv(
+        'DAILY_READING_CLASS_FACTORS', 'ascendant,moon_nakshatra'
+    ).split(',')
+
+    # Reading sections of one user sent to the LLM at the same time
+    READING_SECTION_CONCURRENCY = int(os.getenv('READING_SECTION_CONCURRENCY', '6'))
+    # Ask for all of a user's reading sections in one streamed request instead
+    READING_COMBINED_SECTIONS = strtobool(os.getenv('READING_COMBINED_SECTIONS', 'no'))
+
+    # Daily Panchang, computed once per day per point of this grid (locations round to the nearest)
+    PANCHANG_GRID_DEGREES = float(os.getenv('PANCHANG_GRID_DEGREES', '0.25'))
+    PANCHANG_CACHE_SIZE = int(os.getenv('PANCHANG_CACHE_SIZE', '2048'))
+    PANCHANG_CACHE_TIMEOUT = int(os.getenv('PANCHANG_CACHE_TIMEOUT', str(60 * 60 * 36)))
 
     LOGGING = {
         'version': 1,
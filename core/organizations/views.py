@@ -18,6 +18,7 @@ from core.mixins import BaseApiMixin
 # NEW IMPORTS FOR LISTING PROFILES
 from profiles.models import UserProfile
 from profiles.serializers import UserProfileSerializer
+from predictions.services.compatibility import profile_compatibility
 
 
 class OrganizationViewSet(BaseApiMixin, viewsets.ModelViewSet):
@@ -43,11 +44,25 @@ class OrganizationViewSet(BaseApiMixin, viewsets.ModelViewSet):
         Returns all user profiles belonging to this family (organization).
         """
         organization = self.get_object()
-        user_ids = organization.teams.values_list('memberships__user', flat=True)
-        user_profiles = UserProfile.objects.filter(user__in=user_ids).select_related('user')
-        serializer = UserProfileSerializer(user_profiles, many=True)
+        serializer = UserProfileSerializer(self._member_profiles(organization), many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=['get'], url_path='compatibility')
+    def compatibility(self, request, pk=None):
+        """
+        Pairwise Ashtakoota (guna milan) scores between family members, out of 36.
+        Only members who allow org access (and the requesting user) are included.
+        """
+        organization = self.get_object()
+        user_profiles = self._member_profiles(organization).filter(
+            Q(allow_org_access=True) | Q(user=request.user)
+        ).order_by('user_id')
+        return Response(profile_compatibility(user_profiles))
+
+    def _member_profiles(self, organization):
+        user_ids = organization.teams.values_list('memberships__user', flat=True)
+        return UserProfile.objects.filter(user__in=user_ids).select_related('user')
+
 
 class TeamViewSet(BaseApiMixin, viewsets.ModelViewSet):
     queryset = Team.objects.all()
@@ -4,4 +4,10 @@ os.environ.setdefault("DJANGO_CONFIGURATION", "Production")
 
 from configurations.wsgi import get_wsgi_application
 
-application = get_wsgi_application()
\ No newline at end of file
+application = get_wsgi_application()
+
+# Load the ephemeris and compute a reference chart before serving; with
+# `gunicorn --preload` this runs once in the master and workers inherit it
+from predictions.services.warmup import warm_up_on_boot  # noqa: E402
+
+warm_up_on_boot("wsgi")
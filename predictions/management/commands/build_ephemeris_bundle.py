@@ -0,0 +1,43 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from predictions.services.ephemeris import build_ephemeris_bundle, ephemeris_registry
+from predictions.services.julian import jd_to_datetime
+
+
+class Command(BaseCommand):
+    help = (
+        "Write a date-range-trimmed copy of SKYFIELD_EPHEMERIS, holding only the segments "
+        "the charts use, to SKYFIELD_EPHEMERIS_BUNDLE. Workers memory-map it read-only."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start-year", type=int, default=None,
+                            help="First year to keep (default: the start of the source coverage).")
+        parser.add_argument("--end-year", type=int, default=None,
+                            help="Last year to keep (default: the end of the source coverage).")
+        parser.add_argument("--source", default=None,
+                            help="Source .bsp file (default: SKYFIELD_EPHEMERIS, downloaded if missing).")
+        parser.add_argument("--output", default=None,
+                            help="Bundle path (default: settings.SKYFIELD_EPHEMERIS_BUNDLE).")
+        parser.add_argument("--remove-source", action="store_true",
+                            help="Delete the full source ephemeris afterwards, e.g. in an image build.")
+
+    def handle(self, *args, **options):
+        source = options["source"]
+        if source is None:
+            name = settings.SKYFIELD_EPHEMERIS
+            ephemeris_registry.loader()(name)  # downloads the file if it isn't there yet
+            source = ephemeris_registry.loader().path_to(name)
+        output = options["output"] or settings.SKYFIELD_EPHEMERIS_BUNDLE
+
+        summary = build_ephemeris_bundle(source, output, options["start_year"], options["end_year"])
+        if options["remove_source"]:
+            os.remove(source)
+        start, end = jd_to_datetime(summary["start_jd"]), jd_to_datetime(summary["end_jd"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Ephemeris bundle written to {summary['path']}: {summary['segments']} segments, "
+            f"{start:%Y-%m-%d} to {end:%Y-%m-%d}, {summary['bytes'] / 1e6:.1f} MB."
+        ))
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from predictions.services.julian import jd_to_datetime
+from predictions.services.transit_index import DEFAULT_STEP_DAYS, TransitIndexBuilder
+
+
+class Command(BaseCommand):
+    help = (
+        "Precompute every sign ingress, nakshatra change and retrograde station "
+        "into memory-mappable NumPy arrays under TRANSIT_INDEX_DIR."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start-year", type=int, default=1900)
+        parser.add_argument("--end-year", type=int, default=2100,
+                            help="Last year to index; clamped to the ephemeris coverage.")
+        parser.add_argument("--step-days", type=float, default=DEFAULT_STEP_DAYS,
+                            help="Sampling step before refinement (default: %(default)s days).")
+        parser.add_argument("--path", default=None,
+                            help="Output directory (default: settings.TRANSIT_INDEX_DIR).")
+
+    def handle(self, *args, **options):
+        path = options["path"] or settings.TRANSIT_INDEX_DIR
+        builder = TransitIndexBuilder(step_days=options["step_days"])
+        manifest = builder.build(path, options["start_year"], options["end_year"])
+        total = sum(manifest["events"].values())
+        start, end = jd_to_datetime(manifest["start_jd"]), jd_to_datetime(manifest["end_jd"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Transit index written to {path}: {total} events from {start:%Y-%m-%d} to {end:%Y-%m-%d}."
+        ))
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from predictions.services.astro_service import CHART_ENGINE_VERSION, AstroService
+from predictions.services.chart_store import refresh_profile_charts
+from profiles.models import UserProfile
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfill or refresh the birth charts stored on user profiles. "
+        "Only profiles whose birth fields or chart engine version changed are recomputed, "
+        "unless --force is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000,
+                            help="Profiles per vectorized chart batch (default: 2000).")
+        parser.add_argument("--force", action="store_true",
+                            help="Recompute every chart, even if the stored one is current.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        astro_service = AstroService()
+        profiles = (
+            UserProfile.objects
+            .filter(date_of_birth__isnull=False, time_of_birth__isnull=False)
+            .order_by("pk")
+        )
+
+        force = options["force"]
+        updated = skipped = 0
+        batch = []
+        for profile in profiles.iterator(chunk_size=batch_size):
+            batch.append(profile)
+            if len(batch) >= batch_size:
+                batch_updated, batch_skipped = refresh_profile_charts(batch, astro_service, force=force)
+                updated += batch_updated
+                skipped += batch_skipped
+                batch = []
+        if batch:
+            batch_updated, batch_skipped = refresh_profile_charts(batch, astro_service, force=force)
+            updated += batch_updated
+            skipped += batch_skipped
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Birth charts (engine v{CHART_ENGINE_VERSION}): {updated} updated, {skipped} already current."
+        ))
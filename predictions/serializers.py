@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.conf import settings
+from rest_framework import serializers
+
+from .services.ephemeris import ephemeris_registry
+from .services.timezones import local_to_utc
+
+DEFAULT_TRANSIT_SERIES_MAX_POINTS = 100000
+
+
+def _validate_ephemeris_range(start: datetime, end: datetime) -> None:
+    """
+    Reject ranges the ephemeris can't compute, before any work is done.
+    """
+    first, last = ephemeris_registry.date_range()
+    if start < first or end > last:
+        raise serializers.ValidationError(
+            f"Dates must fall between {first:%Y-%m-%d} and {last:%Y-%m-%d}, the range of the ephemeris."
+        )
+
+
+class BirthTimeSweepSerializer(serializers.Serializer):
+    """
+    Input for a birth-time rectification sweep. Date and time are local to
+    the IANA `timezone` (converted with its historical rules, like profile
+    birth data) or UTC when it is blank; candidate times come back in the
+    same zone. At most ±12 hours are swept.
+    """
+    date_of_birth = serializers.DateField()
+    time_of_birth = serializers.TimeField()
+    latitude = serializers.FloatField(min_value=-90, max_value=90)
+    longitude = serializers.FloatField(min_value=-180, max_value=180)
+    window_minutes = serializers.IntegerField(min_value=0, max_value=720, default=120)
+    step_minutes = serializers.IntegerField(min_value=1, max_value=60, default=1)
+    timezone = serializers.CharField(max_length=64, required=False, allow_blank=True, default="")
+
+    def validate_timezone(self, value):
+        if value:
+            try:
+                ZoneInfo(value)
+            except (ZoneInfoNotFoundError, ValueError):
+                raise serializers.ValidationError(f"Unknown time zone '{value}'.")
+        return value
+
+    def validate(self, attrs):
+        local = datetime.combine(attrs["date_of_birth"], attrs["time_of_birth"])
+        center = local_to_utc([local], [attrs["timezone"]])[0].replace(tzinfo=dt_timezone.utc)
+        window = timedelta(minutes=attrs["window_minutes"])
+        _validate_ephemeris_range(center - window, center + window)
+        attrs["birth_datetime"] = center
+        return attrs
+
+
+class TransitSeriesSerializer(serializers.Serializer):
+    """
+    Query parameters of a transit time series: an inclusive UTC range, the
+    step between points and the output format. Ranges are capped at
+    TRANSIT_SERIES_MAX_POINTS points.
+    """
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField()
+    step_minutes = serializers.IntegerField(min_value=1, max_value=60 * 24 * 30, default=60)
+    # Not "format", which DRF reserves for renderer selection
+    output = serializers.ChoiceField(choices=["ndjson", "binary"], default="ndjson")
+
+    def validate(self, attrs):
+        if attrs["end"] < attrs["start"]:
+            raise serializers.ValidationError({"end": "Must not be before start."})
+        points = (attrs["end"] - attrs["start"]).total_seconds() // (attrs["step_minutes"] * 60) + 1
+        max_points = getattr(settings, "TRANSIT_SERIES_MAX_POINTS", DEFAULT_TRANSIT_SERIES_MAX_POINTS)
+        if points > max_points:
+            raise serializers.ValidationError(f"At most {max_points} points per request; use a larger step.")
+        # Checked here: once the response starts streaming, errors can only cut it short
+        _validate_ephemeris_range(attrs["start"], attrs["end"])
+        return attrs
@@ -0,0 +1,108 @@
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .astro_service import PLANET_NAMES
+
+# Western (angular) aspects: exact angle and default orb, in degrees
+ASPECT_NAMES = ("conjunction", "sextile", "square", "trine", "opposition")
+ASPECT_ANGLES = np.array([0.0, 60.0, 90.0, 120.0, 180.0])
+DEFAULT_ORBS = np.array([8.0, 6.0, 7.0, 8.0, 8.0])
+NO_ASPECT = -1
+
+# Graha drishti: houses (counted from the planet's own sign) each planet
+# aspects. Every planet aspects the 7th; Mars, Jupiter and Saturn have
+# special aspects. Uranus, Neptune and Pluto only get the 7th.
+SPECIAL_DRISHTI = {"Mars": (4, 7, 8), "Jupiter": (5, 7, 9), "Saturn": (3, 7, 10)}
+
+
+def _drishti_table(bodies) -> np.ndarray:
+    """
+    (P, 12) bool: row i, column k is True when body i aspects the sign k
+    signs ahead of its own (column 0 is its own sign, the 1st house).
+    """
+    table = np.zeros((len(bodies), 12), dtype=bool)
+    for row, name in enumerate(bodies):
+        for house in SPECIAL_DRISHTI.get(name, (7,)):
+            table[row, house - 1] = True
+    return table
+
+
+DRISHTI_TABLE = _drishti_table(PLANET_NAMES)
+
+
+def angular_separation(longitudes) -> np.ndarray:
+    """
+    Pairwise separations in [0, 180] degrees for (P,) or (N, P) longitudes,
+    shaped (P, P) or (N, P, P).
+    """
+    longitudes = np.asarray(longitudes, dtype=float)
+    difference = np.abs(longitudes[..., :, None] - longitudes[..., None, :]) % 360.0
+    return np.minimum(difference, 360.0 - difference)
+
+
+def aspect_matrix(longitudes, orbs: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """
+    Every pairwise aspect of one chart's (P,) or a batch's (N, P) longitudes,
+    in one broadcast over (..., P, P, aspects) instead of a loop per pair.
+
+    Returns:
+      - "separation": (..., P, P) angular distance in degrees
+      - "aspect": (..., P, P) int8 index into ASPECT_NAMES, NO_ASPECT when
+        no aspect is within its orb (the diagonal is always NO_ASPECT)
+      - "orb": (..., P, P) distance from the exact aspect angle (NaN when none)
+    """
+    orbs = DEFAULT_ORBS if orbs is None else np.asarray(orbs, dtype=float)
+    separation = angular_separation(longitudes)
+    deviation = np.abs(separation[..., None] - ASPECT_ANGLES)
+    within = deviation <= orbs
+
+    # Closest aspect in orb; with the default orbs at most one can match
+    closest = np.argmin(np.where(within, deviation, np.inf), axis=-1)
+    found = np.any(within, axis=-1)
+    count = separation.shape[-1]
+    found &= ~np.eye(count, dtype=bool)
+
+    aspect = np.where(found, closest, NO_ASPECT).astype(np.int8)
+    orb = np.where(found, np.take_along_axis(deviation, closest[..., None], axis=-1)[..., 0], np.nan)
+    return {"separation": separation, "aspect": aspect, "orb": orb}
+
+
+def graha_drishti(longitudes, table: np.ndarray = DRISHTI_TABLE) -> np.ndarray:
+    """
+    Vedic sign-based aspects for (P,) or (N, P) longitudes: a bool
+    (..., P, P) matrix where [i, j] means body i aspects body j.
+    """
+    signs = (np.asarray(longitudes, dtype=float) % 360.0 // 30.0).astype(np.int64)
+    houses_ahead = (signs[..., None, :] - signs[..., :, None]) % 12
+    rows = np.arange(signs.shape[-1])[:, None]
+    return table[rows, houses_ahead]
+
+
+def chart_aspects(birth_chart: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Prompt-friendly aspects of a birth chart dict: the angular aspects (each
+    pair once, tightest first) and which bodies each body casts drishti on.
+    """
+    longitudes = np.array([birth_chart["planets"][name]["longitude_deg"] for name in PLANET_NAMES])
+    matrix = aspect_matrix(longitudes)
+    first, second = np.nonzero(np.triu(matrix["aspect"] != NO_ASPECT))
+    order = np.argsort(matrix["orb"][first, second], kind="stable")
+
+    aspects: List[Dict[str, Any]] = [
+        {
+            "bodies": [PLANET_NAMES[first[i]], PLANET_NAMES[second[i]]],
+            "aspect": ASPECT_NAMES[matrix["aspect"][first[i], second[i]]],
+            "orb": round(float(matrix["orb"][first[i], second[i]]), 2),
+        }
+        for i in order
+    ]
+    drishti = graha_drishti(longitudes)
+    return {
+        "aspects": aspects,
+        "drishti": {
+            name: [PLANET_NAMES[j] for j in np.nonzero(drishti[i])[0]]
+            for i, name in enumerate(PLANET_NAMES)
+            if drishti[i].any()
+        },
+    }
@@ -1,71 +1,139 @@
-import math
-from datetime import datetime, timezone
-from typing import Any, Dict
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
 
-from skyfield.api import Loader, Topos
+import numpy as np
+from skyfield.api import Topos, wgs84
+from skyfield.framelib import ecliptic_frame
+from skyfield.functions import mxv
+from skyfield.nutationlib import mean_obliquity
 from django.conf import settings
 from django.utils import timezone as django_tz
 
-# Helper constants/zodiac, approach adapted from the existing django logic
+from .ayanamsa import normalize_zodiac, to_sidereal, to_sidereal_house_cusps
+from .chart_cache import ChartCache, birth_chart_cache
+from .compact_chart import CompactChart, CompactChartArray
+from .ephemeris import PLANET_TARGETS, EphemerisRegistry, ephemeris_registry
+from .gazetteer import nearest_place, resolve_place
+from .houses import (
+    DEFAULT_HOUSE_SYSTEM,
+    HOUSE_SYSTEMS,
+    compute_houses,
+    house_positions,
+    local_sidereal_degrees,
+)
+from .timezones import local_to_utc
+from .zodiac import NAKSHATRA_SPAN, NAKSHATRAS, get_zodiac_sign
 
-ZODIAC_SIGNS = [
-    "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
-    "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces",
-]
+logger = logging.getLogger(__name__)
 
+PLANET_NAMES = tuple(PLANET_TARGETS)
 
-def get_zodiac_sign(ecliptic_longitude_degrees: float) -> str:
-    index = int(ecliptic_longitude_degrees // 30) % 12
-    return ZODIAC_SIGNS[index]
+# Bump whenever chart output changes so charts stored on profiles get recomputed
+CHART_ENGINE_VERSION = 4
 
+# Vedic charts are sidereal by default; "tropical" turns the ayanamsa stage off
+DEFAULT_ZODIAC = "lahiri"
 
-def approximate_placidus_houses(skyfield_time, latitude: float, longitude: float) -> Dict[str, float]:
+# Fallback birth place (Paris) when place_of_birth can't be parsed
+DEFAULT_LATITUDE, DEFAULT_LONGITUDE = 48.8566, 2.3522
+
+
+def house_cusps_at(
+    skyfield_time, latitudes, longitudes, system: str = DEFAULT_HOUSE_SYSTEM
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Tropical (N, 12) house cusps and (N,) ascendants for a (possibly
+    array-valued) Skyfield time and locations, using the true sidereal time
+    and mean obliquity of date.
+    """
+    ramc = local_sidereal_degrees(skyfield_time.gast, longitudes)
+    obliquity = mean_obliquity(skyfield_time.tdb) / 3600.0
+    return compute_houses(ramc, latitudes, system, obliquity)
+
+
+def parse_coordinates(place_of_birth: str) -> Optional[Tuple[float, float]]:
     """
-    Example approximation of Placidus houses.
-    This is not a precise, production-grade approach, but suitable for demonstration.
+    (lat, lon) from a "lat, lon" string, or None for anything else.
     """
-    # Greenwich Apparent Sidereal Time in hours
-    gast = skyfield_time.gast
-    lst_hours = gast + (longitude / 15.0)
-    lst_hours %= 24.0
+    try:
+        lat_str, lon_str = place_of_birth.split(",")
+        lat, lon = float(lat_str.strip()), float(lon_str.strip())
+    except (AttributeError, ValueError):
+        return None
+    if not (-90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0):
+        return None
+    return lat, lon
 
-    lst_radians = math.radians((lst_hours / 24.0) * 360.0)
-    lat_radians = math.radians(latitude)
-    eps = math.radians(23.4392911)  # Obliquity of the ecliptic
 
-    # Ascendant
-    numerator = (math.cos(eps) * math.sin(lst_radians)) - (math.tan(lat_radians) * math.sin(eps))
-    denominator = math.cos(lst_radians)
-    asc_radians = math.atan2(numerator, denominator)
-    asc_degrees = math.degrees(asc_radians) % 360.0
+def resolve_birth_place(place_of_birth: str) -> Tuple[float, float, str]:
+    """
+    (lat, lon, IANA zone) for a "lat, lon" string or a place name looked up
+    in the offline gazetteer. Coordinates take the zone of the nearest
+    indexed place. Falls back to the default location; the zone is "" (UTC)
+    when it can't be determined.
+    """
+    coordinates = parse_coordinates(place_of_birth)
+    if coordinates is not None:
+        place = nearest_place(*coordinates)
+        return coordinates + (place.timezone if place else "",)
+    place = resolve_place(place_of_birth)
+    if place is not None:
+        return place.latitude, place.longitude, place.timezone
+    logger.warning(f"Couldn't resolve place of birth '{place_of_birth}'; using the default location.")
+    return DEFAULT_LATITUDE, DEFAULT_LONGITUDE, ""
 
-    # Midheaven
-    mc_radians = math.atan2(math.tan(lst_radians), math.cos(eps))
-    mc_degrees = math.degrees(mc_radians) % 360.0
 
-    # Approximate other houses
-    house_cusps = {}
-    house_cusps["1"] = asc_degrees
-    house_cusps["10"] = mc_degrees
+def parse_place_of_birth(place_of_birth: str) -> Tuple[float, float]:
+    """
+    Coordinates for a "lat, lon" string or a place name looked up in the
+    offline gazetteer, falling back to the default location.
+    """
+    return resolve_birth_place(place_of_birth)[:2]
+
+
+def get_ecliptic_longitude_degrees(skyfield_pos, rotation=None):
+    """
+    Longitude on the ecliptic and equinox of date, the frame the house cusps
+    are computed in. The rotation for the position's time is the expensive
+    part; pass ecliptic_frame.rotation_at(t) to reuse it across bodies.
+    """
+    if rotation is None:
+        rotation = ecliptic_frame.rotation_at(skyfield_pos.t)
+    x, y, z = mxv(rotation, skyfield_pos.position.au)
+    return np.degrees(np.arctan2(y, x)) % 360.0
+
 
-    house_cusps["2"] = (asc_degrees + 30.0) % 360.0
-    house_cusps["3"] = (asc_degrees + 60.0) % 360.0
-    house_cusps["11"] = (mc_degrees + 60.0) % 360.0
-    house_cusps["12"] = (mc_degrees + 30.0) % 360.0
+def get_default_house_system() -> str:
+    return getattr(settings, "CHART_HOUSE_SYSTEM", DEFAULT_HOUSE_SYSTEM)
 
-    house_cusps["4"] = (house_cusps["10"] + 180.0) % 360.0
-    house_cusps["5"] = (house_cusps["11"] + 180.0) % 360.0
-    house_cusps["6"] = (house_cusps["12"] + 180.0) % 360.0
-    house_cusps["7"] = (house_cusps["1"] + 180.0) % 360.0
-    house_cusps["8"] = (house_cusps["2"] + 180.0) % 360.0
-    house_cusps["9"] = (house_cusps["3"] + 180.0) % 360.0
 
-    return house_cusps
+def get_default_zodiac() -> str:
+    return normalize_zodiac(getattr(settings, "CHART_AYANAMSA", DEFAULT_ZODIAC))
 
 
-def get_ecliptic_longitude_degrees(skyfield_pos):
-    lat, lon, dist = skyfield_pos.ecliptic_latlon()
-    return lon.degrees
+def chart_variant(house_system: str, zodiac: str) -> str:
+    return f"{zodiac}:{house_system}"
+
+
+def apply_zodiac(
+    jd_tt, longitudes: np.ndarray, house_cusps: np.ndarray, ascendant: np.ndarray,
+    zodiac: str, house_system: str,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Post-processing stage shared by the single-chart and batch paths: shift
+    tropical (N, 10) longitudes, (N, 12) cusps and (N,) ascendants into the
+    requested zodiac. For sidereal zodiacs this is one vector subtraction per
+    array; tropical input passes through untouched.
+    """
+    return (
+        to_sidereal(longitudes, jd_tt, zodiac),
+        to_sidereal_house_cusps(
+            house_cusps, ascendant, jd_tt, zodiac, whole_sign=house_system == "whole_sign"
+        ),
+        to_sidereal(ascendant, jd_tt, zodiac),
+    )
 
 
 class AstroService:
@@ -74,82 +142,231 @@ class AstroService:
     combining logic from 'vedic-ai' for demonstration.
     """
 
-    def calculate_birth_chart(self, date_of_birth: datetime, time_of_birth: datetime, place_of_birth: str) -> Dict[str, Any]:
+    def __init__(
+        self,
+        registry: EphemerisRegistry = None,
+        chart_cache: ChartCache = None,
+        house_system: str = None,
+        zodiac: str = None,
+    ):
+        # Ephemeris, timescale and planet references are shared process-wide
+        self.registry = registry or ephemeris_registry
+        self.chart_cache = chart_cache or birth_chart_cache
+        self.house_system = house_system or get_default_house_system()
+        if self.house_system not in HOUSE_SYSTEMS:
+            raise ValueError(f"Unknown house system '{self.house_system}'.")
+        self.zodiac = normalize_zodiac(zodiac) if zodiac else get_default_zodiac()
+
+    @property
+    def variant(self) -> str:
+        # Engine settings baked into every chart; part of the chart cache key
+        return chart_variant(self.house_system, self.zodiac)
+
+    def get_birth_chart(self, birth_dt: datetime, latitude: float, longitude: float) -> Dict[str, Any]:
+        """
+        Cached birth chart for a birth moment (naive = UTC) and location.
+        Inputs are quantized by the chart cache, so repeated readings for the
+        same person reuse one computation.
+        """
+        return self.get_compact_birth_chart(birth_dt, latitude, longitude).to_dict()
+
+    def get_compact_birth_chart(self, birth_dt: datetime, latitude: float, longitude: float) -> CompactChart:
+        """
+        get_birth_chart as a CompactChart. The cache holds the 47-byte
+        CompactChart.to_bytes() payload rather than the chart dict.
+        """
+        payload = self.chart_cache.get_or_compute(
+            birth_dt, latitude, longitude, self._calculate_chart_payload,
+            variant=f"{self.variant}:v{CHART_ENGINE_VERSION}",
+        )
+        return CompactChart.from_bytes(payload)
+
+    def _calculate_chart_payload(self, full_dt: datetime, lat: float, lon: float) -> bytes:
+        return self.calculate_compact_chart_at(full_dt, lat, lon).to_bytes()
+
+    def calculate_birth_chart(
+        self,
+        date_of_birth: datetime,
+        time_of_birth: datetime,
+        place_of_birth: str,
+        timezone_name: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """
         Combine date + time + location to produce a simplified birth chart.
-        place_of_birth can be a plain string, but the logic for geocoding is not included here.
-        For real usage, store lat/long in user profile and pass them in directly.
+        place_of_birth is a "lat, lon" string or a place name resolved with
+        the offline gazetteer. The date and time are local to timezone_name,
+        by default the zone of the birth place (UTC if it can't be found).
         """
+        lat, lon, place_zone = resolve_birth_place(place_of_birth)
 
         # Suppose date_of_birth is date-only, time_of_birth is a separate time object
-        # Combine into single UTC-based datetime
-        full_dt = datetime(
+        local_dt = datetime(
             date_of_birth.year, date_of_birth.month, date_of_birth.day,
             time_of_birth.hour, time_of_birth.minute, time_of_birth.second,
-            tzinfo=timezone.utc
         )
+        full_dt = local_to_utc([local_dt], [timezone_name or place_zone])[0]
+        return self.calculate_chart_at(full_dt, lat, lon)
 
-        # For demonstration, fallback lat/lon (Paris) if none provided
-        # Real code would do real geocoding or use stored lat/lon
-        lat, lon = 48.8566, 2.3522
-        # parse place_of_birth if "lat, lon" format:
-        try:
-            lat_str, lon_str = place_of_birth.split(",")
-            lat = float(lat_str.strip())
-            lon = float(lon_str.strip())
-        except Exception:
-            pass
-
-        load = Loader("./skyfield_data")
-        ts = load.timescale()
-        eph = load("de421.bsp")
+    def calculate_chart_at(self, full_dt: datetime, lat: float, lon: float) -> Dict[str, Any]:
+        """
+        Compute the chart for a single birth moment (naive = UTC) and location.
+        """
+        return self.calculate_compact_chart_at(full_dt, lat, lon).to_dict()
+
+    def calculate_compact_chart_at(self, full_dt: datetime, lat: float, lon: float) -> CompactChart:
+        """
+        calculate_chart_at, packed into a CompactChart (longitudes to 0.01°).
+        """
+        if full_dt.tzinfo is None:
+            full_dt = full_dt.replace(tzinfo=timezone.utc)
+
+        ts = self.registry.timescale()
+        eph = self.registry.ephemeris()
 
         t = ts.from_datetime(full_dt)
 
         earth = eph["earth"]
         loc = earth + Topos(latitude_degrees=lat, longitude_degrees=lon)
         loc_at_t = loc.at(t)
+        rotation = ecliptic_frame.rotation_at(t)
 
         # Calculate major bodies
-        planet_refs = {
-            "Sun": eph["sun"],
-            "Moon": eph["moon"],
-            "Mercury": eph["mercury"],
-            "Venus": eph["venus"],
-            "Mars": eph["mars"],
-            "Jupiter": eph["jupiter barycenter"],
-            "Saturn": eph["saturn barycenter"],
-            "Uranus": eph["uranus barycenter"],
-            "Neptune": eph["neptune barycenter"],
-            "Pluto": eph["pluto barycenter"],
-        }
+        planet_refs = self.registry.planet_refs()
 
-        planets = {}
-        for name, body in planet_refs.items():
-            app = loc_at_t.observe(body).apparent()
-            lon_deg = get_ecliptic_longitude_degrees(app)
-            zodiac_sign = get_zodiac_sign(lon_deg)
-            planets[name] = {
-                "longitude_deg": round(lon_deg, 2),
-                "sign": zodiac_sign,
-            }
+        tropical = np.empty((1, len(PLANET_NAMES)))
+        for column, name in enumerate(PLANET_NAMES):
+            app = loc_at_t.observe(planet_refs[name]).apparent()
+            tropical[0, column] = get_ecliptic_longitude_degrees(app, rotation)
 
-        # Approx houses
-        house_cusps = approximate_placidus_houses(t, lat, lon)
-        houses = {}
-        for hnum in range(1, 13):
-            deg = house_cusps[str(hnum)]
-            houses[str(hnum)] = {
-                "degree": round(deg, 2),
-                "sign": get_zodiac_sign(deg),
+        tropical_cusps, tropical_asc = house_cusps_at(t, lat, lon, self.house_system)
+        longitudes, house_cusps, ascendant = apply_zodiac(
+            t.tt, tropical, tropical_cusps, tropical_asc, self.zodiac, self.house_system
+        )
+
+        return CompactChart.from_arrays(longitudes[0], house_cusps[0], ascendant[0])
+
+    def calculate_birth_charts(
+        self,
+        birth_datetimes: Sequence[datetime],
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+    ) -> Dict[str, np.ndarray]:
+        """
+        Vectorized counterpart of calculate_birth_chart for many people at once.
+
+        All N birth moments go into a single array-valued Skyfield Time, so each
+        body costs one observe().apparent() call for the whole batch and the
+        house cusps come from one compute_houses pass. The zodiac stage is
+        applied to the finished arrays. Naive datetimes are treated as UTC,
+        like the single-chart path.
+
+        Returns NumPy arrays, in the service's zodiac:
+          - "longitudes": (N, 10) ecliptic longitudes, columns in PLANET_NAMES order
+          - "signs": (N, 10) zodiac sign indexes into ZODIAC_SIGNS
+          - "house_cusps": (N, 12) cusp degrees, column 0 is house 1
+          - "house_signs": (N, 12) zodiac sign indexes of the cusps
+          - "ascendant": (N,) ascendant degrees
+        """
+        count = len(birth_datetimes)
+        longitudes_out = np.empty((count, len(PLANET_NAMES)))
+        if count == 0:
+            empty_houses = np.empty((0, 12))
+            return {
+                "longitudes": longitudes_out,
+                "signs": np.empty((0, len(PLANET_NAMES)), dtype=np.int8),
+                "house_cusps": empty_houses,
+                "house_signs": np.empty((0, 12), dtype=np.int8),
+                "ascendant": np.empty(0),
             }
 
-        asc_deg = houses["1"]["degree"]
-        asc_sign = houses["1"]["sign"]
+        ts = self.registry.timescale()
+        eph = self.registry.ephemeris()
+        planet_refs = self.registry.planet_refs()
 
-        birth_chart = {
-            "ascendant": {"degree": asc_deg, "sign": asc_sign},
-            "planets": planets,
-            "houses": houses,
+        t = ts.from_datetimes([
+            dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc) for dt in birth_datetimes
+        ])
+        lats = np.asarray(latitudes, dtype=float)
+        lons = np.asarray(longitudes, dtype=float)
+
+        observers_at_t = (eph["earth"] + wgs84.latlon(lats, lons)).at(t)
+        rotation = ecliptic_frame.rotation_at(t)
+        for column, name in enumerate(PLANET_NAMES):
+            app = observers_at_t.observe(planet_refs[name]).apparent()
+            longitudes_out[:, column] = get_ecliptic_longitude_degrees(app, rotation)
+
+        house_cusps, ascendant = house_cusps_at(t, lats, lons, self.house_system)
+        longitudes_out, house_cusps, ascendant = apply_zodiac(
+            t.tt, longitudes_out, house_cusps, ascendant, self.zodiac, self.house_system
+        )
+        return {
+            "longitudes": longitudes_out,
+            "signs": (longitudes_out // 30.0).astype(np.int8) % 12,
+            "house_cusps": house_cusps,
+            "house_signs": (house_cusps // 30.0).astype(np.int8) % 12,
+            "ascendant": ascendant,
         }
-        return birth_chart
+
+    def sweep_birth_times(
+        self,
+        center_dt: datetime,
+        latitude: float,
+        longitude: float,
+        window_minutes: int = 120,
+        step_minutes: int = 1,
+        zone_name: str = "",
+    ) -> List[Dict[str, Any]]:
+        """
+        Birth-time rectification: charts for every candidate time in
+        center_dt ± window_minutes at one location, evaluated as a single
+        array-valued batch. Each candidate has its ascendant, the Moon's
+        nakshatra and the house each body falls in.
+        Candidate times are ISO strings with their offset, in the IANA zone
+        `zone_name` (blank = UTC).
+        """
+        zone = ZoneInfo(zone_name) if zone_name else timezone.utc
+        if center_dt.tzinfo is None:
+            center_dt = center_dt.replace(tzinfo=timezone.utc)
+        offsets = np.arange(-window_minutes, window_minutes + 1, step_minutes)
+        times = [center_dt + timedelta(minutes=int(offset)) for offset in offsets]
+        count = len(times)
+        batch = self.calculate_birth_charts(times, np.full(count, latitude), np.full(count, longitude))
+
+        houses = house_positions(batch["longitudes"], batch["house_cusps"])
+        moon = batch["longitudes"][:, PLANET_NAMES.index("Moon")] % 360.0 / NAKSHATRA_SPAN
+        nakshatras = moon.astype(np.int64) % 27
+        padas = ((moon % 1.0) * 4).astype(np.int64) + 1
+
+        candidates = []
+        for row, when in enumerate(times):
+            ascendant = float(batch["ascendant"][row])
+            candidates.append({
+                "time": when.astimezone(zone).isoformat(),
+                "ascendant": {"degree": round(ascendant, 2), "sign": get_zodiac_sign(ascendant)},
+                "moon_nakshatra": {"name": NAKSHATRAS[nakshatras[row]], "pada": int(padas[row])},
+                "houses": {name: int(house) for name, house in zip(PLANET_NAMES, houses[row])},
+            })
+        return candidates
+
+    def calculate_birth_charts_as_dicts(
+        self,
+        birth_datetimes: Sequence[datetime],
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+    ) -> List[Dict[str, Any]]:
+        """
+        Batch version that returns the same dict shape as calculate_birth_chart.
+        """
+        return self.calculate_compact_charts(birth_datetimes, latitudes, longitudes).to_dicts()
+
+    def calculate_compact_charts(
+        self,
+        birth_datetimes: Sequence[datetime],
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+    ) -> CompactChartArray:
+        """
+        Batch version that packs the charts into one CompactChartArray.
+        """
+        batch = self.calculate_birth_charts(birth_datetimes, latitudes, longitudes)
+        return CompactChartArray.from_batch(batch)
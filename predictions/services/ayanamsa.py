@@ -0,0 +1,70 @@
+import numpy as np
+
+TROPICAL = "tropical"
+
+J2000_JD = 2451545.0
+
+# (reference Julian date, mean ayanamsa in degrees at that date), as used by
+# the Swiss Ephemeris sidereal modes
+AYANAMSA_REFERENCES = {
+    "lahiri": (2435553.5, 23.245524743),  # 1956-03-21, Indian Ephemeris & Nautical Almanac
+    "raman": (2415020.0, 21.014444),  # 1900-01-01
+    "krishnamurti": (2415020.0, 22.363889),  # KP, 1900-01-01
+}
+AYANAMSA_ALIASES = {"kp": "krishnamurti"}
+ZODIACS = (TROPICAL,) + tuple(AYANAMSA_REFERENCES)
+
+
+def normalize_zodiac(name: str) -> str:
+    name = (name or TROPICAL).lower()
+    name = AYANAMSA_ALIASES.get(name, name)
+    if name not in ZODIACS:
+        raise ValueError(f"Unknown ayanamsa '{name}'. Choose from {', '.join(ZODIACS)}.")
+    return name
+
+
+def _general_precession_degrees(jd_tt):
+    # Accumulated general precession in longitude since J2000 (IAU 2006, arcseconds -> degrees)
+    centuries = (np.asarray(jd_tt, dtype=float) - J2000_JD) / 36525.0
+    return (5028.796195 * centuries + 1.1054348 * centuries ** 2) / 3600.0
+
+
+def ayanamsa_degrees(jd_tt, name: str):
+    """
+    Mean ayanamsa in degrees for one or many TT Julian dates.
+    Nutation (< 0.005 degrees) is left out; the tropical side uses the true
+    equinox, so sidereal positions are effectively relative to the mean one.
+    """
+    name = normalize_zodiac(name)
+    if name == TROPICAL:
+        return np.zeros_like(np.asarray(jd_tt, dtype=float))
+    reference_jd, reference_value = AYANAMSA_REFERENCES[name]
+    return reference_value + _general_precession_degrees(jd_tt) - _general_precession_degrees(reference_jd)
+
+
+def to_sidereal(longitudes, jd_tt, name: str) -> np.ndarray:
+    """
+    Sidereal longitudes for an array of tropical longitudes.
+
+    `longitudes` is (N,) or (N, K) with one row per chart; `jd_tt` is a scalar
+    or (N,) array of the matching times. The whole batch costs one vector
+    subtraction. Tropical input is returned unchanged.
+    """
+    longitudes = np.asarray(longitudes, dtype=float)
+    if normalize_zodiac(name) == TROPICAL:
+        return longitudes
+    ayanamsa = np.asarray(ayanamsa_degrees(jd_tt, name))
+    if longitudes.ndim > ayanamsa.ndim:
+        ayanamsa = ayanamsa[..., None]
+    return (longitudes - ayanamsa) % 360.0
+
+
+def to_sidereal_house_cusps(cusps, ascendant, jd_tt, name: str, whole_sign: bool = False) -> np.ndarray:
+    """
+    Sidereal version of an (N, 12) cusp array. Whole Sign houses are rebuilt
+    from the sidereal ascendant, since their boundaries follow the signs.
+    """
+    if not whole_sign:
+        return to_sidereal(cusps, jd_tt, name)
+    first = to_sidereal(ascendant, jd_tt, name) // 30.0 * 30.0
+    return (np.asarray(first)[..., None] + np.arange(12) * 30.0) % 360.0
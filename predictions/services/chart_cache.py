@@ -0,0 +1,176 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAXSIZE = 4096
+DEFAULT_TIMEOUT = 60 * 60 * 24 * 30  # 30 days
+DEFAULT_TIME_RESOLUTION_SECONDS = 60
+DEFAULT_COORD_RESOLUTION_DEGREES = 0.01
+
+_MISSING = object()
+
+
+class ChartCache:
+    """
+    Two-tier cache for computed birth charts.
+
+    Tier 1 is a bounded in-process LRU, tier 2 is the Django cache backend
+    shared by every worker. Keys are built from the birth moment and location
+    quantized to a configurable resolution, plus a variant string describing
+    the engine settings (house system, ayanamsa, ...), so nearby inputs share
+    one entry and the chart is a pure function of its key.
+
+    Entries expire after the cache timeout, or a per-entry timeout passed to
+    set(), in both tiers. Subclasses that need the remaining lifetime of a
+    shared entry (so a local copy never outlives it) override
+    _pack_shared/_unpack_shared.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = None,
+        timeout: Optional[int] = None,
+        time_resolution_seconds: Optional[int] = None,
+        coord_resolution_degrees: Optional[float] = None,
+        cache_alias: Optional[str] = None,
+        key_prefix: str = "birth-chart",
+    ):
+        self.maxsize = maxsize or getattr(settings, "BIRTH_CHART_CACHE_SIZE", DEFAULT_MAXSIZE)
+        self.timeout = timeout or getattr(settings, "BIRTH_CHART_CACHE_TIMEOUT", DEFAULT_TIMEOUT)
+        self.time_resolution_seconds = time_resolution_seconds or getattr(
+            settings, "BIRTH_CHART_CACHE_TIME_RESOLUTION", DEFAULT_TIME_RESOLUTION_SECONDS
+        )
+        self.coord_resolution_degrees = coord_resolution_degrees or getattr(
+            settings, "BIRTH_CHART_CACHE_COORD_RESOLUTION", DEFAULT_COORD_RESOLUTION_DEGREES
+        )
+        self.cache_alias = cache_alias or getattr(settings, "BIRTH_CHART_CACHE_ALIAS", "default")
+        self.key_prefix = key_prefix
+
+        self._lock = threading.Lock()
+        # key -> (expiry in time.monotonic() seconds, value)
+        self._local: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._stats = {"local_hits": 0, "shared_hits": 0, "misses": 0, "evictions": 0}
+
+    @property
+    def shared(self):
+        return caches[self.cache_alias]
+
+    def quantize(
+        self, birth_dt: datetime, latitude: float, longitude: float
+    ) -> Tuple[datetime, float, float]:
+        """
+        Snap the inputs to the cache grid. Naive datetimes are treated as UTC.
+        """
+        if birth_dt.tzinfo is None:
+            birth_dt = birth_dt.replace(tzinfo=timezone.utc)
+        step = self.time_resolution_seconds
+        epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+        seconds = round((birth_dt - epoch).total_seconds() / step) * step
+        quantized_dt = epoch + timedelta(seconds=seconds)
+
+        res = self.coord_resolution_degrees
+        lat_step = round(latitude / res)
+        lon_step = round(longitude / res)
+        return quantized_dt, round(lat_step * res, 6), round(lon_step * res, 6)
+
+    def make_key(self, birth_dt: datetime, latitude: float, longitude: float, variant: str = "") -> str:
+        quantized_dt, lat, lon = self.quantize(birth_dt, latitude, longitude)
+        return f"{self.key_prefix}:{variant}:{int(quantized_dt.timestamp())}:{lat:.6f}:{lon:.6f}"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._local.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._local.move_to_end(key)
+                    self._stats["local_hits"] += 1
+                    return value
+                del self._local[key]
+
+        entry = self.shared.get(key, _MISSING)
+        if entry is not _MISSING:
+            value, remaining = self._unpack_shared(entry)
+            if remaining > 0:
+                with self._lock:
+                    self._stats["shared_hits"] += 1
+                self._store_local(key, value, remaining)
+                return value
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return default
+
+    def set(self, key: str, value: Any, timeout: Optional[float] = None) -> None:
+        timeout = timeout or self.timeout
+        self._store_local(key, value, timeout)
+        self.shared.set(key, self._pack_shared(value, timeout), timeout)
+
+    def get_or_compute(
+        self,
+        birth_dt: datetime,
+        latitude: float,
+        longitude: float,
+        compute: Callable[[datetime, float, float], Any],
+        variant: str = "",
+    ) -> Any:
+        """
+        Return the cached chart for these inputs, computing it at most once per
+        cache lifetime. compute() receives the quantized inputs.
+        """
+        key = self.make_key(birth_dt, latitude, longitude, variant)
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute(*self.quantize(birth_dt, latitude, longitude))
+            self.set(key, value)
+        return value
+
+    def _pack_shared(self, value: Any, timeout: float) -> Any:
+        return value
+
+    def _unpack_shared(self, entry: Any) -> Tuple[Any, float]:
+        """
+        Return (value, remaining seconds) for an entry read from the shared
+        tier. Plain entries don't record their expiry, so the local copy gets
+        the full cache timeout.
+        """
+        return entry, self.timeout
+
+    def _store_local(self, key: str, value: Any, timeout: float) -> None:
+        with self._lock:
+            self._local[key] = (time.monotonic() + timeout, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self.maxsize:
+                self._local.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["local_size"] = len(self._local)
+        lookups = stats["local_hits"] + stats["shared_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["local_hits"] + stats["shared_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def clear(self, shared: bool = False) -> None:
+        """
+        Empty the in-process tier and reset stats. Pass shared=True to also
+        clear the Django cache backend (this clears the whole alias).
+        """
+        with self._lock:
+            self._local.clear()
+            for name in self._stats:
+                self._stats[name] = 0
+        if shared:
+            self.shared.clear()
+
+
+birth_chart_cache = ChartCache()
@@ -0,0 +1,93 @@
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+
+from .chart_store import birth_datetime, has_birth_data
+from .dasha import dasha_timeline_for_chart
+from .zodiac import NAKSHATRA_SPAN, ZODIAC_SIGNS, get_nakshatra
+
+# Chart factors users can be grouped by for the shared part of the daily
+# reading; each maps a birth chart dict to a label
+CHART_FACTORS: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    "ascendant": lambda chart: chart["ascendant"]["sign"],
+    "moon_sign": lambda chart: chart["planets"]["Moon"]["sign"],
+    "sun_sign": lambda chart: chart["planets"]["Sun"]["sign"],
+    "moon_nakshatra": lambda chart: get_nakshatra(chart["planets"]["Moon"]["longitude_deg"])[0],
+}
+# 12 ascendants x 27 nakshatras: at most 324 classes per language
+DEFAULT_CLASS_FACTORS = ("ascendant", "moon_nakshatra")
+
+# Tara bala: today's Moon nakshatra counted from the natal one, in cycles of nine
+TARAS = ("Janma", "Sampat", "Vipat", "Kshema", "Pratyak", "Sadhana", "Naidhana", "Mitra", "Parama Mitra")
+
+
+def class_factors() -> Tuple[str, ...]:
+    factors = tuple(getattr(settings, "DAILY_READING_CLASS_FACTORS", DEFAULT_CLASS_FACTORS))
+    unknown = [factor for factor in factors if factor not in CHART_FACTORS]
+    if unknown:
+        raise ValueError(f"Unknown chart factors {unknown}; choose from {sorted(CHART_FACTORS)}.")
+    return factors
+
+
+def chart_class(birth_chart: Optional[Dict[str, Any]], factors: Iterable[str] = None) -> Dict[str, str]:
+    """
+    The equivalence class of a chart: {factor: label} for the given factors
+    (default: DAILY_READING_CLASS_FACTORS). Charts with equal classes share
+    one base daily reading. An empty chart gives an empty class.
+    """
+    if not birth_chart:
+        return {}
+    factors = class_factors() if factors is None else factors
+    return {factor: CHART_FACTORS[factor](birth_chart) for factor in factors}
+
+
+def group_by_class(
+    members: Iterable[Tuple[Any, Optional[Dict[str, Any]], str]],
+    factors: Iterable[str] = None,
+) -> Dict[Tuple, list]:
+    """
+    Group (member, birth_chart, language) triples by (language, chart class).
+    Returns {(language, ((factor, label), ...)): [member, ...]}.
+    """
+    factors = class_factors() if factors is None else tuple(factors)
+    groups: Dict[Tuple, list] = {}
+    for member, birth_chart, language in members:
+        key = (language, tuple(chart_class(birth_chart, factors).items()))
+        groups.setdefault(key, []).append(member)
+    return groups
+
+
+def personal_details(
+    birth_chart: Dict[str, Any],
+    transits: Dict[str, Any],
+    profile: Any = None,
+    when: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """
+    The per-user part of a class-based daily reading, computed locally: the
+    house (whole sign, from the ascendant) each transiting body is in, the
+    Moon's house from the natal Moon, the day's tara and, with birth data,
+    the running dasha periods.
+    """
+    if not birth_chart:
+        return {}
+    ascendant = ZODIAC_SIGNS.index(birth_chart["ascendant"]["sign"])
+    natal_moon = birth_chart["planets"]["Moon"]["longitude_deg"]
+    transit_moon = transits["planets"]["Moon"]["longitude_deg"]
+    natal_nakshatra = int(natal_moon // NAKSHATRA_SPAN)
+    transit_nakshatra = int(transit_moon // NAKSHATRA_SPAN)
+
+    details = {
+        "transit_houses": {
+            name: (ZODIAC_SIGNS.index(planet["sign"]) - ascendant) % 12 + 1
+            for name, planet in transits["planets"].items()
+        },
+        "moon_from_natal_moon": (int(transit_moon // 30.0) - int(natal_moon // 30.0)) % 12 + 1,
+        "tara": TARAS[(transit_nakshatra - natal_nakshatra) % 27 % 9],
+    }
+    if when is not None and has_birth_data(profile):
+        summary = dasha_timeline_for_chart(birth_chart, birth_datetime(profile)).prompt_summary(when)
+        if "current" in summary:
+            details["dasha"] = summary["current"]
+    return details
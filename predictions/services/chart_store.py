@@ -0,0 +1,195 @@
+import hashlib
+import logging
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .astro_service import (
+    CHART_ENGINE_VERSION,
+    DEFAULT_LATITUDE,
+    DEFAULT_LONGITUDE,
+    AstroService,
+    chart_variant,
+    get_default_house_system,
+    get_default_zodiac,
+    parse_coordinates,
+)
+from .gazetteer import nearest_place, resolve_place
+from .timezones import local_to_utc
+
+logger = logging.getLogger(__name__)
+
+# Resolved birth locations are written back along with the chart
+STORED_CHART_FIELDS = [
+    "birth_chart", "birth_chart_fingerprint", "birth_chart_version",
+    "latitude", "longitude", "birth_timezone", "birth_location_place",
+]
+
+
+def has_birth_data(profile) -> bool:
+    return bool(profile and profile.date_of_birth and profile.time_of_birth)
+
+
+def local_birth_datetime(profile) -> datetime:
+    """
+    Combine the profile's date + time of birth into a naive wall-clock datetime.
+    """
+    dob = profile.date_of_birth
+    tob = profile.time_of_birth
+    return datetime(dob.year, dob.month, dob.day, tob.hour, tob.minute, tob.second)
+
+
+def birth_datetime(profile) -> datetime:
+    """
+    The profile's moment of birth as a naive UTC datetime, converting the local
+    birth time with the historical rules of profile.birth_timezone (blank = UTC).
+    """
+    return birth_datetimes([profile])[0]
+
+
+def birth_datetimes(profiles: Iterable[Any]) -> List[datetime]:
+    """
+    birth_datetime for many profiles in one bulk time zone conversion.
+    Call after birth_location, which fills in missing time zones.
+    """
+    profiles = list(profiles)
+    return local_to_utc(
+        [local_birth_datetime(profile) for profile in profiles],
+        [profile.birth_timezone or "" for profile in profiles],
+    )
+
+
+def _fill_birth_timezone(profile, lat: float, lon: float) -> None:
+    if profile.birth_timezone:
+        return
+    place = nearest_place(lat, lon)
+    if place is not None:
+        profile.birth_timezone = place.timezone
+
+
+def birth_location(profile) -> Tuple[float, float]:
+    """
+    Birth coordinates for the profile: a "lat, lon" place_of_birth, else the
+    stored latitude/longitude, else the place name looked up in the offline
+    gazetteer. Gazetteer results (and the time zone of the nearest place for
+    explicit coordinates) are set on the profile (not saved) so they are
+    persisted with the chart and the lookup happens only once.
+
+    Stored coordinates and zone are dropped when place_of_birth changed since
+    they were set (by any path: API, admin or a direct save()).
+    birth_location_place records the place they belong to; blank means
+    unknown, and the stored values are kept.
+    """
+    place_of_birth = (profile.place_of_birth or "").strip()
+    if profile.birth_location_place != place_of_birth:
+        if profile.birth_location_place:
+            logger.info(f"Place of birth of profile {profile.pk} changed; resolving its location again.")
+            profile.latitude = profile.longitude = None
+            profile.birth_timezone = ""
+        profile.birth_location_place = place_of_birth
+
+    coordinates = parse_coordinates(place_of_birth)
+    if coordinates is None and profile.latitude is not None and profile.longitude is not None:
+        coordinates = float(profile.latitude), float(profile.longitude)
+    if coordinates is not None:
+        _fill_birth_timezone(profile, *coordinates)
+        return coordinates
+
+    place = resolve_place(place_of_birth)
+    if place is None:
+        logger.warning(
+            f"Couldn't resolve place of birth for profile {profile.pk}; using the default location."
+        )
+        return DEFAULT_LATITUDE, DEFAULT_LONGITUDE
+
+    profile.latitude = Decimal(f"{place.latitude:.6f}")
+    profile.longitude = Decimal(f"{place.longitude:.6f}")
+    # A zone given with the place (e.g. in the same API request) wins
+    profile.birth_timezone = profile.birth_timezone or place.timezone
+    return float(profile.latitude), float(profile.longitude)
+
+
+def birth_chart_fingerprint(profile) -> str:
+    """
+    Hash of everything the stored chart depends on: the birth fields, the
+    coordinates and the chart engine version/variant. Any change produces a
+    different fingerprint.
+    """
+    parts = [
+        str(CHART_ENGINE_VERSION),
+        chart_variant(get_default_house_system(), get_default_zodiac()),
+        profile.date_of_birth.isoformat() if profile.date_of_birth else "",
+        profile.time_of_birth.isoformat() if profile.time_of_birth else "",
+        (profile.place_of_birth or "").strip(),
+        str(profile.latitude),
+        str(profile.longitude),
+        profile.birth_timezone or "",
+    ]
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def is_stored_chart_current(profile) -> bool:
+    if not profile.birth_chart or profile.birth_chart_version != CHART_ENGINE_VERSION:
+        return False
+    return profile.birth_chart_fingerprint == birth_chart_fingerprint(profile)
+
+
+def get_profile_birth_chart(profile, astro_service: Optional[AstroService] = None) -> Dict[str, Any]:
+    """
+    Return the chart stored on the profile, recomputing and saving it only when
+    the birth fields or the engine version changed since it was stored.
+    Returns {} for profiles without birth data.
+    """
+    if not has_birth_data(profile):
+        return {}
+    if is_stored_chart_current(profile):
+        return profile.birth_chart
+
+    astro_service = astro_service or AstroService()
+    lat, lon = birth_location(profile)
+    profile.birth_chart = astro_service.get_birth_chart(birth_datetime(profile), lat, lon)
+    profile.birth_chart_fingerprint = birth_chart_fingerprint(profile)
+    profile.birth_chart_version = CHART_ENGINE_VERSION
+    profile.save(update_fields=STORED_CHART_FIELDS)
+    logger.info(f"Stored birth chart for profile {profile.pk} (engine v{CHART_ENGINE_VERSION}).")
+    return profile.birth_chart
+
+
+def refresh_profile_charts(
+    profiles: Iterable[Any],
+    astro_service: Optional[AstroService] = None,
+    force: bool = False,
+) -> Tuple[int, int]:
+    """
+    Recompute stale charts for a chunk of profiles with one batch AstroService
+    call and write them back with bulk_update.
+    Returns (updated, skipped).
+    """
+    profiles = list(profiles)
+    stale = [
+        profile for profile in profiles
+        if has_birth_data(profile) and (force or not is_stored_chart_current(profile))
+    ]
+    skipped = len(profiles) - len(stale)
+    if not stale:
+        return 0, skipped
+
+    astro_service = astro_service or AstroService()
+    locations = [birth_location(profile) for profile in stale]
+    # Same grid as the single-chart path (ChartCache), so both store the same chart
+    quantized = [
+        astro_service.chart_cache.quantize(dt, lat, lon)
+        for dt, (lat, lon) in zip(birth_datetimes(stale), locations)
+    ]
+    charts = astro_service.calculate_birth_charts_as_dicts(
+        [dt for dt, _, _ in quantized],
+        [lat for _, lat, _ in quantized],
+        [lon for _, _, lon in quantized],
+    )
+    for profile, chart in zip(stale, charts):
+        profile.birth_chart = chart
+        profile.birth_chart_fingerprint = birth_chart_fingerprint(profile)
+        profile.birth_chart_version = CHART_ENGINE_VERSION
+
+    type(stale[0]).objects.bulk_update(stale, STORED_CHART_FIELDS)
+    return len(stale), skipped
@@ -0,0 +1,226 @@
+import struct
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from .ephemeris import PLANET_TARGETS
+from .zodiac import ZODIAC_SIGNS, get_nakshatra
+
+# Value layout of a compact chart: the bodies in PLANET_TARGETS order, the
+# 12 house cusps, then the ascendant
+CHART_BODIES = tuple(PLANET_TARGETS)
+HOUSE_COLUMNS = slice(len(CHART_BODIES), len(CHART_BODIES) + 12)
+ASCENDANT_COLUMN = len(CHART_BODIES) + 12
+CHART_VALUE_COUNT = ASCENDANT_COLUMN + 1
+
+# Longitudes are stored as unsigned 16-bit hundredths of a degree: the same
+# 0.01° the chart dicts are rounded to, in 2 bytes instead of a float object
+CENTIDEGREES = 100
+FULL_CIRCLE = 360 * CENTIDEGREES
+
+COMPACT_CHART_FORMAT_VERSION = 1
+_CHART_VALUES = struct.Struct(f"<{CHART_VALUE_COUNT}H")
+_ARRAY_HEADER = struct.Struct("<BI")
+_VALUE_DTYPE = np.dtype("<u2")
+
+
+def encode_longitudes(degrees) -> np.ndarray:
+    """
+    Degrees (any shape) to centidegree codes in [0, 36000).
+    """
+    return (np.rint(np.asarray(degrees, dtype=float) * CENTIDEGREES) % FULL_CIRCLE).astype(_VALUE_DTYPE)
+
+
+class ChartPoint:
+    """
+    A named longitude (body, house cusp or ascendant) of a compact chart.
+    """
+
+    __slots__ = ("name", "degree")
+
+    def __init__(self, name: str, degree: float):
+        self.name = name
+        self.degree = degree
+
+    @property
+    def sign_index(self) -> int:
+        return int(self.degree // 30.0) % 12
+
+    @property
+    def sign(self) -> str:
+        return ZODIAC_SIGNS[self.sign_index]
+
+    @property
+    def nakshatra(self) -> Tuple[str, int]:
+        return get_nakshatra(self.degree)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"degree": self.degree, "sign": self.sign}
+
+    def __repr__(self):
+        return f"ChartPoint({self.name!r}, {self.degree})"
+
+
+class CompactChart:
+    """
+    One birth chart as 23 little-endian uint16 centidegrees (46 bytes).
+
+    The only attribute is the packed bytes, so an instance costs about 120
+    bytes instead of the ~8 KB of the nested chart dict. Named access
+    (chart["Sun"], chart.ascendant, chart.house(1)) decodes on demand;
+    to_dict() is the JSON view served by the API and stored on profiles.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: bytes):
+        if len(data) != _CHART_VALUES.size:
+            raise ValueError(f"A compact chart is {CHART_VALUE_COUNT} uint16 values, got {len(data)} bytes.")
+        self._data = bytes(data)
+
+    @classmethod
+    def from_arrays(cls, longitudes, house_cusps, ascendant: float) -> "CompactChart":
+        """
+        Pack one chart from (10,) body longitudes, (12,) cusps and the ascendant.
+        """
+        values = np.concatenate([np.ravel(longitudes), np.ravel(house_cusps), [ascendant]])
+        return cls(encode_longitudes(values).tobytes())
+
+    @classmethod
+    def from_dict(cls, birth_chart: Dict[str, Any]) -> "CompactChart":
+        """
+        Pack a chart dict (calculate_birth_chart shape), e.g. one stored on a profile.
+        """
+        return cls.from_arrays(
+            [birth_chart["planets"][name]["longitude_deg"] for name in CHART_BODIES],
+            [birth_chart["houses"][str(number)]["degree"] for number in range(1, 13)],
+            birth_chart["ascendant"]["degree"],
+        )
+
+    def to_bytes(self) -> bytes:
+        return bytes([COMPACT_CHART_FORMAT_VERSION]) + self._data
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> "CompactChart":
+        if len(payload) != _CHART_VALUES.size + 1 or payload[0] != COMPACT_CHART_FORMAT_VERSION:
+            raise ValueError("Not a compact chart payload (or written by another format version).")
+        return cls(payload[1:])
+
+    def centidegrees(self) -> Tuple[int, ...]:
+        return _CHART_VALUES.unpack(self._data)
+
+    def degrees(self) -> np.ndarray:
+        """
+        All 23 values in degrees, in the compact layout order.
+        """
+        return np.frombuffer(self._data, dtype=_VALUE_DTYPE) / CENTIDEGREES
+
+    def __getitem__(self, body: str) -> ChartPoint:
+        try:
+            column = CHART_BODIES.index(body)
+        except ValueError:
+            raise KeyError(body) from None
+        return ChartPoint(body, self.centidegrees()[column] / CENTIDEGREES)
+
+    @property
+    def planets(self) -> Tuple[ChartPoint, ...]:
+        values = self.centidegrees()
+        return tuple(ChartPoint(name, value / CENTIDEGREES) for name, value in zip(CHART_BODIES, values))
+
+    @property
+    def houses(self) -> Tuple[ChartPoint, ...]:
+        values = self.centidegrees()[HOUSE_COLUMNS]
+        return tuple(ChartPoint(str(number), value / CENTIDEGREES) for number, value in enumerate(values, 1))
+
+    def house(self, number: int) -> ChartPoint:
+        if not 1 <= number <= 12:
+            raise ValueError(f"House numbers run from 1 to 12, got {number}.")
+        return self.houses[number - 1]
+
+    @property
+    def ascendant(self) -> ChartPoint:
+        return ChartPoint("Ascendant", self.centidegrees()[ASCENDANT_COLUMN] / CENTIDEGREES)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        The JSON view: the calculate_birth_chart dict shape.
+        """
+        return {
+            "ascendant": self.ascendant.to_dict(),
+            "planets": {
+                point.name: {"longitude_deg": point.degree, "sign": point.sign} for point in self.planets
+            },
+            "houses": {point.name: point.to_dict() for point in self.houses},
+        }
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactChart):
+            return NotImplemented
+        return self._data == other._data
+
+    def __hash__(self):
+        return hash(self._data)
+
+    def __repr__(self):
+        return f"CompactChart(ascendant={self.ascendant.degree}, {self.ascendant.sign})"
+
+
+class CompactChartArray:
+    """
+    Many compact charts as one (N, 23) uint16 array: 46 bytes per chart, so a
+    million charts take 46 MB. Serializes to a short header plus the raw
+    array, and deserializes without copying (np.frombuffer).
+    """
+
+    __slots__ = ("values",)
+
+    def __init__(self, values: np.ndarray):
+        values = np.asarray(values)
+        if values.ndim != 2 or values.shape[1] != CHART_VALUE_COUNT:
+            raise ValueError(f"Expected an (N, {CHART_VALUE_COUNT}) array, got {values.shape}.")
+        self.values = values.astype(_VALUE_DTYPE, copy=False)
+
+    @classmethod
+    def from_batch(cls, batch: Dict[str, np.ndarray]) -> "CompactChartArray":
+        """
+        Pack an AstroService.calculate_birth_charts result.
+        """
+        columns = np.column_stack([batch["longitudes"], batch["house_cusps"], batch["ascendant"]])
+        return cls(encode_longitudes(columns))
+
+    @classmethod
+    def from_charts(cls, charts: List[CompactChart]) -> "CompactChartArray":
+        data = b"".join(chart._data for chart in charts)
+        return cls(np.frombuffer(data, dtype=_VALUE_DTYPE).reshape(-1, CHART_VALUE_COUNT))
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: int) -> CompactChart:
+        return CompactChart(self.values[index].tobytes())
+
+    def __iter__(self) -> Iterator[CompactChart]:
+        return (CompactChart(row.tobytes()) for row in self.values)
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes
+
+    def degrees(self) -> np.ndarray:
+        return self.values / CENTIDEGREES
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [chart.to_dict() for chart in self]
+
+    def to_bytes(self) -> bytes:
+        return _ARRAY_HEADER.pack(COMPACT_CHART_FORMAT_VERSION, len(self.values)) + self.values.tobytes()
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> "CompactChartArray":
+        version, count = _ARRAY_HEADER.unpack_from(payload)
+        if version != COMPACT_CHART_FORMAT_VERSION:
+            raise ValueError(f"Compact chart format version {version} is not supported.")
+        values = np.frombuffer(
+            payload, dtype=_VALUE_DTYPE, count=count * CHART_VALUE_COUNT, offset=_ARRAY_HEADER.size
+        )
+        return cls(values.reshape(count, CHART_VALUE_COUNT))
@@ -0,0 +1,180 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .astro_service import AstroService
+from .chart_store import has_birth_data, refresh_profile_charts
+from .zodiac import NAKSHATRA_SPAN
+
+# The eight kootas of guna milan and their maximum points (36 in total)
+KOOTAS = ("varna", "vashya", "tara", "yoni", "graha_maitri", "gana", "bhakoot", "nadi")
+KOOTA_MAX_POINTS = {
+    "varna": 1, "vashya": 2, "tara": 3, "yoni": 4, "graha_maitri": 5, "gana": 6, "bhakoot": 7, "nadi": 8,
+}
+ASHTAKOOTA_MAX_POINTS = sum(KOOTA_MAX_POINTS.values())
+
+# --- Moon sign (rashi) attributes, indexed like ZODIAC_SIGNS ---
+
+# Brahmin 3, Kshatriya 2, Vaishya 1, Shudra 0
+SIGN_VARNA = (2, 1, 0, 3, 2, 1, 0, 3, 2, 1, 0, 3)
+# Chatushpada 0, Manava 1, Jalachara 2, Vanachara 3, Keeta 4
+SIGN_VASHYA = (0, 0, 1, 2, 3, 1, 1, 4, 0, 2, 1, 2)
+VASHYA_POINTS = np.array([
+    [2.0, 1.0, 1.0, 0.5, 1.0],
+    [1.0, 2.0, 0.5, 0.0, 1.0],
+    [1.0, 0.5, 2.0, 1.0, 1.0],
+    [0.5, 0.0, 1.0, 2.0, 0.0],
+    [1.0, 1.0, 1.0, 0.0, 2.0],
+])
+
+# Sign lords and the natural friendships between them (1 friend, 0 neutral, -1 enemy)
+LORDS = ("Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn")
+SIGN_LORD = (2, 5, 3, 1, 0, 3, 5, 2, 4, 6, 6, 4)
+LORD_RELATIONS = np.array([
+    # Sun Moon Mars Merc Jup Ven Sat
+    [0, 1, 1, 0, 1, -1, -1],   # Sun
+    [1, 0, 0, 1, 0, 0, 0],     # Moon
+    [1, 1, 0, -1, 1, 0, 0],    # Mars
+    [1, -1, 0, 0, 0, 1, 0],    # Mercury
+    [1, 1, 1, -1, 0, -1, 0],   # Jupiter
+    [-1, -1, 0, 1, 0, 0, 1],   # Venus
+    [-1, -1, -1, 1, 0, 1, 0],  # Saturn
+])
+# Points by the sum of both relations (-2 .. 2), used when friend + enemy isn't the case
+MAITRI_POINTS_BY_SUM = {2: 5.0, 1: 4.0, 0: 3.0, -1: 0.5, -2: 0.0}
+MAITRI_FRIEND_ENEMY_POINTS = 1.0
+
+# --- Moon nakshatra attributes, indexed like NAKSHATRAS ---
+
+# Horse, Elephant, Sheep, Serpent, Dog, Cat, Rat, Cow, Buffalo, Tiger, Deer, Monkey, Mongoose, Lion
+NAKSHATRA_YONI = (0, 1, 2, 3, 3, 4, 5, 2, 5, 6, 6, 7, 8, 9, 8, 9, 10, 10, 4, 11, 12, 11, 13, 0, 13, 7, 1)
+YONI_POINTS = np.array([
+    [4, 2, 2, 3, 2, 2, 2, 1, 0, 1, 3, 3, 2, 1],
+    [2, 4, 3, 3, 2, 2, 2, 2, 3, 1, 2, 3, 2, 0],
+    [2, 3, 4, 2, 1, 2, 1, 3, 3, 1, 2, 0, 3, 1],
+    [3, 3, 2, 4, 2, 1, 1, 1, 1, 2, 2, 2, 0, 2],
+    [2, 2, 1, 2, 4, 2, 1, 2, 2, 1, 0, 2, 1, 1],
+    [2, 2, 2, 1, 2, 4, 0, 2, 2, 1, 3, 3, 2, 1],
+    [2, 2, 1, 1, 1, 0, 4, 2, 2, 2, 2, 2, 1, 2],
+    [1, 2, 3, 1, 2, 2, 2, 4, 3, 0, 3, 2, 2, 1],
+    [0, 3, 3, 1, 2, 2, 2, 3, 4, 1, 2, 2, 2, 1],
+    [1, 1, 1, 2, 1, 1, 2, 0, 1, 4, 1, 1, 2, 1],
+    [3, 2, 2, 2, 0, 3, 2, 3, 2, 1, 4, 2, 2, 1],
+    [3, 3, 0, 2, 2, 3, 2, 2, 2, 1, 2, 4, 3, 2],
+    [2, 2, 3, 0, 1, 2, 1, 2, 2, 2, 2, 3, 4, 2],
+    [1, 0, 1, 2, 1, 1, 2, 1, 1, 1, 1, 2, 2, 4],
+], dtype=float)
+# Deva 0, Manushya 1, Rakshasa 2
+NAKSHATRA_GANA = (0, 1, 2, 1, 0, 1, 0, 0, 2, 2, 1, 1, 0, 2, 0, 2, 0, 2, 2, 1, 1, 0, 2, 2, 1, 1, 0)
+GANA_POINTS = np.array([
+    [6.0, 5.0, 1.0],
+    [6.0, 6.0, 0.0],
+    [0.0, 0.0, 6.0],
+])
+# Aadi, Madhya, Antya repeat every six nakshatras (Ashwini, Bharani, Krittika, Rohini, ...)
+NAKSHATRA_NADI = tuple((0, 1, 2, 2, 1, 0)[n % 6] for n in range(27))
+# Taras (counted 1-9 from the other's nakshatra) that score nothing: Vipat, Pratyak, Naidhana
+INAUSPICIOUS_TARAS = (3, 5, 7)
+# Bhakoot: sign distances (counted 1-12) of the 2/12, 5/9 and 6/8 pairs score nothing
+INAUSPICIOUS_BHAKOOT = (2, 12, 5, 9, 6, 8)
+
+
+def _sign_tables() -> np.ndarray:
+    """
+    (4, 12, 12) points for varna, vashya, graha maitri and bhakoot by the
+    first and second person's moon sign.
+    """
+    first, second = np.meshgrid(np.arange(12), np.arange(12), indexing="ij")
+    varna = np.array(SIGN_VARNA)
+    vashya = np.array(SIGN_VASHYA)
+
+    lord = np.array(SIGN_LORD)
+    forward = LORD_RELATIONS[lord[first], lord[second]]
+    backward = LORD_RELATIONS[lord[second], lord[first]]
+    maitri = np.vectorize(MAITRI_POINTS_BY_SUM.get)(forward + backward).astype(float)
+    maitri[forward * backward == -1] = MAITRI_FRIEND_ENEMY_POINTS
+    maitri[lord[first] == lord[second]] = 5.0
+
+    distance = (second - first) % 12 + 1
+    return np.stack([
+        (varna[first] >= varna[second]).astype(float),
+        VASHYA_POINTS[vashya[first], vashya[second]],
+        maitri,
+        np.where(np.isin(distance, INAUSPICIOUS_BHAKOOT), 0.0, 7.0),
+    ])
+
+
+def _nakshatra_tables() -> np.ndarray:
+    """
+    (4, 27, 27) points for tara, yoni, gana and nadi by the first and second
+    person's moon nakshatra.
+    """
+    first, second = np.meshgrid(np.arange(27), np.arange(27), indexing="ij")
+    auspicious_forward = ~np.isin((second - first) % 27 % 9 + 1, INAUSPICIOUS_TARAS)
+    auspicious_backward = ~np.isin((first - second) % 27 % 9 + 1, INAUSPICIOUS_TARAS)
+    yoni = np.array(NAKSHATRA_YONI)
+    gana = np.array(NAKSHATRA_GANA)
+    nadi = np.array(NAKSHATRA_NADI)
+    return np.stack([
+        1.5 * auspicious_forward + 1.5 * auspicious_backward,
+        YONI_POINTS[yoni[first], yoni[second]],
+        GANA_POINTS[gana[first], gana[second]],
+        np.where(nadi[first] == nadi[second], 0.0, 8.0),
+    ])
+
+
+SIGN_KOOTA_TABLES = _sign_tables()
+NAKSHATRA_KOOTA_TABLES = _nakshatra_tables()
+SIGN_KOOTAS = ("varna", "vashya", "graha_maitri", "bhakoot")
+NAKSHATRA_KOOTAS = ("tara", "yoni", "gana", "nadi")
+
+
+def ashtakoota_matrix(moon_longitudes) -> Dict[str, np.ndarray]:
+    """
+    Guna milan points for every ordered pair of (M,) sidereal moon
+    longitudes, by indexing the precomputed koota tables with broadcast
+    (M, 1) x (1, M) sign and nakshatra indexes: no per-pair chart work.
+
+    Returns {"kootas": {name: (M, M)}, "total": (M, M)}. Varna, vashya and
+    gana are directional: [i, j] scores person i in the groom's role. The
+    diagonal (a person with themselves) is left in.
+    """
+    longitudes = np.asarray(moon_longitudes, dtype=float) % 360.0
+    signs = (longitudes // 30.0).astype(np.int64)
+    nakshatras = (longitudes // NAKSHATRA_SPAN).astype(np.int64) % 27
+
+    sign_points = SIGN_KOOTA_TABLES[:, signs[:, None], signs[None, :]]
+    nakshatra_points = NAKSHATRA_KOOTA_TABLES[:, nakshatras[:, None], nakshatras[None, :]]
+    kootas = dict(zip(SIGN_KOOTAS, sign_points))
+    kootas.update(zip(NAKSHATRA_KOOTAS, nakshatra_points))
+    return {
+        "kootas": {name: kootas[name] for name in KOOTAS},
+        "total": sign_points.sum(axis=0) + nakshatra_points.sum(axis=0),
+    }
+
+
+def profile_compatibility(
+    profiles: Iterable[Any],
+    astro_service: Optional[AstroService] = None,
+) -> Dict[str, Any]:
+    """
+    Pairwise Ashtakoota scores for a group of profiles (e.g. the members of
+    an organization). Stale or missing charts are refreshed with one batch
+    call first; profiles without birth data are listed as skipped.
+    """
+    profiles = list(profiles)
+    scored = [profile for profile in profiles if has_birth_data(profile)]
+    refresh_profile_charts(scored, astro_service)
+    moons = [profile.birth_chart["planets"]["Moon"]["longitude_deg"] for profile in scored]
+    matrix = ashtakoota_matrix(moons)
+
+    def as_lists(values: np.ndarray) -> List[List[float]]:
+        return np.round(values, 1).tolist()
+
+    return {
+        "members": [profile.user_id for profile in scored],
+        "skipped": [profile.user_id for profile in profiles if not has_birth_data(profile)],
+        "max_points": ASHTAKOOTA_MAX_POINTS,
+        "scores": as_lists(matrix["total"]),
+        "kootas": {name: as_lists(points) for name, points in matrix["kootas"].items()},
+    }
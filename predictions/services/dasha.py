@@ -0,0 +1,144 @@
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .julian import datetime_to_jd, jd_to_datetime
+from .zodiac import NAKSHATRA_SPAN
+
+# Vimshottari order starting from Ashwini's lord, with mahadasha lengths in years
+DASHA_LORDS = ("Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury")
+DASHA_YEARS = np.array([7, 20, 6, 10, 7, 18, 16, 19, 17], dtype=float)
+DASHA_CYCLE_YEARS = 120.0
+DASHA_YEAR_DAYS = 365.25
+DASHA_LEVELS = ("mahadasha", "antardasha", "pratyantardasha")
+
+
+def _build_period_tables():
+    """
+    Pratyantardasha tables for one full 120-year cycle, per starting lord.
+
+    Returns (lords, offsets): lords is (9, 729, 3) with the maha/antar/pratyantar
+    lord indexes of every pratyantardasha, offsets is (9, 730) with their
+    start (and the cycle end) in years since the cycle start.
+    """
+    first, second, third = np.meshgrid(np.arange(9), np.arange(9), np.arange(9), indexing="ij")
+    lords = np.empty((9, 729, 3), dtype=np.int8)
+    offsets = np.empty((9, 730))
+    for start in range(9):
+        maha = (start + first.ravel()) % 9
+        antar = (maha + second.ravel()) % 9
+        pratyantar = (antar + third.ravel()) % 9
+        lords[start] = np.stack([maha, antar, pratyantar], axis=1)
+        durations = DASHA_YEARS[maha] * DASHA_YEARS[antar] * DASHA_YEARS[pratyantar] / DASHA_CYCLE_YEARS ** 2
+        offsets[start] = np.concatenate([[0.0], np.cumsum(durations)])
+    return lords, offsets
+
+
+PERIOD_LORDS, PERIOD_OFFSETS = _build_period_tables()
+
+
+class DashaTimeline:
+    """
+    Vimshottari mahadasha / antardasha / pratyantardasha periods covering the
+    120 years from birth. Periods are stored as sorted Julian-date arrays, so
+    "which period is running at X" is a binary search.
+    """
+
+    def __init__(self, moon_longitude: float, birth_dt: datetime):
+        self.moon_longitude = float(moon_longitude) % 360.0
+        self.birth_dt = birth_dt
+        self.birth_jd = datetime_to_jd(birth_dt)
+
+        position = self.moon_longitude / NAKSHATRA_SPAN
+        first_lord = int(position) % 9
+        elapsed = position - int(position)
+        cycle_start = self.birth_jd - elapsed * DASHA_YEARS[first_lord] * DASHA_YEAR_DAYS
+
+        # Two back-to-back cycles, cut down to [birth, birth + 120 years]
+        offsets = PERIOD_OFFSETS[first_lord]
+        bounds = cycle_start + np.concatenate([offsets[:-1], offsets + DASHA_CYCLE_YEARS]) * DASHA_YEAR_DAYS
+        lords = np.concatenate([PERIOD_LORDS[first_lord], PERIOD_LORDS[first_lord]])
+        self.end_jd = self.birth_jd + DASHA_CYCLE_YEARS * DASHA_YEAR_DAYS
+        keep = (bounds[1:] > self.birth_jd) & (bounds[:-1] < self.end_jd)
+
+        self.starts = np.maximum(bounds[:-1][keep], self.birth_jd)
+        self.lords = lords[keep]
+        # Start of the period each level belongs to, for the level's own bounds
+        self._level_starts = []
+        for level in range(len(DASHA_LEVELS)):
+            changed = np.ones(len(self.starts), dtype=bool)
+            changed[1:] = np.any(self.lords[1:, :level + 1] != self.lords[:-1, :level + 1], axis=1)
+            self._level_starts.append(self.starts[changed])
+
+    def _level_bounds(self, level: int, jd: float):
+        starts = self._level_starts[level]
+        position = int(np.searchsorted(starts, jd, side="right")) - 1
+        end = starts[position + 1] if position + 1 < len(starts) else self.end_jd
+        return jd_to_datetime(starts[position]), jd_to_datetime(end)
+
+    def period_at(self, when: datetime) -> Dict[str, Dict[str, Any]]:
+        """
+        Running mahadasha, antardasha and pratyantardasha at `when` (naive = UTC):
+        {"mahadasha": {"lord", "start", "end"}, ...}.
+        """
+        jd = datetime_to_jd(when)
+        if not self.birth_jd <= jd < self.end_jd:
+            raise ValueError(f"{when.isoformat()} is outside the dasha timeline.")
+        position = int(np.searchsorted(self.starts, jd, side="right")) - 1
+        period = {}
+        for level, name in enumerate(DASHA_LEVELS):
+            start, end = self._level_bounds(level, jd)
+            period[name] = {"lord": DASHA_LORDS[self.lords[position, level]], "start": start, "end": end}
+        return period
+
+    def mahadashas(self) -> List[Dict[str, Any]]:
+        """
+        Every mahadasha from birth on, with start/end dates and ages in years.
+        """
+        starts = self._level_starts[0]
+        ends = np.append(starts[1:], self.end_jd)
+        lords = self.lords[np.searchsorted(self.starts, starts), 0]
+        return [
+            {
+                "lord": DASHA_LORDS[lord],
+                "start": jd_to_datetime(start).date().isoformat(),
+                "end": jd_to_datetime(end).date().isoformat(),
+                "age_start": round(float(start - self.birth_jd) / DASHA_YEAR_DAYS, 1),
+                "age_end": round(float(end - self.birth_jd) / DASHA_YEAR_DAYS, 1),
+            }
+            for lord, start, end in zip(lords, starts, ends)
+        ]
+
+    def prompt_summary(self, when: datetime) -> Dict[str, Any]:
+        """
+        Compact, JSON-friendly timeline for reading prompts: every mahadasha
+        plus the periods running at `when`.
+        """
+        summary = {"mahadashas": self.mahadashas()}
+        try:
+            period = self.period_at(when)
+        except ValueError:
+            return summary
+        summary["current"] = {
+            name: f"{value['lord']} ({value['start']:%Y-%m-%d} to {value['end']:%Y-%m-%d})"
+            for name, value in period.items()
+        }
+        return summary
+
+
+@lru_cache(maxsize=4096)
+def get_dasha_timeline(moon_longitude: float, birth_dt: datetime) -> DashaTimeline:
+    """
+    Cached timeline for a natal (sidereal) Moon longitude and birth moment.
+    """
+    return DashaTimeline(moon_longitude, birth_dt)
+
+
+def dasha_timeline_for_chart(birth_chart: Dict[str, Any], birth_dt: datetime) -> DashaTimeline:
+    """
+    Timeline from a birth chart dict. Chart longitudes are rounded to 0.01
+    degrees, which moves period boundaries by at most a few days.
+    """
+    return get_dasha_timeline(float(birth_chart["planets"]["Moon"]["longitude_deg"]), birth_dt)
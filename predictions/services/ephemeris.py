@@ -0,0 +1,219 @@
+import logging
+import os
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+from jplephem.daf import DAF
+from jplephem.excerpter import write_excerpt
+from jplephem.spk import SPK
+from skyfield.api import Loader, load_file
+
+from .julian import jd_to_datetime
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SKYFIELD_DATA_DIR = "./skyfield_data"
+DEFAULT_EPHEMERIS = "de421.bsp"
+
+# Kept clear of the ends of the coverage: TT-UTC and light-time put the
+# positions actually read up to a few minutes away from the requested time
+COVERAGE_MARGIN_DAYS = 1.0
+
+# Julian date of 0001-01-01 (proleptic Gregorian) minus date.toordinal() of that day
+ORDINAL_JD_OFFSET = 1721424.5
+
+# Skyfield target names for every body AstroService tracks, in chart order.
+PLANET_TARGETS = {
+    "Sun": "sun",
+    "Moon": "moon",
+    "Mercury": "mercury",
+    "Venus": "venus",
+    "Mars": "mars",
+    "Jupiter": "jupiter barycenter",
+    "Saturn": "saturn barycenter",
+    "Uranus": "uranus barycenter",
+    "Neptune": "neptune barycenter",
+    "Pluto": "pluto barycenter",
+}
+
+
+class EphemerisRegistry:
+    """
+    Process-wide cache of the Skyfield loader, timescale, ephemerides and
+    planet reference maps.
+
+    Every resource is loaded at most once per process, on first use or from
+    warm_up(). Lookups after that are plain dict reads; the lock is only
+    taken while something is still being loaded.
+
+    When the trimmed bundle (settings.SKYFIELD_EPHEMERIS_BUNDLE) exists it is
+    the default ephemeris. Like any local .bsp file it is opened read-only and
+    its segments are memory-mapped by jplephem, so workers forked after
+    warm_up() share the same physical pages instead of each holding a copy.
+    """
+
+    def __init__(self, data_dir: Optional[str] = None):
+        self._data_dir = data_dir
+        self._lock = threading.RLock()
+        self._loader = None
+        self._timescale = None
+        self._ephemerides: Dict[str, Any] = {}
+        self._planet_refs: Dict[str, Dict[str, Any]] = {}
+        self._default_ephemeris: Optional[str] = None
+
+    @property
+    def data_dir(self) -> str:
+        return self._data_dir or getattr(settings, "SKYFIELD_DATA_DIR", DEFAULT_SKYFIELD_DATA_DIR)
+
+    @property
+    def default_ephemeris(self) -> str:
+        """
+        Absolute path of the ephemeris bundle if one is installed, otherwise
+        the SKYFIELD_EPHEMERIS file name (downloaded into data_dir if missing).
+        """
+        if self._default_ephemeris is None:
+            bundle = getattr(settings, "SKYFIELD_EPHEMERIS_BUNDLE", None)
+            if bundle and os.path.isfile(bundle):
+                self._default_ephemeris = os.path.abspath(bundle)
+            else:
+                self._default_ephemeris = getattr(settings, "SKYFIELD_EPHEMERIS", DEFAULT_EPHEMERIS)
+        return self._default_ephemeris
+
+    def loader(self) -> Loader:
+        if self._loader is None:
+            with self._lock:
+                if self._loader is None:
+                    self._loader = Loader(self.data_dir)
+        return self._loader
+
+    def timescale(self):
+        if self._timescale is None:
+            with self._lock:
+                if self._timescale is None:
+                    self._timescale = self.loader().timescale()
+        return self._timescale
+
+    def ephemeris(self, name: Optional[str] = None):
+        name = name or self.default_ephemeris
+        eph = self._ephemerides.get(name)
+        if eph is None:
+            with self._lock:
+                eph = self._ephemerides.get(name)
+                if eph is None:
+                    # Absolute paths are local files and never trigger a download
+                    eph = load_file(name) if os.path.isabs(name) else self.loader()(name)
+                    self._ephemerides[name] = eph
+        return eph
+
+    def planet_refs(self, name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Map of body name -> Skyfield vector function for the given ephemeris.
+        """
+        name = name or self.default_ephemeris
+        refs = self._planet_refs.get(name)
+        if refs is None:
+            with self._lock:
+                refs = self._planet_refs.get(name)
+                if refs is None:
+                    eph = self.ephemeris(name)
+                    refs = {body: eph[target] for body, target in PLANET_TARGETS.items()}
+                    self._planet_refs[name] = refs
+        return refs
+
+    def coverage(self, name: Optional[str] = None) -> Tuple[float, float]:
+        """
+        (first, last) Julian date covered by every segment of the ephemeris;
+        positions outside it raise EphemerisRangeError.
+        """
+        segments = self.ephemeris(name).spk.segments
+        return max(s.start_jd for s in segments), min(s.end_jd for s in segments)
+
+    def date_range(self, name: Optional[str] = None) -> Tuple[datetime, datetime]:
+        """
+        First and last UTC datetime charts can be computed for: coverage()
+        less COVERAGE_MARGIN_DAYS at each end.
+        """
+        first_jd, last_jd = self.coverage(name)
+        return jd_to_datetime(first_jd + COVERAGE_MARGIN_DAYS), jd_to_datetime(last_jd - COVERAGE_MARGIN_DAYS)
+
+    def warm_up(self, name: Optional[str] = None) -> float:
+        """
+        Load the timescale, ephemeris and planet references up front.
+        Returns the number of seconds spent loading.
+        """
+        started = time.perf_counter()
+        self.timescale()
+        self.planet_refs(name)
+        elapsed = time.perf_counter() - started
+        logger.info("Ephemeris registry warmed up in %.3fs (%s)", elapsed, name or self.default_ephemeris)
+        return elapsed
+
+    def clear(self) -> None:
+        """
+        Drop every cached resource, e.g. after changing SKYFIELD_DATA_DIR in tests.
+        """
+        with self._lock:
+            self._loader = None
+            self._timescale = None
+            self._ephemerides.clear()
+            self._planet_refs.clear()
+            self._default_ephemeris = None
+
+
+ephemeris_registry = EphemerisRegistry()
+
+
+def warm_up_ephemeris(name: Optional[str] = None) -> float:
+    return ephemeris_registry.warm_up(name)
+
+
+def _year_start_jd(year: int) -> float:
+    return date(year, 1, 1).toordinal() + ORDINAL_JD_OFFSET
+
+
+def build_ephemeris_bundle(
+    source_path: str, output_path: str, start_year: Optional[int] = None, end_year: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Write a copy of the SPK file at `source_path` trimmed to
+    [start_year, end_year] and to the segments needed for PLANET_TARGETS.
+    Without years the bundle keeps the source's full date coverage.
+
+    The bundle is written next to `output_path` and moved into place
+    atomically, so processes that still map the previous file keep working.
+    It is left read-only. Returns a summary of what was written.
+    """
+    source = load_file(source_path)
+    needed = set()
+    for target in list(PLANET_TARGETS.values()) + ["earth"]:
+        vector = source[target]
+        # Sums of segments (e.g. SSB -> Earth-Moon barycenter -> Earth) or a single segment
+        for segment in getattr(vector, "vector_functions", (vector,)):
+            needed.add((segment.center, segment.target))
+
+    temporary_path = f"{output_path}.tmp"
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(source_path, "rb") as source_file:
+        spk = SPK(DAF(source_file))
+        kept = [
+            (summary, segment) for summary, segment in zip(spk.daf.summaries(), spk.segments)
+            if (segment.center, segment.target) in needed
+        ]
+        summaries = [summary for summary, _ in kept]
+        start_jd = _year_start_jd(start_year) if start_year else min(segment.start_jd for _, segment in kept)
+        end_jd = _year_start_jd(end_year + 1) if end_year else max(segment.end_jd for _, segment in kept)
+        with open(temporary_path, "w+b") as output_file:
+            write_excerpt(spk, output_file, start_jd, end_jd, summaries)
+
+    os.chmod(temporary_path, 0o444)
+    os.replace(temporary_path, output_path)
+    return {
+        "path": os.path.abspath(output_path),
+        "segments": len(summaries),
+        "start_jd": start_jd,
+        "end_jd": end_jd,
+        "bytes": os.path.getsize(output_path),
+    }
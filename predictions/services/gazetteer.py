@@ -0,0 +1,224 @@
+import logging
+import os
+import threading
+import unicodedata
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GAZETTEER_CACHE_SIZE = 10000
+DEFAULT_SEARCH_LIMIT = 10
+
+# Column positions in a GeoNames "geoname" dump (e.g. cities15000.txt)
+GEONAMES_NAME = 1
+GEONAMES_ASCII_NAME = 2
+GEONAMES_ALTERNATE_NAMES = 3
+GEONAMES_LATITUDE = 4
+GEONAMES_LONGITUDE = 5
+GEONAMES_COUNTRY = 8
+GEONAMES_ADMIN1 = 10
+GEONAMES_POPULATION = 14
+GEONAMES_TIMEZONE = 17
+
+# GeoNames companion files, read from the dump's directory when present, so
+# qualifiers can name a country or region ("India", "Maharashtra") as well as code it
+COUNTRY_INFO_NAME = "countryInfo.txt"  # ISO code in column 0, country name in column 4
+ADMIN1_CODES_NAME = "admin1CodesASCII.txt"  # "IN.16", name, ASCII name, geonameid
+
+
+class Place(NamedTuple):
+    name: str
+    latitude: float
+    longitude: float
+    timezone: str
+    country_code: str
+    admin1: str
+    population: int
+
+
+def normalize_place_name(text: str) -> str:
+    """
+    Lowercase ASCII form used for every key: accents stripped, punctuation
+    turned into single spaces ("São Paulo" -> "sao paulo").
+    """
+    text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode("ascii").lower()
+    return " ".join("".join(ch if ch.isalnum() else " " for ch in text).split())
+
+
+class Gazetteer:
+    """
+    Offline place-name index over a GeoNames-style dump.
+
+    Names (and Latin-script alternate names) are normalized and kept as a
+    sorted key array: exact matches are a dict lookup and prefix queries a
+    bisection over the sorted keys, which answers the same questions as a
+    character trie with a fraction of its memory. Resolved queries are
+    memoized in an LRU.
+    """
+
+    def __init__(self, path: str, cache_size: int = DEFAULT_GAZETTEER_CACHE_SIZE):
+        self.path = path
+        self.places: List[Place] = []
+        self._index: Dict[str, Tuple[int, ...]] = {}
+        self._keys: List[str] = []
+        self._coordinates = np.empty((0, 2))
+        # Normalized country / "country.admin1" code -> normalized names
+        self._region_names: Dict[str, Set[str]] = {}
+        self._load()
+        self._load_region_names()
+        self._resolve_cached = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def _load(self) -> None:
+        index: Dict[str, List[int]] = {}
+        with open(self.path, encoding="utf-8") as fh:
+            for line in fh:
+                columns = line.rstrip("\n").split("\t")
+                if len(columns) <= GEONAMES_TIMEZONE:
+                    continue
+                position = len(self.places)
+                self.places.append(Place(
+                    name=columns[GEONAMES_NAME],
+                    latitude=float(columns[GEONAMES_LATITUDE]),
+                    longitude=float(columns[GEONAMES_LONGITUDE]),
+                    timezone=columns[GEONAMES_TIMEZONE],
+                    country_code=columns[GEONAMES_COUNTRY],
+                    admin1=columns[GEONAMES_ADMIN1],
+                    population=int(columns[GEONAMES_POPULATION] or 0),
+                ))
+                names = {columns[GEONAMES_NAME], columns[GEONAMES_ASCII_NAME]}
+                names.update(name for name in columns[GEONAMES_ALTERNATE_NAMES].split(",") if name.isascii())
+                for key in {normalize_place_name(name) for name in names}:
+                    if key:
+                        index.setdefault(key, []).append(position)
+
+        # Most populous place first, so the first candidate is the default answer
+        self._index = {
+            key: tuple(sorted(positions, key=lambda i: -self.places[i].population))
+            for key, positions in index.items()
+        }
+        self._keys = sorted(self._index)
+        coordinates = [[place.latitude, place.longitude] for place in self.places]
+        self._coordinates = np.radians(coordinates).reshape(-1, 2)
+        logger.info(f"Gazetteer loaded {len(self.places)} places, {len(self._keys)} names from {self.path}.")
+
+    def _load_region_names(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        for file_name, code_column, name_columns in (
+            (COUNTRY_INFO_NAME, 0, (4,)),
+            (ADMIN1_CODES_NAME, 0, (1, 2)),
+        ):
+            path = os.path.join(directory, file_name)
+            if not os.path.isfile(path):
+                continue
+            with open(path, encoding="utf-8") as fh:
+                for line in fh:
+                    if line.startswith("#"):
+                        continue
+                    columns = line.rstrip("\n").split("\t")
+                    if len(columns) <= max(name_columns):
+                        continue
+                    names = self._region_names.setdefault(columns[code_column].lower(), set())
+                    names.update(normalize_place_name(columns[column]) for column in name_columns)
+
+    def resolve(self, query: str) -> Optional[Place]:
+        """
+        Best place for free text like "Pune", "Springfield, IL, US" or
+        "Mumbai, India". The first comma-separated part is the place name;
+        later parts prefer candidates whose country or admin1 code matches,
+        or its name when the GeoNames countryInfo.txt / admin1CodesASCII.txt
+        files are installed next to the dump. Otherwise the most populous
+        match wins.
+        """
+        parts = [normalize_place_name(part) for part in (query or "").split(",")]
+        parts = tuple(part for part in parts if part)
+        if not parts:
+            return None
+        return self._resolve_cached(parts)
+
+    def _resolve(self, parts: Tuple[str, ...]) -> Optional[Place]:
+        candidates = self._index.get(parts[0])
+        if not candidates:
+            return None
+
+        # Most matching qualifiers wins; candidates are already in population order
+        qualifiers = set(parts[1:])
+
+        def matches(i: int) -> int:
+            place = self.places[i]
+            country, region = place.country_code.lower(), f"{place.country_code}.{place.admin1}".lower()
+            names = {country, place.admin1.lower()}
+            names |= self._region_names.get(country, set()) | self._region_names.get(region, set())
+            return len(qualifiers & names)
+
+        return self.places[max(candidates, key=matches)]
+
+    def nearest(self, latitude: float, longitude: float) -> Optional[Place]:
+        """
+        Closest indexed place to a coordinate (haversine over all places in
+        one vector pass), e.g. to find the time zone of a "lat, lon" birth place.
+        """
+        if not self.places:
+            return None
+        lat, lon = np.radians(latitude), np.radians(longitude)
+        lats, lons = self._coordinates[:, 0], self._coordinates[:, 1]
+        haversine = np.sin((lats - lat) / 2) ** 2 + np.cos(lat) * np.cos(lats) * np.sin((lons - lon) / 2) ** 2
+        return self.places[int(np.argmin(haversine))]
+
+    def search(self, prefix: str, limit: int = DEFAULT_SEARCH_LIMIT) -> List[Place]:
+        """
+        Places whose normalized name starts with `prefix`, most populous first.
+        """
+        prefix = normalize_place_name(prefix)
+        if not prefix:
+            return []
+        positions = set()
+        start = bisect_left(self._keys, prefix)
+        for key in self._keys[start:]:
+            if not key.startswith(prefix):
+                break
+            positions.update(self._index[key])
+        ranked = sorted(positions, key=lambda i: -self.places[i].population)
+        return [self.places[i] for i in ranked[:limit]]
+
+
+_gazetteer: Optional[Gazetteer] = None
+_gazetteer_missing = False
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer() -> Optional[Gazetteer]:
+    """
+    Process-wide gazetteer loaded from settings.GAZETTEER_PATH on first use,
+    or None if no dump is installed there.
+    """
+    global _gazetteer, _gazetteer_missing
+    if _gazetteer is None and not _gazetteer_missing:
+        with _gazetteer_lock:
+            if _gazetteer is None and not _gazetteer_missing:
+                path = getattr(settings, "GAZETTEER_PATH", "")
+                if not path or not os.path.isfile(path):
+                    logger.warning(f"No gazetteer at '{path}'; place names can't be resolved offline.")
+                    _gazetteer_missing = True
+                    return None
+                cache_size = getattr(settings, "GAZETTEER_CACHE_SIZE", DEFAULT_GAZETTEER_CACHE_SIZE)
+                _gazetteer = Gazetteer(path, cache_size)
+    return _gazetteer
+
+
+def resolve_place(place_name: str) -> Optional[Place]:
+    gazetteer = get_gazetteer()
+    if gazetteer is None:
+        return None
+    return gazetteer.resolve(place_name)
+
+
+def nearest_place(latitude: float, longitude: float) -> Optional[Place]:
+    gazetteer = get_gazetteer()
+    if gazetteer is None:
+        return None
+    return gazetteer.nearest(latitude, longitude)
@@ -0,0 +1,153 @@
+from typing import Tuple
+
+import numpy as np
+
+HOUSE_SYSTEMS = ("placidus", "whole_sign", "equal")
+DEFAULT_HOUSE_SYSTEM = "placidus"
+
+# Mean obliquity at J2000, used when the caller doesn't pass one for the date
+J2000_OBLIQUITY = 23.4392911
+
+PLACIDUS_ITERATIONS = 30
+PLACIDUS_TOLERANCE = 1e-12  # radians
+
+
+def local_sidereal_degrees(gast_hours, longitudes) -> np.ndarray:
+    """
+    Right ascension of the MC (RAMC) in degrees from Greenwich apparent
+    sidereal time (hours) and east longitudes (degrees).
+    """
+    return (np.asarray(gast_hours, dtype=float) * 15.0 + np.asarray(longitudes, dtype=float)) % 360.0
+
+
+def ascendant_and_midheaven(ramc, latitudes, obliquity=J2000_OBLIQUITY):
+    """
+    Ecliptic longitudes (degrees) of the ascendant and the MC for arrays of
+    RAMC and geographic latitude.
+    """
+    ramc_r = np.radians(ramc)
+    lat_r = np.radians(latitudes)
+    eps_r = np.radians(obliquity)
+
+    asc = np.degrees(np.arctan2(
+        np.cos(ramc_r),
+        -(np.sin(ramc_r) * np.cos(eps_r) + np.tan(lat_r) * np.sin(eps_r)),
+    )) % 360.0
+    mc = np.degrees(np.arctan2(np.sin(ramc_r), np.cos(ramc_r) * np.cos(eps_r))) % 360.0
+    return asc, mc
+
+
+def _ra_to_longitude(ra_r, eps_r):
+    # Ecliptic longitude of the ecliptic point with right ascension ra
+    return np.arctan2(np.sin(ra_r), np.cos(ra_r) * np.cos(eps_r))
+
+
+def _placidus_cusp(ramc_r, lat_r, eps_r, fraction, above_horizon):
+    """
+    Iteratively solve for the ecliptic point whose hour angle is `fraction`
+    of its own diurnal (above_horizon) or nocturnal semi-arc.
+    """
+    tan_lat = np.tan(lat_r)
+    if above_horizon:
+        ra = ramc_r + fraction * np.pi / 2.0
+    else:
+        ra = ramc_r + np.pi - fraction * np.pi / 2.0
+
+    for _ in range(PLACIDUS_ITERATIONS):
+        declination = np.arcsin(np.sin(eps_r) * np.sin(_ra_to_longitude(ra, eps_r)))
+        ascensional_difference = np.arcsin(np.clip(tan_lat * np.tan(declination), -1.0, 1.0))
+        if above_horizon:
+            next_ra = ramc_r + fraction * (np.pi / 2.0 + ascensional_difference)
+        else:
+            next_ra = ramc_r + np.pi - fraction * (np.pi / 2.0 - ascensional_difference)
+        converged = np.all(np.abs(next_ra - ra) < PLACIDUS_TOLERANCE)
+        ra = next_ra
+        if converged:
+            break
+    return np.degrees(_ra_to_longitude(ra, eps_r)) % 360.0
+
+
+def _porphyry_cusps(asc, mc):
+    # Trisect each quadrant; used where Placidus is undefined (polar latitudes)
+    cusps = np.empty(asc.shape + (12,))
+    east = (asc - mc) % 360.0
+    west = 180.0 - east
+    cusps[..., 0] = asc
+    cusps[..., 9] = mc
+    cusps[..., 10] = (mc + east / 3.0) % 360.0
+    cusps[..., 11] = (mc + 2.0 * east / 3.0) % 360.0
+    cusps[..., 1] = (asc + west / 3.0) % 360.0
+    cusps[..., 2] = (asc + 2.0 * west / 3.0) % 360.0
+    return cusps
+
+
+def compute_houses(
+    ramc, latitudes, system: str = DEFAULT_HOUSE_SYSTEM, obliquity=J2000_OBLIQUITY
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    House cusps for N charts in one pass.
+
+    `ramc` and `latitudes` are arrays (or scalars) in degrees, `obliquity` is a
+    scalar or per-chart array. Returns (cusps, ascendant): an (N, 12) float
+    array of ecliptic longitudes where column 0 is house 1, and the (N,)
+    ascendant (which differs from cusp 1 for Whole Sign houses).
+
+    Supported systems: "placidus", "whole_sign", "equal". Placidus is
+    undefined inside the polar circles, where it falls back to Porphyry.
+    """
+    if system not in HOUSE_SYSTEMS:
+        raise ValueError(f"Unknown house system '{system}'. Choose from {', '.join(HOUSE_SYSTEMS)}.")
+
+    ramc = np.atleast_1d(np.asarray(ramc, dtype=float))
+    latitudes = np.broadcast_to(np.asarray(latitudes, dtype=float), ramc.shape)
+    obliquity = np.broadcast_to(np.asarray(obliquity, dtype=float), ramc.shape)
+    asc, mc = ascendant_and_midheaven(ramc, latitudes, obliquity)
+    # Inside the polar circles the computed ascendant can fall west of the MC;
+    # use the opposite point so the houses still run MC -> ASC -> IC
+    asc = np.where((asc - mc) % 360.0 > 180.0, (asc + 180.0) % 360.0, asc)
+    offsets = np.arange(12) * 30.0
+
+    if system == "whole_sign":
+        return (((asc // 30.0) * 30.0)[:, None] + offsets) % 360.0, asc
+    if system == "equal":
+        return (asc[:, None] + offsets) % 360.0, asc
+
+    cusps = _porphyry_cusps(asc, mc)
+    polar = np.abs(latitudes) >= 90.0 - obliquity
+    if not polar.all():
+        ramc_r = np.radians(ramc)
+        lat_r = np.radians(latitudes)
+        eps_r = np.radians(obliquity)
+        placidus = {
+            10: _placidus_cusp(ramc_r, lat_r, eps_r, 1.0 / 3.0, True),
+            11: _placidus_cusp(ramc_r, lat_r, eps_r, 2.0 / 3.0, True),
+            1: _placidus_cusp(ramc_r, lat_r, eps_r, 2.0 / 3.0, False),
+            2: _placidus_cusp(ramc_r, lat_r, eps_r, 1.0 / 3.0, False),
+        }
+        for column, values in placidus.items():
+            cusps[:, column] = np.where(polar, cusps[:, column], values)
+
+    # Houses 4-9 mirror 10, 11, 12, 1, 2, 3
+    cusps[:, [3, 4, 5, 6, 7, 8]] = (cusps[:, [9, 10, 11, 0, 1, 2]] + 180.0) % 360.0
+    return cusps, asc
+
+
+def house_positions(longitudes, cusps) -> np.ndarray:
+    """
+    House number (1-12) of each longitude. `longitudes` is (N, K) and `cusps`
+    the matching (N, 12) array; returns an (N, K) int8 array.
+    """
+    longitudes = np.asarray(longitudes, dtype=float)
+    cusps = np.asarray(cusps, dtype=float)
+    spans = (np.roll(cusps, -1, axis=-1) - cusps) % 360.0
+    offsets = (longitudes[..., :, None] - cusps[..., None, :]) % 360.0
+    return (np.argmax(offsets < spans[..., None, :], axis=-1) + 1).astype(np.int8)
+
+
+def compute_house_cusps(
+    ramc, latitudes, system: str = DEFAULT_HOUSE_SYSTEM, obliquity=J2000_OBLIQUITY
+) -> np.ndarray:
+    """
+    (N, 12) cusp array only; see compute_houses.
+    """
+    return compute_houses(ramc, latitudes, system, obliquity)[0]
@@ -0,0 +1,16 @@
+from datetime import datetime, timedelta, timezone
+
+UNIX_EPOCH_JD = 2440587.5
+
+
+def datetime_to_jd(when: datetime) -> float:
+    """
+    Julian date of a datetime (naive = UTC) without going through Skyfield.
+    """
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.timestamp() / 86400.0 + UNIX_EPOCH_JD
+
+
+def jd_to_datetime(jd: float) -> datetime:
+    return datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(days=float(jd) - UNIX_EPOCH_JD)
@@ -0,0 +1,156 @@
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Optional
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone as django_tz
+from skyfield import almanac
+from skyfield.api import wgs84
+from skyfield.framelib import ecliptic_frame
+
+from .astro_service import get_default_zodiac, get_ecliptic_longitude_degrees
+from .ayanamsa import normalize_zodiac, to_sidereal
+from .chart_cache import ChartCache
+from .ephemeris import EphemerisRegistry, ephemeris_registry
+from .zodiac import NAKSHATRA_SPAN, get_nakshatra
+
+logger = logging.getLogger(__name__)
+
+PANCHANG_VERSION = 1
+DEFAULT_PANCHANG_GRID_DEGREES = 0.25
+DEFAULT_PANCHANG_CACHE_SIZE = 2048
+DEFAULT_PANCHANG_CACHE_TIMEOUT = 60 * 60 * 36  # 36 hours
+
+TITHI_SPAN = 12.0
+KARANA_SPAN = 6.0
+
+TITHIS = (
+    "Pratipada", "Dwitiya", "Tritiya", "Chaturthi", "Panchami", "Shashthi", "Saptami", "Ashtami",
+    "Navami", "Dashami", "Ekadashi", "Dwadashi", "Trayodashi", "Chaturdashi",
+)
+YOGAS = (
+    "Vishkambha", "Priti", "Ayushman", "Saubhagya", "Shobhana", "Atiganda", "Sukarma", "Dhriti", "Shula",
+    "Ganda", "Vriddhi", "Dhruva", "Vyaghata", "Harshana", "Vajra", "Siddhi", "Vyatipata", "Variyana",
+    "Parigha", "Shiva", "Siddha", "Sadhya", "Shubha", "Shukla", "Brahma", "Indra", "Vaidhriti",
+)
+# Seven movable karanas repeat from the 2nd half-tithi to the 57th; the first
+# and last three half-tithis of the lunar month have fixed karanas
+MOVABLE_KARANAS = ("Bava", "Balava", "Kaulava", "Taitila", "Garaja", "Vanija", "Vishti")
+FIXED_KARANAS = {0: "Kimstughna", 57: "Shakuni", 58: "Chatushpada", 59: "Naga"}
+# Indexed by date.weekday() (Monday = 0)
+VARAS = ("Somavara", "Mangalavara", "Budhavara", "Guruvara", "Shukravara", "Shanivara", "Ravivara")
+
+
+def tithi(sun_longitude: float, moon_longitude: float) -> Dict[str, Any]:
+    elongation = (moon_longitude - sun_longitude) % 360.0
+    number = int(elongation // TITHI_SPAN) + 1
+    paksha = "Shukla" if number <= 15 else "Krishna"
+    day = (number - 1) % 15
+    if day == 14:
+        name = "Purnima" if paksha == "Shukla" else "Amavasya"
+    else:
+        name = TITHIS[day]
+    return {"number": number, "name": name, "paksha": paksha}
+
+
+def karana(sun_longitude: float, moon_longitude: float) -> str:
+    half = int((moon_longitude - sun_longitude) % 360.0 // KARANA_SPAN)
+    return FIXED_KARANAS.get(half) or MOVABLE_KARANAS[(half - 1) % 7]
+
+
+def yoga(sun_longitude: float, moon_longitude: float) -> Dict[str, Any]:
+    index = int((sun_longitude + moon_longitude) % 360.0 // NAKSHATRA_SPAN)
+    return {"number": index + 1, "name": YOGAS[index]}
+
+
+class PanchangService:
+    """
+    Daily Panchang (tithi, vara, nakshatra, yoga, karana) with sunrise and
+    sunset for one location, on the same shared ephemeris as AstroService.
+    The limbs are taken at local sunrise, as a Panchang is read.
+    """
+
+    def __init__(self, registry: EphemerisRegistry = None, zodiac: str = None):
+        self.registry = registry or ephemeris_registry
+        self.zodiac = normalize_zodiac(zodiac) if zodiac else get_default_zodiac()
+
+    def compute(self, day: date, latitude: float, longitude: float) -> Dict[str, Any]:
+        ts = self.registry.timescale()
+        eph = self.registry.ephemeris()
+        observer = eph["earth"] + wgs84.latlon(latitude, longitude)
+
+        # The local solar day: midnight shifted by the longitude, no time zone needed
+        start = datetime.combine(day, time(0), tzinfo=timezone.utc) - timedelta(hours=longitude / 15.0)
+        t0, t1 = ts.from_datetime(start), ts.from_datetime(start + timedelta(days=1))
+        sunrise = self._first_event(almanac.find_risings, observer, eph["sun"], t0, t1)
+        sunset = self._first_event(almanac.find_settings, observer, eph["sun"], t0, t1)
+        # Polar day or night: fall back to local noon
+        moment = sunrise if sunrise is not None else ts.tt_jd(t0.tt + 0.5)
+
+        earth_at_t = eph["earth"].at(moment)
+        rotation = ecliptic_frame.rotation_at(moment)
+        sun, moon = (
+            float(get_ecliptic_longitude_degrees(earth_at_t.observe(eph[name]).apparent(), rotation))
+            for name in ("sun", "moon")
+        )
+        sidereal_sun, sidereal_moon = to_sidereal(np.array([sun, moon]), moment.tt, self.zodiac).tolist()
+        nakshatra, pada = get_nakshatra(sidereal_moon)
+
+        return {
+            "date": day.isoformat(),
+            "latitude": latitude,
+            "longitude": longitude,
+            "zodiac": self.zodiac,
+            "sunrise": sunrise.utc_datetime().isoformat() if sunrise is not None else None,
+            "sunset": sunset.utc_datetime().isoformat() if sunset is not None else None,
+            "computed_for": moment.utc_datetime().isoformat(),
+            "vara": VARAS[day.weekday()],
+            # Tithi and karana depend on the Sun-Moon elongation, which no ayanamsa changes
+            "tithi": tithi(sun, moon),
+            "nakshatra": {"name": nakshatra, "pada": pada},
+            "yoga": yoga(sidereal_sun, sidereal_moon),
+            "karana": karana(sun, moon),
+        }
+
+    @staticmethod
+    def _first_event(finder, observer, body, t0, t1):
+        times, found = finder(observer, body, t0, t1)
+        times = times[found]
+        return times[0] if len(times) else None
+
+
+# Keyed by (day, grid point): every user near a point shares one computation per day
+panchang_cache = ChartCache(
+    maxsize=getattr(settings, "PANCHANG_CACHE_SIZE", DEFAULT_PANCHANG_CACHE_SIZE),
+    timeout=getattr(settings, "PANCHANG_CACHE_TIMEOUT", DEFAULT_PANCHANG_CACHE_TIMEOUT),
+    time_resolution_seconds=24 * 60 * 60,
+    coord_resolution_degrees=getattr(settings, "PANCHANG_GRID_DEGREES", DEFAULT_PANCHANG_GRID_DEGREES),
+    key_prefix="panchang",
+)
+
+
+def get_daily_panchang(
+    latitude: float,
+    longitude: float,
+    day: Optional[date] = None,
+    service: PanchangService = None,
+) -> Dict[str, Any]:
+    """
+    Panchang for `day` (default: today, UTC) at the point of the
+    PANCHANG_GRID_DEGREES grid nearest the location (coordinates rounded to
+    multiples of the grid step, as ChartCache.quantize does). Cached
+    in-process and in the Django cache, so each grid point is computed at
+    most once a day.
+    """
+    day = day or django_tz.now().date()
+    service = service or PanchangService()
+
+    def compute(moment: datetime, lat: float, lon: float) -> Dict[str, Any]:
+        logger.info(f"Computing Panchang for {moment.date().isoformat()} at grid point ({lat}, {lon}).")
+        return service.compute(moment.date(), lat, lon)
+
+    return panchang_cache.get_or_compute(
+        datetime.combine(day, time(0), tzinfo=timezone.utc), latitude, longitude, compute,
+        variant=f"v{PANCHANG_VERSION}:{service.zodiac}",
+    )
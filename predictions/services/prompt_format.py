@@ -0,0 +1,142 @@
+from typing import Any, Dict
+
+from .ayanamsa import TROPICAL, normalize_zodiac
+from .zodiac import ZODIAC_SIGNS
+
+# Dense, stable text encodings of the computed data embedded in reading
+# prompts. The Python repr of the chart dicts spends most of its tokens on
+# quotes, braces and repeated keys; these lines carry the same values.
+
+BODY_ABBREVIATIONS = {
+    "Sun": "Su", "Moon": "Mo", "Mercury": "Me", "Venus": "Ve", "Mars": "Ma",
+    "Jupiter": "Ju", "Saturn": "Sa", "Uranus": "Ur", "Neptune": "Ne", "Pluto": "Pl",
+}
+
+
+def chart_legend(zodiac: str) -> str:
+    """
+    Read once by the model in front of the encoded data. Names the zodiac the
+    positions were computed in, e.g. "sidereal, lahiri ayanamsa".
+    """
+    zodiac = normalize_zodiac(zodiac)
+    label = TROPICAL if zodiac == TROPICAL else f"sidereal, {zodiac} ayanamsa"
+    return (
+        f"Format: body sign degree-in-sign ({label}). Su Sun, Mo Moon, Me Mercury, Ve Venus, Ma Mars, "
+        "Ju Jupiter, Sa Saturn, Ur Uranus, Ne Neptune, Pl Pluto; R retrograde; cusps list houses 1-12."
+    )
+
+
+def format_position(longitude: float) -> str:
+    """
+    "Ari 17.1" for 17.07°: the sign abbreviation and the degree within the sign.
+    """
+    # Rounded before picking the sign, so 359.99° is "Ari 0.0", not "Pis 30.0"
+    longitude = round(float(longitude) % 360.0, 1) % 360.0
+    sign = int(longitude // 30.0)
+    return f"{ZODIAC_SIGNS[sign][:3]} {longitude - sign * 30.0:.1f}"
+
+
+def format_chart(birth_chart: Dict[str, Any]) -> str:
+    """
+    A birth chart dict (calculate_birth_chart shape) as three lines:
+
+        Asc Vir 5.8
+        Su Ari 17.1, Mo Can 12.6, ...
+        Cusps Vir 5.8, Lib 5.2, ...
+    """
+    if not birth_chart:
+        return "Unknown (no birth data)"
+    planets = ", ".join(
+        f"{BODY_ABBREVIATIONS.get(name, name)} {format_position(planet['longitude_deg'])}"
+        for name, planet in birth_chart["planets"].items()
+    )
+    cusps = ", ".join(
+        format_position(birth_chart["houses"][str(number)]["degree"]) for number in range(1, 13)
+    )
+    return f"Asc {format_position(birth_chart['ascendant']['degree'])}\n{planets}\nCusps {cusps}"
+
+
+def format_transits(snapshot: Dict[str, Any]) -> str:
+    """
+    A daily transit snapshot as one line of positions (R for retrograde)
+    and the Moon's nakshatra.
+    """
+    planets = ", ".join(
+        f"{BODY_ABBREVIATIONS.get(name, name)} {format_position(planet['longitude_deg'])}"
+        f"{' R' if planet.get('retrograde') else ''}"
+        for name, planet in snapshot["planets"].items()
+    )
+    nakshatra = snapshot["moon_nakshatra"]
+    return f"{snapshot['date']}: {planets}\nMoon nakshatra {nakshatra['name']} pada {nakshatra['pada']}"
+
+
+def format_aspects(aspects: Dict[str, Any]) -> str:
+    """
+    chart_aspects() output as two lines: "Su-Mo trine 1.2, ..." and the
+    graha drishti "Ma>Ju Sa, ...".
+    """
+    def abbreviate(name: str) -> str:
+        return BODY_ABBREVIATIONS.get(name, name)
+
+    angular = ", ".join(
+        f"{'-'.join(abbreviate(body) for body in aspect['bodies'])} {aspect['aspect']} {aspect['orb']:.1f}"
+        for aspect in aspects["aspects"]
+    )
+    drishti = ", ".join(
+        f"{abbreviate(name)}>{' '.join(abbreviate(target) for target in targets)}"
+        for name, targets in aspects["drishti"].items()
+    )
+    return f"Aspects (orb): {angular or 'none'}\nDrishti: {drishti or 'none'}"
+
+
+def format_factors(factors: Dict[str, str]) -> str:
+    """
+    A chart class ({factor: label}) as "ascendant Leo, moon nakshatra Hasta".
+    """
+    if not factors:
+        return "Unknown (no birth data)"
+    return ", ".join(f"{factor.replace('_', ' ')} {label}" for factor, label in factors.items())
+
+
+def format_vargas(signs: Dict[str, Dict[str, str]]) -> str:
+    """
+    divisional_chart_signs() output as one line per varga: "D9: Su Leo, ..., Asc Vir".
+    """
+    def abbreviate(name: str) -> str:
+        return "Asc" if name == "Ascendant" else BODY_ABBREVIATIONS.get(name, name)
+
+    return "\n".join(
+        f"{varga}: " + ", ".join(f"{abbreviate(name)} {sign[:3]}" for name, sign in placements.items())
+        for varga, placements in signs.items()
+    )
+
+
+def format_dasha(summary: Dict[str, Any]) -> str:
+    """
+    DashaTimeline.prompt_summary() output: the mahadasha sequence with end
+    ages, then the periods running now.
+    """
+    mahadashas = ", ".join(
+        f"{period['lord']} {period['start']} to {period['end']} (age {period['age_end']})"
+        for period in summary["mahadashas"]
+    )
+    current = ", ".join(f"{level} {period}" for level, period in summary.get("current", {}).items())
+    return f"Mahadashas: {mahadashas}\nNow: {current or 'unknown'}"
+
+
+def format_panchang(panchang: Dict[str, Any]) -> str:
+    """
+    A daily Panchang as one line: the limbs (at sunrise) and sunrise/sunset in UTC.
+    """
+    def clock(value) -> str:
+        return f"{value[11:16]} UTC" if value else "none"
+
+    tithi = panchang["tithi"]
+    nakshatra = panchang["nakshatra"]
+    return (
+        f"{panchang['date']} {panchang['vara']}: "
+        f"tithi {tithi['paksha']} {tithi['name']} ({tithi['number']}), "
+        f"nakshatra {nakshatra['name']} pada {nakshatra['pada']}, "
+        f"yoga {panchang['yoga']['name']}, karana {panchang['karana']}; "
+        f"sunrise {clock(panchang['sunrise'])}, sunset {clock(panchang['sunset'])}"
+    )
@@ -1,17 +1,72 @@
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
 import logging
-from datetime import datetime, date
+from concurrent.futures import ThreadPoolExecutor
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.utils import timezone as django_tz
 
-from assistant.openai_utils import OpenAIAPI
-from .astro_service import AstroService
+from assistant.openai_utils import JSONSectionParser, OpenAIAPI, count_message_tokens
+from assistant.response_cache import response_cache
+from .aspects import chart_aspects
+from .chart_classes import group_by_class, personal_details
+from .astro_service import AstroService, get_default_zodiac
+from .chart_store import (
+    birth_datetime,
+    birth_location,
+    get_profile_birth_chart,
+    has_birth_data,
+    refresh_profile_charts,
+)
+from .dasha import dasha_timeline_for_chart
+from .panchang import get_daily_panchang
+from .prompt_format import (
+    chart_legend,
+    format_aspects,
+    format_chart,
+    format_dasha,
+    format_factors,
+    format_panchang,
+    format_transits,
+    format_vargas,
+)
+from .transits import get_daily_transit_snapshot
+from .vargas import divisional_chart_signs
 from predictions.models import Prediction
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
+# Sections of one user's readings generated at the same time (each is one LLM round trip)
+DEFAULT_READING_SECTION_CONCURRENCY = 6
+# How long identical reading requests are answered from the LLM response
+# cache, where it differs from LLM_RESPONSE_CACHE_TIMEOUT (0: never cached)
+DEFAULT_READING_RESPONSE_CACHE_TIMEOUTS = {"today_reading": 60 * 60 * 24}
+
+# Readings that talk about ages and life stages get the computed dasha timeline
+DASHA_READING_TYPES = ("major_life_periods", "career_success_and_wealth")
+# Natal readings that get the computed planetary aspects (today_reading uses transits instead)
+ASPECT_READING_TYPES = (
+    "core_personality_and_life_path",
+    "relationships_love_and_marriage",
+    "health_and_wellbeing",
+    "challenges_and_remedies",
+)
+# Divisional charts each reading type is judged from, besides the birth chart (D1)
+READING_VARGAS = {
+    "relationships_love_and_marriage": ("D9",),
+    "career_success_and_wealth": ("D10",),
+}
+
+
+def reading_cache_timeout(reading_types: Iterable[str]) -> int:
+    """
+    Response cache timeout (seconds) for a request covering these reading types.
+    """
+    timeouts = getattr(settings, "READING_RESPONSE_CACHE_TIMEOUTS", DEFAULT_READING_RESPONSE_CACHE_TIMEOUTS)
+    return min(timeouts.get(reading_type, response_cache.timeout) for reading_type in reading_types)
+
 
 class ReadingService:
     """
@@ -44,6 +99,7 @@ You are a Vedic astrology expert. Analyze the provided birth chart for career in
 1. Career success and wealth potential
 2. Foreign opportunities
 3. Business vs employment
+Base any ages on the provided Vimshottari dasha periods.
 
 Return JSON:
 {
@@ -97,7 +153,8 @@ Return JSON:
 }""",
 
             "major_life_periods": """
-You are a Vedic astrology expert. Analyze the birth chart for key life stages:
+You are a Vedic astrology expert. Analyze the birth chart for key life stages.
+Tie each stage to the provided Vimshottari dasha periods and their ages:
 Return JSON:
 {
   "major_life_periods": {
@@ -108,7 +165,7 @@ Return JSON:
 }""",
 
             "today_reading": """
-You are a Vedic astrology expert. Provide today's reading:
+You are a Vedic astrology expert. Use today's transits against the birth chart to provide today's reading:
 Return JSON:
 {
   "today_reading": {
@@ -121,55 +178,84 @@ Return JSON:
 }"""
         }
 
-    def generate_reading(self, user: Any, reading_type: str = "today_reading") -> Dict[str, Any]:
+    def calculate_birth_charts_for_users(self, users) -> Dict[Any, Dict[str, Any]]:
+        """
+        Birth charts for many users. Charts already stored on the profiles are
+        reused as-is; stale or missing ones are computed with a single
+        vectorized AstroService call and written back to the profiles.
+        Returns {user.id: birth_chart}; users without complete birth data are skipped.
+        """
+        with_profiles = []
+        for user in users:
+            profile = getattr(user, "profile", None)
+            if has_birth_data(profile):
+                with_profiles.append((user, profile))
+
+        refresh_profile_charts([profile for _, profile in with_profiles], self.astro_service)
+        return {user.id: profile.birth_chart for user, profile in with_profiles}
+
+    def generate_readings(self, user: Any, reading_types: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Generate several reading types for one user concurrently. The birth
+        chart is loaded (or computed) once and shared by every section, and
+        at most READING_SECTION_CONCURRENCY LLM requests are in flight, so
+        the total time is about that of the slowest section.
+        Returns {reading_type: content}.
+        """
+        reading_types = list(reading_types)
+        birth_chart = self._load_birth_chart(user)
+
+        def generate(reading_type: str) -> Dict[str, Any]:
+            try:
+                return self.generate_reading(user, reading_type=reading_type, birth_chart=birth_chart)
+            finally:
+                # Worker threads get their own DB connection; don't leak it
+                connection.close()
+
+        concurrency = getattr(settings, "READING_SECTION_CONCURRENCY", DEFAULT_READING_SECTION_CONCURRENCY)
+        workers = max(1, min(concurrency, len(reading_types)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reading-section") as pool:
+            futures = {reading_type: pool.submit(generate, reading_type) for reading_type in reading_types}
+        return {reading_type: future.result() for reading_type, future in futures.items()}
+
+    def generate_reading(
+        self,
+        user: Any,
+        reading_type: str = "today_reading",
+        birth_chart: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
         """
         Generate a reading by:
          1) Checking for user profile birth chart info
          2) Passing relevant prompt + chart info to OpenAI
          3) Storing the resulting content in the DB as a new Prediction
+
+        Callers that already computed the chart (e.g. in a batch) can pass it
+        as birth_chart to skip the astronomy step.
         """
 
         profile = getattr(user, "profile", None)
-        if profile and profile.date_of_birth and profile.time_of_birth:
-            # Combine date + time into a single datetime (UTC).
-            dob = profile.date_of_birth
-            tob = profile.time_of_birth
-            full_dt = datetime(
-                dob.year,
-                dob.month,
-                dob.day,
-                tob.hour,
-                tob.minute,
-                tob.second
-            )
-            place_of_birth = profile.place_of_birth or "48.8566,2.3522"  # fallback
-            birth_chart = self.astro_service.calculate_birth_chart(
-                date_of_birth=dob,
-                time_of_birth=full_dt,
-                place_of_birth=place_of_birth
-            )
+        if birth_chart is not None:
+            logger.debug(f"Using precomputed birth chart for user {user.id}.")
         else:
-            logger.warning(f"User {user.id} missing or incomplete birth data; using fallback chart.")
-            birth_chart = {}
-
-        # Determine the language for the response (from profile)
-        user_language = "en"
-        if profile and profile.preferred_language:
-            user_language = profile.preferred_language
+            birth_chart = self._load_birth_chart(user)
 
         # Construct the base prompt
         base_prompt = self.prompts.get(reading_type, self.prompts["today_reading"])
-        content = (
-            f"This is the user's birth chart:\n{birth_chart}\n\n"
-            f"Respond in {user_language}. Provide a detailed reading:\n\n{base_prompt}"
-        )
+        content = self._chart_context(profile, birth_chart, (reading_type,))
+        content += f"Respond in {self._language(profile)}. Provide a detailed reading:\n\n{base_prompt}"
 
         # Call OpenAI
         messages = [
             {"role": "system", "content": "You are a helpful Vedic astrology assistant."},
             {"role": "user", "content": content},
         ]
-        response = self.openai_api.chat_completion(messages)
+        # The chart, language and prompt are all in the messages: identical
+        # requests (retries, same birth moment) are served from the cache
+        logger.info(f"{reading_type} prompt for user {user.id}: {count_message_tokens(messages)} tokens.")
+        response = self.openai_api.chat_completion(
+            messages, cache_timeout=reading_cache_timeout((reading_type,))
+        )
 
         if not isinstance(response, dict):
             # If not a structured JSON, wrap in dict
@@ -183,3 +269,214 @@ Return JSON:
         )
 
         return pred_obj.content
+
+    def generate_combined_reading(
+        self,
+        user: Any,
+        reading_types: Iterable[str],
+        birth_chart: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Generate several reading types with one streamed completion instead
+        of one request per section: the chart and the shared context are sent
+        once. Each section is stored as its own Prediction as soon as its
+        JSON value closes in the stream (see iter_combined_reading).
+        Returns {reading_type: content}.
+        """
+        return dict(self.iter_combined_reading(user, reading_types, birth_chart))
+
+    def iter_combined_reading(
+        self,
+        user: Any,
+        reading_types: Iterable[str],
+        birth_chart: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yield (reading_type, content) in the order the sections finish
+        streaming, each already stored as a Prediction. Sections the stream
+        didn't deliver (a failed or truncated response) are then generated
+        one by one with generate_reading.
+        """
+        reading_types = list(dict.fromkeys(reading_types))
+        profile = getattr(user, "profile", None)
+        if birth_chart is None:
+            birth_chart = self._load_birth_chart(user)
+
+        content = self._chart_context(profile, birth_chart, reading_types)
+        content += (
+            f"Respond in {self._language(profile)}. Provide a detailed reading:\n\n"
+            f"{self.combined_prompt(reading_types)}"
+        )
+        messages = [
+            {"role": "system", "content": "You are a helpful Vedic astrology assistant."},
+            {"role": "user", "content": content},
+        ]
+
+        logger.info(f"Combined prompt for user {user.id}: {count_message_tokens(messages)} tokens.")
+        pending = set(reading_types)
+        parser = JSONSectionParser()
+        cache_timeout = reading_cache_timeout(reading_types)
+        for text in self.openai_api.chat_completion_stream(messages, cache_timeout=cache_timeout):
+            for reading_type, section in parser.feed(text):
+                if reading_type not in pending:
+                    logger.warning(f"Ignoring unexpected section {reading_type!r} in combined reading.")
+                    continue
+                pending.discard(reading_type)
+                # Same shape as a single reading: {reading_type: {...}}
+                prediction = Prediction.objects.create(
+                    user=user,
+                    prediction_type=reading_type,
+                    content={reading_type: section},
+                )
+                yield reading_type, prediction.content
+
+        for reading_type in [reading_type for reading_type in reading_types if reading_type in pending]:
+            logger.warning(f"Combined reading for user {user.id} lacked {reading_type}; generating it alone.")
+            yield reading_type, self.generate_reading(user, reading_type, birth_chart=birth_chart)
+
+    def generate_class_reading(self, factors: Dict[str, str], language: str = "en") -> Dict[str, Any]:
+        """
+        The shared daily reading for every chart in one equivalence class
+        ({factor: label}, see chart_classes): the prompt carries the class
+        and today's transits, not any one user's chart. Not stored.
+        """
+        transits = get_daily_transit_snapshot()
+        content = f"These are the defining factors of the user's birth chart:\n{format_factors(factors)}\n\n"
+        content += f"{chart_legend(get_default_zodiac())}\n\n"
+        content += f"These are today's planetary transits:\n{format_transits(transits)}\n\n"
+        content += f"Respond in {language}. Provide a detailed reading:\n\n{self.prompts['today_reading']}"
+        messages = [
+            {"role": "system", "content": "You are a helpful Vedic astrology assistant."},
+            {"role": "user", "content": content},
+        ]
+        response = self.openai_api.chat_completion(
+            messages, cache_timeout=reading_cache_timeout(("today_reading",))
+        )
+        if not isinstance(response, dict):
+            response = {"raw": str(response)}
+        return response
+
+    def generate_daily_readings_by_class(
+        self,
+        users: Iterable[Any],
+        charts: Dict[Any, Dict[str, Any]],
+        class_readings: Optional[Dict[Tuple, Dict[str, Any]]] = None,
+    ) -> int:
+        """
+        "today" readings for many users with one LLM call per chart class and
+        language instead of one per user. Each user's Prediction is the class
+        reading plus their personal_details, rendered locally.
+
+        charts is {user.id: birth_chart}; users without one share the class
+        of unknown charts. Pass the same class_readings dict for every batch
+        of a run so each class is generated once per run.
+        Returns the number of readings stored.
+        """
+        class_readings = {} if class_readings is None else class_readings
+        transits = get_daily_transit_snapshot()
+        now = django_tz.now()
+        users = list(users)
+        groups = group_by_class(
+            (user, charts.get(user.id), self._language(getattr(user, "profile", None))) for user in users
+        )
+
+        predictions = []
+        for key, members in groups.items():
+            if key not in class_readings:
+                language, factors = key
+                class_readings[key] = self.generate_class_reading(dict(factors), language)
+            for user in members:
+                content = dict(class_readings[key])
+                content["chart_class"] = dict(key[1])
+                content["personal"] = personal_details(
+                    charts.get(user.id), transits, getattr(user, "profile", None), now
+                )
+                predictions.append(Prediction(user=user, prediction_type="today_reading", content=content))
+        Prediction.objects.bulk_create(predictions)
+        logger.info(f"Stored {len(predictions)} daily readings from {len(groups)} chart classes.")
+        return len(predictions)
+
+    def combined_prompt(self, reading_types: Iterable[str]) -> str:
+        """
+        Merge the prompts of several reading types into one: their
+        instructions one after another, and a single JSON schema with one
+        top-level key per reading type.
+        """
+        instructions, schemas = [], []
+        for reading_type in reading_types:
+            prompt = self.prompts[reading_type]
+            head, _, schema = prompt.partition("\n{\n")
+            lines = [
+                line.replace("You are a Vedic astrology expert. ", "")
+                for line in head.strip().splitlines()
+                if line.strip() and not line.startswith("Return JSON")
+            ]
+            instructions.append(f"{reading_type}:\n" + "\n".join(lines))
+            schemas.append(schema.rstrip()[:-1].rstrip())
+        sections = "\n\n".join(instructions)
+        schema = ",\n".join(schemas)
+        return f"""
+You are a Vedic astrology expert. Analyze the provided birth chart for each of these sections.
+
+{sections}
+
+Return JSON only with this shape, the sections in this order:
+{{
+{schema}
+}}"""
+
+    def _load_birth_chart(self, user: Any) -> Dict[str, Any]:
+        profile = getattr(user, "profile", None)
+        if has_birth_data(profile):
+            # Stored on the profile; only recomputed when the birth fields
+            # or the chart engine version change
+            return get_profile_birth_chart(profile, self.astro_service)
+        logger.warning(f"User {user.id} missing or incomplete birth data; using fallback chart.")
+        return {}
+
+    @staticmethod
+    def _language(profile: Any) -> str:
+        # Determine the language for the response (from profile)
+        if profile and profile.preferred_language:
+            return profile.preferred_language
+        return "en"
+
+    def _chart_context(self, profile: Any, birth_chart: Dict[str, Any], reading_types: Iterable[str]) -> str:
+        """
+        The computed data the prompt for these reading types is built on:
+        the birth chart, plus transits, Panchang, aspects, divisional charts
+        and dasha periods for the reading types that use them.
+        """
+        reading_types = tuple(reading_types)
+        content = f"{chart_legend(get_default_zodiac())}\n\n"
+        content += f"This is the user's birth chart:\n{format_chart(birth_chart)}\n\n"
+        if "today_reading" in reading_types:
+            # Shared by every reading generated today; computed once per day per process
+            transits = get_daily_transit_snapshot()
+            content += f"These are today's planetary transits:\n{format_transits(transits)}\n\n"
+            if has_birth_data(profile):
+                # Shared by everyone in the same grid cell today. Profiles only
+                # store the birth place, so that is where it is computed
+                panchang = format_panchang(get_daily_panchang(*birth_location(profile)))
+                content += (
+                    "This is today's Panchang computed at the user's place of birth (their current "
+                    "location is not known; sunrise-based timings may differ where they are now):\n"
+                    f"{panchang}\n\n"
+                )
+        if not birth_chart:
+            return content
+        if any(reading_type in ASPECT_READING_TYPES for reading_type in reading_types):
+            aspects = format_aspects(chart_aspects(birth_chart))
+            content += f"These are the aspects in the user's birth chart:\n{aspects}\n\n"
+        vargas = tuple(dict.fromkeys(
+            varga for reading_type in reading_types for varga in READING_VARGAS.get(reading_type, ())
+        ))
+        if vargas:
+            signs = format_vargas(divisional_chart_signs(birth_chart, vargas))
+            content += f"These are the user's divisional chart signs:\n{signs}\n\n"
+        if has_birth_data(profile) and set(reading_types) & set(DASHA_READING_TYPES):
+            # Computed, not guessed: the LLM only interprets the periods
+            timeline = dasha_timeline_for_chart(birth_chart, birth_datetime(profile))
+            summary = format_dasha(timeline.prompt_summary(django_tz.now()))
+            content += f"These are the user's Vimshottari dasha periods:\n{summary}\n\n"
+        return content
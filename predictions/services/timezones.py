@@ -0,0 +1,115 @@
+import logging
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+UTC_ZONE = "UTC"
+SECONDS_PER_DAY = 86400
+TRANSITION_SEARCH_STEPS = 17  # one day / 2**17 is under a second
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+EPOCH_ORDINAL = _EPOCH.toordinal()
+
+
+@lru_cache(maxsize=None)
+def _zone(name: str):
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning(f"Unknown time zone '{name}'; treating birth times in it as UTC.")
+        return None
+
+
+def _offset_seconds(zone, utc_seconds: int) -> int:
+    return int(datetime.fromtimestamp(utc_seconds, tz=zone).utcoffset().total_seconds())
+
+
+@lru_cache(maxsize=8192)
+def zone_year_table(zone_name: str, year: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    UTC offsets of `zone_name` through `year`, from the IANA database
+    (historical rules included), as (boundaries, offsets): local wall-clock
+    seconds since the epoch where each offset starts, and the offset in
+    seconds. boundaries[0] is a sentinel before any time in the year.
+
+    Transitions are found by sampling the offset once a day and bisecting the
+    days where it changes, so a table costs a few hundred tz lookups once per
+    (zone, year); converting rows afterwards is a searchsorted.
+
+    At a transition, nonexistent and repeated wall-clock times take the
+    offset in effect before it, like datetime's fold=0.
+    """
+    zone = _zone(zone_name)
+    if zone is None:
+        return np.array([np.iinfo(np.int64).min]), np.array([0])
+
+    start = int((datetime(year, 1, 1, tzinfo=timezone.utc) - _EPOCH).total_seconds()) - 2 * SECONDS_PER_DAY
+    days = start + SECONDS_PER_DAY * np.arange(370)
+    daily = np.array([_offset_seconds(zone, int(day)) for day in days])
+
+    boundaries, offsets = [np.iinfo(np.int64).min], [int(daily[0])]
+    for index in np.nonzero(daily[1:] != daily[:-1])[0]:
+        lo, hi = int(days[index]), int(days[index + 1])
+        for _ in range(TRANSITION_SEARCH_STEPS):
+            mid = (lo + hi) // 2
+            if _offset_seconds(zone, mid) == daily[index]:
+                lo = mid
+            else:
+                hi = mid
+        before, after = int(daily[index]), _offset_seconds(zone, hi)
+        boundaries.append(hi + max(before, after))
+        offsets.append(after)
+    return np.array(boundaries, dtype=np.int64), np.array(offsets, dtype=np.int64)
+
+
+def local_to_utc_seconds(local_seconds, zone_names: Sequence[str]) -> np.ndarray:
+    """
+    Vectorized core of local_to_utc. `local_seconds` are wall-clock times as
+    seconds since 1970-01-01 (as if they were UTC), one zone name per row.
+    Rows are grouped by (zone, year), so each group is one cached table and
+    one np.searchsorted. Blank zone names mean UTC.
+    """
+    local_seconds = np.asarray(local_seconds, dtype=np.int64)
+    zone_names = np.asarray([name or UTC_ZONE for name in zone_names], dtype=object)
+    years = local_seconds.astype("datetime64[s]").astype("datetime64[Y]").astype(np.int64) + 1970
+
+    utc_seconds = local_seconds.copy()
+    if not len(local_seconds):
+        return utc_seconds
+    zones, zone_codes = np.unique(zone_names.astype(str), return_inverse=True)
+    keys = zone_codes * 10000 + (years - years.min())
+    _, inverse = np.unique(keys, return_inverse=True)
+    order = np.argsort(inverse, kind="stable")
+    for rows in np.split(order, np.cumsum(np.bincount(inverse))[:-1]):
+        zone_name, year = zones[zone_codes[rows[0]]], int(years[rows[0]])
+        if zone_name == UTC_ZONE:
+            continue
+        boundaries, offsets = zone_year_table(zone_name, year)
+        position = np.searchsorted(boundaries, local_seconds[rows], side="right") - 1
+        utc_seconds[rows] = local_seconds[rows] - offsets[position]
+    return utc_seconds
+
+
+def local_to_utc(local_datetimes: Sequence[datetime], zone_names: Sequence[str]) -> List[datetime]:
+    """
+    Convert naive local birth datetimes, each with its IANA zone name, to
+    naive UTC datetimes (the convention AstroService uses) in bulk.
+    """
+    if not len(local_datetimes):
+        return []
+    # Plain integer arithmetic is several times faster than numpy's datetime parsing
+    local_seconds = np.fromiter(
+        (
+            (dt.toordinal() - EPOCH_ORDINAL) * SECONDS_PER_DAY + dt.hour * 3600 + dt.minute * 60 + dt.second
+            for dt in local_datetimes
+        ),
+        dtype=np.int64,
+        count=len(local_datetimes),
+    )
+    utc_seconds = local_to_utc_seconds(local_seconds, zone_names)
+    return utc_seconds.astype("datetime64[s]").astype(object).tolist()
@@ -0,0 +1,285 @@
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from skyfield.framelib import ecliptic_frame
+
+from .astro_service import PLANET_NAMES, get_default_zodiac, get_ecliptic_longitude_degrees
+from .ayanamsa import normalize_zodiac, to_sidereal
+from .ephemeris import EphemerisRegistry, ephemeris_registry
+from .julian import datetime_to_jd, jd_to_datetime
+from .zodiac import NAKSHATRA_SPAN
+
+logger = logging.getLogger(__name__)
+
+TRANSIT_INDEX_VERSION = 3
+MANIFEST_NAME = "index.json"
+
+# Event kinds stored per body, with the width of the zodiac division they track
+EVENT_SIGN = "sign"
+EVENT_NAKSHATRA = "nakshatra"
+EVENT_STATION = "station"
+DIVISION_WIDTHS = {EVENT_SIGN: 30.0, EVENT_NAKSHATRA: NAKSHATRA_SPAN}
+
+# Sun and Moon never station
+NON_STATIONING_BODIES = ("Sun", "Moon")
+
+# The Moon moves < 4 degrees per quarter day, so no division can be crossed twice within one step
+DEFAULT_STEP_DAYS = 0.25
+SAMPLE_CHUNK_SIZE = 50000
+REFINE_ITERATIONS = 18  # 0.25 day / 2**18 is well under a second
+STATION_HALF_WIDTH_DAYS = 0.01
+
+def _wrap(degrees):
+    return (degrees + 180.0) % 360.0 - 180.0
+
+
+class TransitIndexBuilder:
+    """
+    Finds every sign ingress, nakshatra change and retrograde station over a
+    date range and writes them as sorted .npy arrays.
+
+    Longitudes are sampled on a fixed grid with array-valued Skyfield times;
+    each bracketed event is then refined by vectorized bisection, so every
+    refinement step is a single ephemeris evaluation for all events of a body.
+    Longitudes are on the ecliptic of date in the configured zodiac, like
+    AstroService charts. Times are stored as UT1 Julian dates (within a
+    second of UTC).
+    """
+
+    def __init__(
+        self, registry: EphemerisRegistry = None, step_days: float = DEFAULT_STEP_DAYS, zodiac: str = None
+    ):
+        self.registry = registry or ephemeris_registry
+        self.step_days = step_days
+        self.zodiac = normalize_zodiac(zodiac) if zodiac else get_default_zodiac()
+
+    def coverage(self) -> Tuple[float, float]:
+        """
+        Julian date range covered by every segment of the ephemeris.
+        """
+        return self.registry.coverage()
+
+    def _rotations(self, jd_ut1: np.ndarray) -> np.ndarray:
+        """
+        Ecliptic-of-date rotation matrices for a time grid, shared by all bodies.
+        """
+        ts = self.registry.timescale()
+        return np.concatenate([
+            ecliptic_frame.rotation_at(ts.ut1_jd(jd_ut1[start:start + SAMPLE_CHUNK_SIZE]))
+            for start in range(0, len(jd_ut1), SAMPLE_CHUNK_SIZE)
+        ], axis=-1)
+
+    def _longitudes(self, body, jd_ut1: np.ndarray, rotations: Optional[np.ndarray] = None) -> np.ndarray:
+        ts = self.registry.timescale()
+        earth = self.registry.ephemeris()["earth"]
+        out = np.empty(len(jd_ut1))
+        for start in range(0, len(jd_ut1), SAMPLE_CHUNK_SIZE):
+            chunk = slice(start, start + SAMPLE_CHUNK_SIZE)
+            app = earth.at(ts.ut1_jd(jd_ut1[chunk])).observe(body).apparent()
+            rotation = rotations[..., chunk] if rotations is not None else None
+            out[chunk] = get_ecliptic_longitude_degrees(app, rotation)
+        # UT1 and TT differ by about a minute, far below the ayanamsa's daily drift
+        return to_sidereal(out, jd_ut1, self.zodiac)
+
+    def _bisect(self, evaluate, lo: np.ndarray, hi: np.ndarray, f_lo: np.ndarray) -> np.ndarray:
+        """
+        Vectorized bisection of evaluate(t) == 0 over the brackets [lo, hi].
+        """
+        if lo.size == 0:
+            return lo
+        for _ in range(REFINE_ITERATIONS):
+            mid = (lo + hi) / 2.0
+            f_mid = evaluate(mid)
+            same_side = np.sign(f_mid) == np.sign(f_lo)
+            lo = np.where(same_side, mid, lo)
+            f_lo = np.where(same_side, f_mid, f_lo)
+            hi = np.where(same_side, hi, mid)
+        return (lo + hi) / 2.0
+
+    def _division_events(self, body, jd, lon, width) -> Tuple[np.ndarray, np.ndarray]:
+        divisions = int(round(360.0 / width))
+        index = np.floor(lon / width).astype(np.int64) % divisions
+        crossed = np.nonzero(index[1:] != index[:-1])[0]
+        before, after = index[crossed], index[crossed + 1]
+        forward = (after - before) % divisions == 1
+        boundary = np.where(forward, after, before) * width
+
+        def evaluate(t):
+            return _wrap(self._longitudes(body, t) - boundary)
+
+        lo, hi = jd[crossed], jd[crossed + 1]
+        times = self._bisect(evaluate, lo, hi, _wrap(lon[crossed] - boundary))
+        # Row 0 records the state at the start of the range
+        return (
+            np.concatenate([[jd[0]], times]),
+            np.concatenate([[index[0]], after]).astype(np.int16),
+        )
+
+    def _station_events(self, body, jd, lon) -> Tuple[np.ndarray, np.ndarray]:
+        motion = _wrap(np.diff(lon))
+        retrograde = motion < 0
+        changed = np.nonzero(retrograde[1:] != retrograde[:-1])[0]
+        mids = jd[:-1] + self.step_days / 2.0
+
+        def evaluate(t):
+            h = STATION_HALF_WIDTH_DAYS
+            both = self._longitudes(body, np.concatenate([t + h, t - h]))
+            return _wrap(both[:len(t)] - both[len(t):])
+
+        lo, hi = mids[changed], mids[changed + 1]
+        times = self._bisect(evaluate, lo, hi, motion[changed])
+        return (
+            np.concatenate([[jd[0]], times]),
+            np.concatenate([[retrograde[0]], retrograde[changed + 1]]).astype(np.int8),
+        )
+
+    def build(self, path: str, start_year: int = 1900, end_year: int = 2100) -> Dict[str, object]:
+        """
+        Build the index for [start_year, end_year] (clamped to the ephemeris
+        coverage) into directory `path`. Returns the manifest.
+        """
+        first_jd, last_jd = self.coverage()
+        requested_start = datetime_to_jd(datetime(start_year, 1, 1))
+        requested_end = datetime_to_jd(datetime(end_year + 1, 1, 1))
+        start_jd = max(requested_start, first_jd + 1.0)
+        end_jd = min(requested_end, last_jd - 1.0)
+        if start_jd > requested_start or end_jd < requested_end:
+            logger.warning(
+                f"Transit index: {start_year}-{end_year} exceeds the ephemeris coverage; indexing "
+                f"{jd_to_datetime(start_jd):%Y-%m-%d} to {jd_to_datetime(end_jd):%Y-%m-%d} only."
+            )
+        jd = np.arange(start_jd, end_jd, self.step_days)
+
+        os.makedirs(path, exist_ok=True)
+        planet_refs = self.registry.planet_refs()
+        rotations = self._rotations(jd)
+        counts = {}
+        for name in PLANET_NAMES:
+            lon = self._longitudes(planet_refs[name], jd, rotations)
+            events = {
+                kind: self._division_events(planet_refs[name], jd, lon, width)
+                for kind, width in DIVISION_WIDTHS.items()
+            }
+            if name not in NON_STATIONING_BODIES:
+                events[EVENT_STATION] = self._station_events(planet_refs[name], jd, lon)
+
+            for kind, (times, values) in events.items():
+                np.save(os.path.join(path, f"{name.lower()}.{kind}.times.npy"), times)
+                np.save(os.path.join(path, f"{name.lower()}.{kind}.values.npy"), values)
+                counts[f"{name}.{kind}"] = len(times) - 1
+            logger.info(f"Transit index: {name} done.")
+
+        manifest = {
+            "version": TRANSIT_INDEX_VERSION,
+            "ephemeris": self.registry.default_ephemeris,
+            "zodiac": self.zodiac,
+            "start_jd": float(jd[0]),
+            "end_jd": float(jd[-1]),
+            "step_days": self.step_days,
+            "events": counts,
+        }
+        with open(os.path.join(path, MANIFEST_NAME), "w") as fh:
+            json.dump(manifest, fh, indent=2)
+        return manifest
+
+
+class TransitIndex:
+    """
+    Read-only view over a built index. Arrays are memory-mapped on first use
+    and every lookup is a bisection (np.searchsorted) over sorted event times.
+    """
+
+    def __init__(self, path: str, zodiac: str = None):
+        self.path = path
+        with open(os.path.join(path, MANIFEST_NAME)) as fh:
+            self.manifest = json.load(fh)
+        # A stale index would silently serve longitudes of another format or zodiac
+        zodiac = normalize_zodiac(zodiac) if zodiac else get_default_zodiac()
+        if self.manifest.get("version") != TRANSIT_INDEX_VERSION:
+            raise ValueError(
+                f"Transit index at {path} has version {self.manifest.get('version')}, expected "
+                f"{TRANSIT_INDEX_VERSION}; rebuild it with build_transit_index."
+            )
+        if self.manifest.get("zodiac") != zodiac:
+            raise ValueError(
+                f"Transit index at {path} was built for the {self.manifest.get('zodiac')} zodiac, not "
+                f"{zodiac}; rebuild it with build_transit_index."
+            )
+        self._arrays: Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def _events(self, body: str, kind: str) -> Tuple[np.ndarray, np.ndarray]:
+        key = (body, kind)
+        arrays = self._arrays.get(key)
+        if arrays is None:
+            with self._lock:
+                arrays = self._arrays.get(key)
+                if arrays is None:
+                    prefix = os.path.join(self.path, f"{body.lower()}.{kind}")
+                    if not os.path.exists(f"{prefix}.times.npy"):
+                        raise ValueError(f"No {kind} events indexed for {body}.")
+                    arrays = (
+                        np.load(f"{prefix}.times.npy", mmap_mode="r"),
+                        np.load(f"{prefix}.values.npy", mmap_mode="r"),
+                    )
+                    self._arrays[key] = arrays
+        return arrays
+
+    def _position(self, times: np.ndarray, when: datetime) -> Tuple[float, int]:
+        jd = datetime_to_jd(when)
+        if not self.manifest["start_jd"] <= jd <= self.manifest["end_jd"]:
+            raise ValueError(f"{when.isoformat()} is outside the transit index range.")
+        return jd, int(np.searchsorted(times, jd, side="right")) - 1
+
+    def state_at(self, body: str, kind: str, when: datetime) -> int:
+        """
+        Value of the most recent event of `kind` at `when`
+        (sign index, nakshatra index, or 1/0 for retrograde/direct).
+        """
+        times, values = self._events(body, kind)
+        jd, position = self._position(times, when)
+        return int(values[position])
+
+    def next_event(self, body: str, kind: str, when: datetime) -> Optional[Tuple[datetime, int]]:
+        """
+        (time, new value) of the first event of `kind` strictly after `when`,
+        or None if it falls past the end of the index.
+        """
+        times, values = self._events(body, kind)
+        jd, position = self._position(times, when)
+        if position + 1 >= len(times):
+            return None
+        return jd_to_datetime(times[position + 1]), int(values[position + 1])
+
+    def previous_event(self, body: str, kind: str, when: datetime) -> Optional[Tuple[datetime, int]]:
+        """
+        (time, value) of the last event of `kind` at or before `when`, or
+        None if nothing happened since the start of the index.
+        """
+        times, values = self._events(body, kind)
+        jd, position = self._position(times, when)
+        if position < 1:
+            return None
+        return jd_to_datetime(times[position]), int(values[position])
+
+    def sign_at(self, body: str, when: datetime) -> int:
+        return self.state_at(body, EVENT_SIGN, when)
+
+    def nakshatra_at(self, body: str, when: datetime) -> int:
+        return self.state_at(body, EVENT_NAKSHATRA, when)
+
+    def is_retrograde(self, body: str, when: datetime) -> bool:
+        if body in NON_STATIONING_BODIES:
+            return False
+        return bool(self.state_at(body, EVENT_STATION, when))
+
+    def next_ingress(self, body: str, when: datetime) -> Optional[Tuple[datetime, int]]:
+        return self.next_event(body, EVENT_SIGN, when)
+
+    def next_station(self, body: str, when: datetime) -> Optional[Tuple[datetime, int]]:
+        return self.next_event(body, EVENT_STATION, when)
@@ -0,0 +1,125 @@
+import json
+import struct
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Tuple
+
+import numpy as np
+from skyfield.framelib import ecliptic_frame
+
+from .astro_service import PLANET_NAMES, get_default_zodiac, get_ecliptic_longitude_degrees
+from .ayanamsa import normalize_zodiac, to_sidereal
+from .ephemeris import EphemerisRegistry, ephemeris_registry
+
+DEFAULT_SERIES_CHUNK_SIZE = 2048
+
+# Binary stream layout (little-endian): one header, then frames until the end.
+#   header: magic "VTS1", uint8 body count, uint8 reserved, uint16 reserved,
+#           int64 start (unix seconds), uint32 step (seconds), uint32 total points
+#   frame:  uint32 point count, then float32 longitudes (count x bodies), row-major
+SERIES_MAGIC = b"VTS1"
+SERIES_HEADER = struct.Struct("<4sBBHqII")
+SERIES_FRAME = struct.Struct("<I")
+
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+BINARY_CONTENT_TYPE = "application/octet-stream"
+
+
+class TransitSeries:
+    """
+    Geocentric longitudes of every body on a regular time grid, produced in
+    chunks: each chunk is one array-valued Skyfield Time, and only one chunk
+    is held in memory at a time, however long the range.
+    """
+
+    def __init__(
+        self,
+        start: datetime,
+        end: datetime,
+        step: timedelta,
+        registry: EphemerisRegistry = None,
+        zodiac: str = None,
+        chunk_size: int = DEFAULT_SERIES_CHUNK_SIZE,
+    ):
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        if end.tzinfo is None:
+            end = end.replace(tzinfo=timezone.utc)
+        self.start = start.astimezone(timezone.utc).replace(microsecond=0)
+        self.step_seconds = int(step.total_seconds())
+        if self.step_seconds <= 0:
+            raise ValueError("The step must be at least one second.")
+        self.count = max(int((end - self.start).total_seconds() // self.step_seconds) + 1, 0)
+        self.registry = registry or ephemeris_registry
+        self.zodiac = normalize_zodiac(zodiac) if zodiac else get_default_zodiac()
+        self.chunk_size = chunk_size
+
+    def chunks(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Yield (offsets, longitudes) per chunk: (k,) seconds since start and
+        (k, bodies) longitudes in PLANET_NAMES order.
+        """
+        ts = self.registry.timescale()
+        earth = self.registry.ephemeris()["earth"]
+        planet_refs = self.registry.planet_refs()
+        s = self.start
+        for first in range(0, self.count, self.chunk_size):
+            indexes = np.arange(first, min(first + self.chunk_size, self.count), dtype=np.int64)
+            offsets = indexes * self.step_seconds
+            t = ts.utc(s.year, s.month, s.day, s.hour, s.minute, s.second + offsets)
+            earth_at_t = earth.at(t)
+            rotation = ecliptic_frame.rotation_at(t)
+            tropical = np.empty((len(offsets), len(PLANET_NAMES)))
+            for column, name in enumerate(PLANET_NAMES):
+                app = earth_at_t.observe(planet_refs[name]).apparent()
+                tropical[:, column] = get_ecliptic_longitude_degrees(app, rotation)
+            yield offsets, to_sidereal(tropical, t.tt, self.zodiac)
+
+    def ndjson(self) -> Iterator[bytes]:
+        """
+        A metadata line, then one line per time point:
+        {"time": "2024-01-01T00:00:00Z", "longitudes": [...]}.
+        Lines are formatted straight from the arrays, one chunk at a time.
+        """
+        yield (json.dumps({
+            "bodies": PLANET_NAMES,
+            "zodiac": self.zodiac,
+            "start": self.start.isoformat(),
+            "step_seconds": self.step_seconds,
+            "count": self.count,
+        }) + "\n").encode()
+        start = np.datetime64(self.start.replace(tzinfo=None), "s")
+        for offsets, longitudes in self.chunks():
+            times = np.datetime_as_string(start + offsets, unit="s")
+            values = np.char.mod("%.4f", longitudes)
+            yield "".join(
+                f'{{"time": "{when}Z", "longitudes": [{", ".join(row)}]}}\n'
+                for when, row in zip(times, values)
+            ).encode()
+
+    def binary(self) -> Iterator[bytes]:
+        """
+        The SERIES_HEADER, then one frame of float32 longitudes per chunk.
+        """
+        yield SERIES_HEADER.pack(
+            SERIES_MAGIC, len(PLANET_NAMES), 0, 0, int(self.start.timestamp()), self.step_seconds, self.count
+        )
+        for _, longitudes in self.chunks():
+            yield SERIES_FRAME.pack(len(longitudes)) + longitudes.astype("<f4").tobytes()
+
+
+def read_binary_series(payload: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decode a binary stream back into (unix seconds (N,), longitudes (N, bodies)).
+    """
+    magic, bodies, _, _, start, step, count = SERIES_HEADER.unpack_from(payload)
+    if magic != SERIES_MAGIC:
+        raise ValueError("Not a transit series stream.")
+    frames, offset = [], SERIES_HEADER.size
+    while offset < len(payload):
+        (rows,) = SERIES_FRAME.unpack_from(payload, offset)
+        offset += SERIES_FRAME.size
+        frame = np.frombuffer(payload, dtype="<f4", count=rows * bodies, offset=offset)
+        frames.append(frame.reshape(rows, bodies))
+        offset += rows * bodies * 4
+    longitudes = np.concatenate(frames) if frames else np.empty((0, bodies), dtype="<f4")
+    return start + step * np.arange(count, dtype=np.int64), longitudes
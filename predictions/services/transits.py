@@ -0,0 +1,128 @@
+import logging
+import threading
+from datetime import date, datetime, time, timezone
+from typing import Any, Dict, Optional
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone as django_tz
+
+from skyfield.framelib import ecliptic_frame
+
+from .astro_service import PLANET_NAMES, get_default_zodiac, get_ecliptic_longitude_degrees
+from .ayanamsa import normalize_zodiac, to_sidereal
+from .ephemeris import EphemerisRegistry, ephemeris_registry
+from .zodiac import get_nakshatra, get_zodiac_sign
+
+logger = logging.getLogger(__name__)
+
+TRANSIT_SNAPSHOT_VERSION = 3
+DEFAULT_TRANSIT_CACHE_TIMEOUT = 60 * 60 * 36  # 36 hours
+
+# Snapshot moment within the day, and the half-window used to detect retrograde motion
+SNAPSHOT_TIME = time(12, 0)
+RETROGRADE_HALF_WINDOW_DAYS = 0.5
+
+_process_snapshots: Dict[str, Dict[str, Any]] = {}
+_process_lock = threading.Lock()
+
+
+class TransitService:
+    """
+    Computes the geocentric "sky of the day" shared by every reading generated
+    that day: positions, signs, retrograde flags and the Moon's nakshatra.
+    """
+
+    def __init__(self, registry: EphemerisRegistry = None, zodiac: str = None):
+        self.registry = registry or ephemeris_registry
+        self.zodiac = normalize_zodiac(zodiac) if zodiac else get_default_zodiac()
+
+    def compute_snapshot(self, day: date) -> Dict[str, Any]:
+        """
+        Evaluate every body at noon UTC of `day`. A single array-valued Time
+        (noon ± half a day) gives both the positions and the direction of motion.
+        """
+        ts = self.registry.timescale()
+        eph = self.registry.ephemeris()
+        planet_refs = self.registry.planet_refs()
+
+        moment = datetime.combine(day, SNAPSHOT_TIME, tzinfo=timezone.utc)
+        t_mid = ts.from_datetime(moment)
+        t = ts.tt_jd(t_mid.tt + np.array([-RETROGRADE_HALF_WINDOW_DAYS, 0.0, RETROGRADE_HALF_WINDOW_DAYS]))
+        earth_at_t = eph["earth"].at(t)
+        rotation = ecliptic_frame.rotation_at(t)
+
+        # (3, 10): rows are noon - 12h, noon, noon + 12h
+        tropical = np.stack([
+            get_ecliptic_longitude_degrees(earth_at_t.observe(planet_refs[name]).apparent(), rotation)
+            for name in PLANET_NAMES
+        ], axis=1)
+        longitudes = to_sidereal(tropical, t.tt, self.zodiac)
+
+        planets = {}
+        moon_longitude = None
+        for column, name in enumerate(PLANET_NAMES):
+            before, current, after = longitudes[:, column]
+            motion = (after - before + 180.0) % 360.0 - 180.0
+            if name == "Moon":
+                moon_longitude = float(current)
+            planets[name] = {
+                "longitude_deg": round(float(current), 2),
+                "sign": get_zodiac_sign(current),
+                "retrograde": bool(motion < 0),
+            }
+
+        nakshatra, pada = get_nakshatra(moon_longitude)
+        return {
+            "date": day.isoformat(),
+            "computed_for": moment.isoformat(),
+            "zodiac": self.zodiac,
+            "planets": planets,
+            "moon_nakshatra": {"name": nakshatra, "pada": pada},
+        }
+
+
+def _cache_key(day: date, zodiac: str) -> str:
+    return f"transit-snapshot:v{TRANSIT_SNAPSHOT_VERSION}:{zodiac}:{day.isoformat()}"
+
+
+def get_daily_transit_snapshot(day: Optional[date] = None, service: TransitService = None) -> Dict[str, Any]:
+    """
+    Transit snapshot for `day` (default: today, UTC) in the service's zodiac.
+    Looked up in this process first, then the Django cache, and computed at
+    most once per day and zodiac per process otherwise.
+    """
+    day = day or django_tz.now().date()
+    service = service or TransitService()
+    key = _cache_key(day, service.zodiac)
+
+    snapshot = _process_snapshots.get(key)
+    if snapshot is not None:
+        return snapshot
+
+    with _process_lock:
+        snapshot = _process_snapshots.get(key)
+        if snapshot is not None:
+            return snapshot
+
+        snapshot = cache.get(key)
+        if snapshot is None:
+            snapshot = service.compute_snapshot(day)
+            timeout = getattr(settings, "TRANSIT_SNAPSHOT_CACHE_TIMEOUT", DEFAULT_TRANSIT_CACHE_TIMEOUT)
+            cache.set(key, snapshot, timeout)
+            logger.info(f"Computed transit snapshot for {day.isoformat()}.")
+
+        # Only keep a couple of days around; older snapshots are never asked for again
+        _process_snapshots[key] = snapshot
+        days = {old_key: old_key.rsplit(":", 1)[1] for old_key in _process_snapshots}
+        recent_days = sorted(set(days.values()))[-2:]
+        for old_key, old_day in days.items():
+            if old_day not in recent_days:
+                del _process_snapshots[old_key]
+    return snapshot
+
+
+def clear_process_snapshots() -> None:
+    with _process_lock:
+        _process_snapshots.clear()
@@ -0,0 +1,91 @@
+from typing import Any, Dict, Iterable, Sequence
+
+import numpy as np
+
+from .astro_service import PLANET_NAMES
+from .zodiac import ZODIAC_SIGNS
+
+VARGAS = ("D1", "D2", "D3", "D7", "D9", "D10", "D12", "D30", "D60")
+
+# Trimsamsa (D30): (upper degree bound, sign index) per segment, for odd and even signs
+TRIMSAMSA_ODD = ((5.0, 0), (10.0, 10), (18.0, 8), (25.0, 2), (30.0, 6))
+TRIMSAMSA_EVEN = ((5.0, 1), (12.0, 5), (20.0, 11), (25.0, 9), (30.0, 7))
+
+
+def _trimsamsa(degree: np.ndarray, odd: np.ndarray) -> np.ndarray:
+    odd_bounds, odd_signs = np.array(TRIMSAMSA_ODD).T
+    even_bounds, even_signs = np.array(TRIMSAMSA_EVEN).T
+    odd_part = np.minimum(np.searchsorted(odd_bounds, degree, side="right"), 4)
+    even_part = np.minimum(np.searchsorted(even_bounds, degree, side="right"), 4)
+    return np.where(odd, odd_signs[odd_part], even_signs[even_part])
+
+
+def divisional_signs(longitudes, vargas: Sequence[str] = VARGAS) -> np.ndarray:
+    """
+    Sign indexes (into ZODIAC_SIGNS) of every requested divisional chart.
+
+    `longitudes` is any array of sidereal longitudes: one chart's (10,) row or
+    a batch's (N, 10) "longitudes". Returns an int8 array of shape
+    (len(vargas),) + longitudes.shape, computed with whole-array operations
+    (sign and degree-in-sign are derived once and shared by all vargas).
+    Follows the Parashari rules; "odd" signs are Aries, Gemini, Leo, ...
+    """
+    longitudes = np.asarray(longitudes, dtype=float) % 360.0
+    sign = (longitudes // 30.0).astype(np.int64)
+    degree = longitudes - sign * 30.0
+    odd = sign % 2 == 0
+
+    def counted_from(start, parts):
+        return (start + (degree * parts / 30.0).astype(np.int64)) % 12
+
+    rules = {
+        "D1": lambda: sign,
+        # Hora: Leo / Cancer halves, reversed for even signs
+        "D2": lambda: np.where((degree < 15.0) == odd, 4, 3),
+        "D3": lambda: (sign + 4 * (degree // 10.0).astype(np.int64)) % 12,
+        "D7": lambda: counted_from(np.where(odd, sign, sign + 6), 7),
+        # Navamsa runs continuously through the zodiac from Aries
+        "D9": lambda: (longitudes * 9.0 / 30.0).astype(np.int64) % 12,
+        "D10": lambda: counted_from(np.where(odd, sign, sign + 8), 10),
+        "D12": lambda: counted_from(sign, 12),
+        "D30": lambda: _trimsamsa(degree, odd),
+        "D60": lambda: counted_from(sign, 60),
+    }
+
+    out = np.empty((len(vargas),) + longitudes.shape, dtype=np.int8)
+    for row, varga in enumerate(vargas):
+        if varga not in rules:
+            raise ValueError(f"Unknown divisional chart '{varga}'. Choose from {', '.join(VARGAS)}.")
+        out[row] = rules[varga]()
+    return out
+
+
+def divisional_charts(longitudes, vargas: Sequence[str] = VARGAS) -> Dict[str, np.ndarray]:
+    """
+    Same as divisional_signs, keyed by varga name.
+    """
+    return dict(zip(vargas, divisional_signs(longitudes, vargas)))
+
+
+def chart_longitudes(birth_chart: Dict[str, Any]) -> np.ndarray:
+    """
+    (11,) longitudes of a birth chart dict: PLANET_NAMES order, then the ascendant.
+    """
+    longitudes = [birth_chart["planets"][name]["longitude_deg"] for name in PLANET_NAMES]
+    return np.array(longitudes + [birth_chart["ascendant"]["degree"]])
+
+
+def divisional_chart_signs(
+    birth_chart: Dict[str, Any], vargas: Iterable[str] = VARGAS
+) -> Dict[str, Dict[str, str]]:
+    """
+    Prompt-friendly vargas of a birth chart dict:
+    {"D9": {"Sun": "Leo", ..., "Ascendant": "Virgo"}, ...}.
+    """
+    vargas = tuple(vargas)
+    names = PLANET_NAMES + ("Ascendant",)
+    signs = divisional_signs(chart_longitudes(birth_chart), vargas)
+    return {
+        varga: {name: ZODIAC_SIGNS[index] for name, index in zip(names, row)}
+        for varga, row in zip(vargas, signs)
+    }
@@ -0,0 +1,135 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+
+from .ephemeris import EphemerisRegistry, ephemeris_registry
+
+logger = logging.getLogger(__name__)
+
+WARM_UP_PENDING = "pending"
+WARM_UP_RUNNING = "running"
+WARM_UP_READY = "ready"
+WARM_UP_FAILED = "failed"
+
+# Reference chart computed at boot (J2000, New Delhi): touches every ephemeris
+# segment, the timescale tables and the house/ayanamsa code paths
+REFERENCE_BIRTH = (datetime(2000, 1, 1, 12, 0), 28.6139, 77.2090)
+
+# A failed warm-up (e.g. a transient ephemeris download error) is retried from
+# the readiness probe after this delay, doubling with each consecutive failure
+WARM_UP_RETRY_SECONDS = 5.0
+WARM_UP_MAX_RETRY_SECONDS = 300.0
+
+
+class AstronomyWarmUp:
+    """
+    Loads the astronomy stack and computes a reference chart once per process,
+    so the first real chart request doesn't pay for it.
+
+    Run before the server forks (gunicorn --preload), everything loaded here
+    (ephemeris memory maps, segment headers, timescale arrays) is inherited
+    by every worker.
+    """
+
+    def __init__(self, registry: EphemerisRegistry = None):
+        self.registry = registry or ephemeris_registry
+        self._lock = threading.Lock()
+        self._status: Dict[str, Any] = {}
+        self.reset()
+
+    @property
+    def is_ready(self) -> bool:
+        return self._status["state"] == WARM_UP_READY
+
+    def status(self) -> Dict[str, Any]:
+        return dict(self._status)
+
+    def reset(self) -> None:
+        self._status = {"state": WARM_UP_PENDING, "source": None, "pid": None, "timings": {}, "error": None}
+        self._failures = 0
+        self._failed_at = 0.0
+
+    def retry_due(self) -> bool:
+        """
+        Whether the last warm-up failed long enough ago to try again.
+        """
+        if self._status["state"] != WARM_UP_FAILED:
+            return False
+        delay = min(WARM_UP_RETRY_SECONDS * 2 ** (self._failures - 1), WARM_UP_MAX_RETRY_SECONDS)
+        return time.monotonic() - self._failed_at >= delay
+
+    def run(self, source: str = "manual") -> Dict[str, Any]:
+        """
+        Warm up (once; later calls return the recorded status) and report
+        per-step timings in seconds.
+        """
+        with self._lock:
+            if self._status["state"] == WARM_UP_READY:
+                return self.status()
+            self._status = {
+                "state": WARM_UP_RUNNING, "source": source, "pid": os.getpid(), "timings": {}, "error": None,
+            }
+            timings = self._status["timings"]
+            started = time.perf_counter()
+            try:
+                step = time.perf_counter()
+                from .astro_service import AstroService
+                timings["imports"] = time.perf_counter() - step
+
+                timings["ephemeris"] = self.registry.warm_up()
+
+                step = time.perf_counter()
+                astro_service = AstroService(registry=self.registry)
+                astro_service.calculate_chart_at(*REFERENCE_BIRTH)
+                birth_dt, lat, lon = REFERENCE_BIRTH
+                astro_service.calculate_birth_charts([birth_dt], [lat], [lon])
+                timings["reference_chart"] = time.perf_counter() - step
+            except Exception as exc:
+                logger.exception(f"Astronomy warm-up failed ({source}).")
+                self._status.update(state=WARM_UP_FAILED, error=str(exc))
+                self._failures += 1
+                self._failed_at = time.monotonic()
+                return self.status()
+
+            timings["total"] = time.perf_counter() - started
+            self._status["state"] = WARM_UP_READY
+            self._failures = 0
+            total, pid = timings["total"], os.getpid()
+            logger.info(f"Astronomy warm-up ({source}, pid {pid}) finished in {total:.3f}s: {timings}")
+            return self.status()
+
+
+astronomy_warm_up = AstronomyWarmUp()
+
+
+def warm_up_on_boot_enabled() -> bool:
+    return bool(getattr(settings, "ASTRO_WARM_UP_ON_BOOT", True))
+
+
+def warm_up_on_boot(source: str) -> Optional[Dict[str, Any]]:
+    """
+    Boot hook for core.wsgi and the Celery worker_process_init signal.
+    Disabled with ASTRO_WARM_UP_ON_BOOT = False (e.g. for one-off commands).
+    """
+    if not warm_up_on_boot_enabled():
+        return None
+    return astronomy_warm_up.run(source)
+
+
+def readiness_status() -> Dict[str, Any]:
+    """
+    Warm-up status for the readiness probe. With the boot warm-up disabled
+    nothing else would start it, so the first probe runs it instead of
+    reporting "pending" forever; a failed warm-up is retried with backoff
+    (see retry_due) so a transient error doesn't keep the process unready.
+    """
+    if astronomy_warm_up.retry_due():
+        return astronomy_warm_up.run("readiness probe retry")
+    if not warm_up_on_boot_enabled() and astronomy_warm_up.status()["state"] == WARM_UP_PENDING:
+        return astronomy_warm_up.run("readiness probe")
+    return astronomy_warm_up.status()
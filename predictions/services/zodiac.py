@@ -0,0 +1,32 @@
+from typing import Tuple
+
+# Helper constants/zodiac, approach adapted from the existing django logic
+
+ZODIAC_SIGNS = [
+    "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+    "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces",
+]
+
+NAKSHATRAS = [
+    "Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashira", "Ardra",
+    "Punarvasu", "Pushya", "Ashlesha", "Magha", "Purva Phalguni", "Uttara Phalguni",
+    "Hasta", "Chitra", "Swati", "Vishakha", "Anuradha", "Jyeshtha",
+    "Mula", "Purva Ashadha", "Uttara Ashadha", "Shravana", "Dhanishta", "Shatabhisha",
+    "Purva Bhadrapada", "Uttara Bhadrapada", "Revati",
+]
+NAKSHATRA_SPAN = 360.0 / 27  # 13°20'
+
+
+def get_zodiac_sign(ecliptic_longitude_degrees: float) -> str:
+    index = int(ecliptic_longitude_degrees // 30) % 12
+    return ZODIAC_SIGNS[index]
+
+
+def get_nakshatra(ecliptic_longitude_degrees: float) -> Tuple[str, int]:
+    """
+    Nakshatra name and pada (1-4) for a longitude.
+    """
+    position = (ecliptic_longitude_degrees % 360.0) / NAKSHATRA_SPAN
+    index = int(position) % 27
+    pada = int((position - int(position)) * 4) + 1
+    return NAKSHATRAS[index], pada
@@ -1,15 +1,22 @@
 from celery import shared_task
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from .models import Prediction
 from .services.reading_service import ReadingService
+from .services.transits import get_daily_transit_snapshot
 
 User = get_user_model()
 
+# Users per vectorized birth-chart batch in the daily fan-out
+DAILY_CHART_BATCH_SIZE = 2000
+
 
 @shared_task(name="generate_all_readings_for_user")
-def generate_all_readings_for_user(user_id):
+def generate_all_readings_for_user(user_id, combined=None):
     """
     A Celery task that generates multiple reading types for a given user.
+    The sections are requested from the LLM concurrently, or, in combined
+    mode (default: READING_COMBINED_SECTIONS), in one streamed request.
     """
     try:
         user = User.objects.get(pk=user_id)
@@ -25,27 +32,68 @@ def generate_all_readings_for_user(user_id):
         "challenges_and_remedies",
         "major_life_periods",
     ]
-    results = {}
-
-    for rtype in reading_types:
-        content = reading_service.generate_reading(user, reading_type=rtype)
-        results[rtype] = content
-
-    return results
+    if combined is None:
+        combined = getattr(settings, "READING_COMBINED_SECTIONS", False)
+    if combined:
+        return reading_service.generate_combined_reading(user, reading_types)
+    return reading_service.generate_readings(user, reading_types)
 
 
 @shared_task(name="generate_daily_reading_for_all_users")
-def generate_daily_reading_for_all_users():
+def generate_daily_reading_for_all_users(by_class=None):
     """
     Optionally, you could run a daily job generating a "today" reading
     for all active users.
+
+    With by_class (default: DAILY_READING_BY_CLASS), users are grouped by
+    chart class (DAILY_READING_CLASS_FACTORS) and the LLM is called once per
+    class and language; per-user details are added locally.
     """
+    if by_class is None:
+        by_class = getattr(settings, "DAILY_READING_BY_CLASS", False)
     reading_service = ReadingService()
-    users = User.objects.all()
+    # Today's sky is shared by every reading below
+    get_daily_transit_snapshot()
+    users = User.objects.select_related("profile")
     count = 0
+    # Shared by every batch, so each chart class is generated once per run
+    class_readings = {} if by_class else None
 
-    for user in users:
-        reading_service.generate_reading(user, reading_type="today_reading")
-        count += 1
+    batch = []
+    for user in users.iterator(chunk_size=DAILY_CHART_BATCH_SIZE):
+        batch.append(user)
+        if len(batch) >= DAILY_CHART_BATCH_SIZE:
+            count += _generate_daily_readings(reading_service, batch, class_readings)
+            batch = []
+    if batch:
+        count += _generate_daily_readings(reading_service, batch, class_readings)
 
     return f"Generated daily reading for {count} users."
+
+
+def _generate_daily_readings(reading_service, users, class_readings=None):
+    """
+    Compute the birth charts for a chunk of users in one batch, then
+    generate each user's "today" reading from the precomputed chart
+    (or from their chart class, when class_readings is given).
+    """
+    charts = reading_service.calculate_birth_charts_for_users(users)
+    if class_readings is not None:
+        return reading_service.generate_daily_readings_by_class(users, charts, class_readings)
+    for user in users:
+        reading_service.generate_reading(
+            user,
+            reading_type="today_reading",
+            birth_chart=charts.get(user.id),
+        )
+    return len(users)
+
+
+@shared_task(name="warm_daily_transit_snapshot")
+def warm_daily_transit_snapshot():
+    """
+    Scheduled by Celery beat shortly after midnight UTC so today's transit
+    snapshot is already cached before the first reading of the day.
+    """
+    snapshot = get_daily_transit_snapshot()
+    return f"Transit snapshot ready for {snapshot['date']}."
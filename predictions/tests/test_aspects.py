@@ -0,0 +1,58 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from predictions.services.aspects import ASPECT_NAMES, NO_ASPECT, aspect_matrix, chart_aspects, graha_drishti
+from predictions.services.ephemeris import PLANET_TARGETS
+
+
+class AspectMatrixTests(SimpleTestCase):
+
+    def setUp(self):
+        # Sun, Moon, Mercury, Venus, Mars, Jupiter, Saturn, Uranus, Neptune, Pluto
+        self.longitudes = np.array([10.0, 128.0, 15.0, 191.5, 100.0, 225.0, 70.0, 300.0, 330.0, 355.0])
+
+    def test_single_chart_aspects(self):
+        matrix = aspect_matrix(self.longitudes)
+        names = dict(zip(PLANET_TARGETS, range(10)))
+
+        def aspect(a, b):
+            code = matrix["aspect"][names[a], names[b]]
+            return None if code == NO_ASPECT else ASPECT_NAMES[code]
+
+        self.assertEqual(aspect("Sun", "Mercury"), "conjunction")
+        self.assertEqual(aspect("Sun", "Moon"), "trine")  # 118 degrees, 2 degree orb
+        self.assertEqual(aspect("Sun", "Venus"), "opposition")
+        self.assertEqual(aspect("Sun", "Mars"), "square")
+        self.assertEqual(aspect("Sun", "Saturn"), "sextile")
+        self.assertIsNone(aspect("Sun", "Jupiter"))
+        self.assertIsNone(aspect("Sun", "Sun"))
+        self.assertAlmostEqual(matrix["orb"][names["Sun"], names["Moon"]], 2.0)
+        np.testing.assert_array_equal(matrix["aspect"], matrix["aspect"].T)
+
+    def test_batch_matches_single_charts(self):
+        rng = np.random.default_rng(3)
+        batch = rng.uniform(0, 360, (50, 10))
+        matrix = aspect_matrix(batch)
+        drishti = graha_drishti(batch)
+        self.assertEqual(matrix["aspect"].shape, (50, 10, 10))
+        for row in (0, 17, 49):
+            np.testing.assert_array_equal(matrix["aspect"][row], aspect_matrix(batch[row])["aspect"])
+            np.testing.assert_array_equal(drishti[row], graha_drishti(batch[row]))
+
+    def test_graha_drishti(self):
+        drishti = graha_drishti(self.longitudes)
+        names = dict(zip(PLANET_TARGETS, range(10)))
+        # Mars in Cancer: 4th = Libra (Venus), 7th = Capricorn, 8th = Aquarius (Uranus)
+        self.assertTrue(drishti[names["Mars"], names["Venus"]])
+        self.assertTrue(drishti[names["Mars"], names["Uranus"]])
+        # Sun in Aries only aspects the 7th, Libra
+        self.assertEqual([j for j in range(10) if drishti[names["Sun"], j]], [names["Venus"]])
+        self.assertFalse(drishti.diagonal().any())
+
+    def test_chart_aspects_for_prompts(self):
+        planets = {name: {"longitude_deg": lon} for name, lon in zip(PLANET_TARGETS, self.longitudes)}
+        chart = {"planets": planets}
+        summary = chart_aspects(chart)
+        self.assertEqual(summary["aspects"][0]["orb"], 0.0)
+        self.assertIn({"bodies": ["Sun", "Moon"], "aspect": "trine", "orb": 2.0}, summary["aspects"])
+        self.assertIn("Venus", summary["drishti"]["Mars"])
@@ -0,0 +1,28 @@
+from datetime import datetime
+from unittest import skipUnless
+
+from django.test import SimpleTestCase
+
+from predictions.services.astro_service import AstroService
+from predictions.services.ephemeris import PLANET_TARGETS
+from predictions.tests.utils import ephemeris_available
+
+
+class BatchBirthChartTests(SimpleTestCase):
+
+    def test_empty_batch(self):
+        batch = AstroService().calculate_birth_charts([], [], [])
+        self.assertEqual(batch["longitudes"].shape, (0, len(PLANET_TARGETS)))
+        self.assertEqual(batch["house_cusps"].shape, (0, 12))
+
+    @skipUnless(ephemeris_available(), "ephemeris file not available")
+    def test_batch_matches_single_chart(self):
+        service = AstroService()
+        births = [
+            (datetime(1990, 5, 17, 4, 30), 28.6139, 77.2090),
+            (datetime(1975, 11, 2, 22, 5), -33.8688, 151.2093),
+        ]
+        charts = service.calculate_birth_charts_as_dicts(*zip(*births))
+        for (dt, lat, lon), chart in zip(births, charts):
+            single = service.calculate_birth_chart(dt.date(), dt.time(), f"{lat}, {lon}")
+            self.assertEqual(chart, single)
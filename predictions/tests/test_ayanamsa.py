@@ -0,0 +1,55 @@
+from datetime import datetime
+from unittest import skipUnless
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from predictions.services.astro_service import AstroService
+from predictions.services.ayanamsa import (
+    ayanamsa_degrees,
+    normalize_zodiac,
+    to_sidereal,
+    to_sidereal_house_cusps,
+)
+from predictions.tests.utils import ephemeris_available
+
+
+class AyanamsaTests(SimpleTestCase):
+    j2000 = 2451545.0
+
+    def test_reference_values(self):
+        self.assertAlmostEqual(float(ayanamsa_degrees(self.j2000, "lahiri")), 23.857, places=2)
+        difference = ayanamsa_degrees(self.j2000, "kp") - ayanamsa_degrees(self.j2000, "lahiri")
+        self.assertAlmostEqual(float(difference), -0.096, places=2)
+        self.assertEqual(float(ayanamsa_degrees(self.j2000, "tropical")), 0.0)
+        with self.assertRaises(ValueError):
+            normalize_zodiac("fagan")
+
+    def test_batch_correction_is_one_row_offset_per_chart(self):
+        jd = np.array([self.j2000, self.j2000 + 36525.0])
+        longitudes = np.array([[10.0, 200.0], [10.0, 359.0]])
+        sidereal = to_sidereal(longitudes, jd, "lahiri")
+        offsets = ayanamsa_degrees(jd, "lahiri")
+        np.testing.assert_allclose((longitudes - sidereal) % 360, np.repeat(offsets[:, None], 2, axis=1))
+        self.assertIs(to_sidereal(longitudes, jd, "tropical"), longitudes)
+
+    def test_whole_sign_houses_follow_sidereal_ascendant(self):
+        # Tropical ascendant 10 Aries is ~16 Pisces sidereal, so house 1 starts at Pisces
+        cusps = to_sidereal_house_cusps(
+            np.zeros((1, 12)), np.array([10.0]), self.j2000, "lahiri", whole_sign=True
+        )
+        self.assertEqual(cusps[0, 0], 330.0)
+        np.testing.assert_allclose(np.diff(cusps[0]) % 360, 30)
+
+    @skipUnless(ephemeris_available(), "ephemeris file not available")
+    def test_sidereal_chart_is_shifted_tropical_chart(self):
+        when = datetime(1990, 5, 17, 6, 30)
+        tropical = AstroService(zodiac="tropical").calculate_chart_at(when, 19.07, 72.88)
+        sidereal = AstroService(zodiac="lahiri").calculate_chart_at(when, 19.07, 72.88)
+        tropical_sun = tropical["planets"]["Sun"]["longitude_deg"]
+        sidereal_sun = sidereal["planets"]["Sun"]["longitude_deg"]
+        shift = (tropical_sun - sidereal_sun) % 360
+        self.assertAlmostEqual(shift, 23.72, delta=0.02)
+        self.assertAlmostEqual(
+            (tropical["ascendant"]["degree"] - sidereal["ascendant"]["degree"]) % 360, shift, delta=0.02
+        )
@@ -0,0 +1,52 @@
+from datetime import datetime
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from predictions.services.chart_cache import ChartCache
+
+
+class ChartCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        self.cache = ChartCache(maxsize=2, time_resolution_seconds=60, coord_resolution_degrees=0.01)
+        self.cache.clear(shared=True)
+        self.compute = mock.Mock(side_effect=lambda dt, lat, lon: {"dt": dt, "lat": lat, "lon": lon})
+
+    def test_nearby_inputs_share_one_computation(self):
+        first = self.cache.get_or_compute(datetime(1990, 5, 17, 4, 30, 10), 28.6139, 77.2090, self.compute)
+        second = self.cache.get_or_compute(datetime(1990, 5, 17, 4, 29, 55), 28.6102, 77.2121, self.compute)
+
+        self.assertIs(first, second)
+        self.compute.assert_called_once()
+        self.assertEqual(first["lat"], 28.61)
+        self.assertEqual(first["dt"].second, 0)
+        self.assertEqual(self.cache.stats()["local_hits"], 1)
+
+    def test_variant_is_part_of_the_key(self):
+        dt = datetime(1990, 5, 17, 4, 30)
+        self.cache.get_or_compute(dt, 10.0, 20.0, self.compute, variant="a")
+        self.cache.get_or_compute(dt, 10.0, 20.0, self.compute, variant="b")
+        self.assertEqual(self.compute.call_count, 2)
+
+    def test_lru_eviction_falls_back_to_shared_tier(self):
+        for hour in range(3):
+            self.cache.get_or_compute(datetime(2000, 1, 1, hour), 0.0, 0.0, self.compute)
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+        self.cache.get_or_compute(datetime(2000, 1, 1, 0), 0.0, 0.0, self.compute)
+        stats = self.cache.stats()
+        self.assertEqual(self.compute.call_count, 3)
+        self.assertEqual(stats["shared_hits"], 1)
+        self.assertEqual(stats["misses"], 3)
+        self.assertEqual(stats["local_size"], 2)
+
+    def test_per_entry_timeout_expires_the_local_copy(self):
+        self.cache.set("short", "value", timeout=5)
+        self.assertEqual(self.cache.get("short"), "value")
+
+        self.cache.shared.delete("short")
+        with mock.patch("predictions.services.chart_cache.time") as clock:
+            clock.monotonic.return_value = 1e12
+            self.assertIsNone(self.cache.get("short"))
+        self.assertEqual(self.cache.stats()["local_size"], 0)
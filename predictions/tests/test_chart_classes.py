@@ -0,0 +1,65 @@
+from unittest import mock
+
+import numpy as np
+from django.test import TestCase
+
+from core.users.test.factories import UserFactory
+from predictions.models import Prediction
+from predictions.services.chart_classes import TARAS, chart_class, personal_details
+from predictions.services.compact_chart import CompactChart
+from predictions.services.ephemeris import PLANET_TARGETS
+from predictions.services.reading_service import ReadingService
+
+
+class ChartClassReadingTests(TestCase):
+    TRANSITS = {
+        "date": "2024-01-01",
+        "planets": {name: {"longitude_deg": 100.0, "sign": "Cancer"} for name in PLANET_TARGETS},
+        "moon_nakshatra": {"name": "Pushya", "pada": 1},
+    }
+
+    @staticmethod
+    def chart(ascendant, moon):
+        longitudes = [moon if name == "Moon" else 10.0 for name in PLANET_TARGETS]
+        return CompactChart.from_arrays(longitudes, np.arange(12) * 30.0 + ascendant, ascendant).to_dict()
+
+    def test_chart_class_and_personal_details(self):
+        chart = self.chart(ascendant=45.0, moon=5.0)
+        self.assertEqual(chart_class(chart, ("ascendant", "moon_nakshatra")), {
+            "ascendant": "Taurus", "moon_nakshatra": "Ashwini",
+        })
+        self.assertEqual(chart_class({}), {})
+        with self.assertRaises(ValueError), self.settings(DAILY_READING_CLASS_FACTORS=["moon_sign", "venus"]):
+            chart_class(chart)
+
+        details = personal_details(chart, self.TRANSITS)
+        # Transits in Cancer: 3rd from a Taurus ascendant, 4th from an Aries Moon
+        self.assertEqual(details["transit_houses"]["Sun"], 3)
+        self.assertEqual(details["moon_from_natal_moon"], 4)
+        # Pushya (8th nakshatra) counted from Ashwini
+        self.assertEqual(details["tara"], TARAS[7])
+
+    def test_one_llm_call_per_class_and_language(self):
+        users = [UserFactory() for _ in range(3)]
+        charts = {
+            users[0].id: self.chart(ascendant=45.0, moon=5.0),
+            users[1].id: self.chart(ascendant=50.0, moon=8.0),
+            users[2].id: self.chart(ascendant=100.0, moon=5.0),
+        }
+        with mock.patch("predictions.services.reading_service.OpenAIAPI"):
+            service = ReadingService()
+        service.openai_api.chat_completion.return_value = {"today_reading": {"general_insights": "..."}}
+        class_readings = {}
+        with mock.patch("predictions.services.reading_service.get_daily_transit_snapshot",
+                        return_value=self.TRANSITS), \
+                self.settings(DAILY_READING_CLASS_FACTORS=["ascendant", "moon_nakshatra"]):
+            stored = service.generate_daily_readings_by_class(users, charts, class_readings)
+            # A later batch with an already generated class makes no new call
+            stored += service.generate_daily_readings_by_class(users[:1], charts, class_readings)
+
+        self.assertEqual(stored, 4)
+        self.assertEqual(service.openai_api.chat_completion.call_count, 2)
+        reading = Prediction.objects.filter(user=users[1]).get().content
+        self.assertEqual(reading["today_reading"], {"general_insights": "..."})
+        self.assertEqual(reading["chart_class"], {"ascendant": "Taurus", "moon_nakshatra": "Ashwini"})
+        self.assertEqual(reading["personal"]["transit_houses"]["Sun"], 3)
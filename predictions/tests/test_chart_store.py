@@ -0,0 +1,102 @@
+from datetime import date, datetime, time
+from unittest import mock
+
+from django.test import TestCase
+
+from core.users.test.factories import UserFactory
+from predictions.services import astro_service as astro_module
+from predictions.services.chart_cache import ChartCache
+from predictions.services.chart_store import (
+    birth_datetime,
+    birth_location,
+    get_profile_birth_chart,
+    refresh_profile_charts,
+)
+from predictions.services.gazetteer import Place
+from profiles.models import UserProfile
+
+
+class StoredBirthChartTests(TestCase):
+
+    def setUp(self):
+        self.profile = UserProfile.objects.create(
+            user=UserFactory(),
+            date_of_birth=date(1990, 5, 17),
+            time_of_birth=time(4, 30),
+            place_of_birth="28.6139, 77.2090",
+        )
+        self.astro = mock.Mock()
+        self.astro.chart_cache = ChartCache()
+        self.astro.get_birth_chart.return_value = {"ascendant": {"sign": "Leo"}}
+
+    def test_chart_is_computed_once_and_then_loaded_from_the_profile(self):
+        get_profile_birth_chart(self.profile, self.astro)
+        profile = UserProfile.objects.get(pk=self.profile.pk)
+        self.assertEqual(get_profile_birth_chart(profile, self.astro), {"ascendant": {"sign": "Leo"}})
+        self.astro.get_birth_chart.assert_called_once()
+        self.assertEqual(profile.birth_chart_version, astro_module.CHART_ENGINE_VERSION)
+
+    def test_birth_field_change_or_engine_bump_recomputes(self):
+        get_profile_birth_chart(self.profile, self.astro)
+        self.profile.place_of_birth = "19.0760, 72.8777"
+        get_profile_birth_chart(self.profile, self.astro)
+        self.assertEqual(self.astro.get_birth_chart.call_count, 2)
+
+        with mock.patch("predictions.services.chart_store.CHART_ENGINE_VERSION", 99):
+            get_profile_birth_chart(self.profile, self.astro)
+        self.assertEqual(self.astro.get_birth_chart.call_count, 3)
+
+    def test_refresh_skips_current_profiles(self):
+        self.astro.calculate_birth_charts_as_dicts.return_value = [{"planets": {}}]
+        self.assertEqual(refresh_profile_charts([self.profile], self.astro), (1, 0))
+        self.assertEqual(refresh_profile_charts([self.profile], self.astro), (0, 1))
+        self.assertEqual(UserProfile.objects.get(pk=self.profile.pk).birth_chart, {"planets": {}})
+
+    def test_refresh_computes_from_the_chart_cache_grid(self):
+        self.profile.place_of_birth = "28.61391, 77.20902"
+        self.astro.calculate_birth_charts_as_dicts.return_value = [{"planets": {}}]
+        refresh_profile_charts([self.profile], self.astro)
+        birth_datetimes, lats, lons = self.astro.calculate_birth_charts_as_dicts.call_args.args
+        expected = self.astro.chart_cache.quantize(datetime(1990, 5, 17, 4, 30), 28.61391, 77.20902)
+        self.assertEqual((birth_datetimes[0], lats[0], lons[0]), expected)
+
+
+class ProfileBirthTimezoneTests(TestCase):
+
+    def test_birth_datetime_is_converted_from_the_birth_timezone(self):
+        profile = UserProfile.objects.create(
+            user=UserFactory(), date_of_birth=date(1990, 5, 17), time_of_birth=time(4, 30),
+            place_of_birth="19.07, 72.88", birth_timezone="Asia/Kolkata",
+        )
+        self.assertEqual(birth_datetime(profile), datetime(1990, 5, 16, 23, 0))
+
+    def test_coordinates_take_the_zone_of_the_nearest_place(self):
+        profile = UserProfile.objects.create(
+            user=UserFactory(), date_of_birth=date(1990, 5, 17), time_of_birth=time(4, 30),
+            place_of_birth="19.0, 72.8",
+        )
+        place = Place("Mumbai", 19.07, 72.88, "Asia/Kolkata", "IN", "16", 12691836)
+        with mock.patch("predictions.services.chart_store.nearest_place", return_value=place):
+            self.assertEqual(birth_location(profile), (19.0, 72.8))
+        self.assertEqual(profile.birth_timezone, "Asia/Kolkata")
+
+    def test_location_is_resolved_again_when_the_place_changes_outside_the_api(self):
+        mumbai = Place("Mumbai", 19.07, 72.88, "Asia/Kolkata", "IN", "16", 12691836)
+        london = Place("London", 51.50853, -0.12574, "Europe/London", "GB", "ENG", 8961989)
+        profile = UserProfile.objects.create(
+            user=UserFactory(), date_of_birth=date(1990, 5, 17), time_of_birth=time(4, 30),
+            place_of_birth="Mumbai",
+        )
+        astro = mock.Mock()
+        astro.get_birth_chart.return_value = {"planets": {}}
+        with mock.patch("predictions.services.chart_store.resolve_place", return_value=mumbai):
+            get_profile_birth_chart(profile, astro)
+
+        # e.g. edited in the admin: the stored Mumbai coordinates and zone must not be reused
+        profile.place_of_birth = "London"
+        profile.save()
+        with mock.patch("predictions.services.chart_store.resolve_place", return_value=london):
+            get_profile_birth_chart(profile, astro)
+        profile = UserProfile.objects.get(pk=profile.pk)
+        self.assertEqual((float(profile.latitude), profile.birth_timezone), (51.50853, "Europe/London"))
+        self.assertEqual(astro.get_birth_chart.call_args.args[1:], (51.50853, -0.12574))
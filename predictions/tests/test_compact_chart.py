@@ -0,0 +1,69 @@
+import json
+from datetime import datetime
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from predictions.services.astro_service import AstroService
+from predictions.services.chart_cache import ChartCache
+from predictions.services.compact_chart import CHART_VALUE_COUNT, CompactChart, CompactChartArray
+from predictions.services.ephemeris import PLANET_TARGETS
+
+
+class CompactChartTests(SimpleTestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.batch = {
+            "longitudes": rng.uniform(0, 360, (5, len(PLANET_TARGETS))),
+            "house_cusps": rng.uniform(0, 360, (5, 12)),
+            "ascendant": rng.uniform(0, 360, 5),
+        }
+
+    def test_round_trips_through_bytes(self):
+        chart = CompactChartArray.from_batch(self.batch)[2]
+        payload = chart.to_bytes()
+        self.assertEqual(len(payload), 1 + 2 * CHART_VALUE_COUNT)
+        self.assertEqual(CompactChart.from_bytes(payload), chart)
+        with self.assertRaises(ValueError):
+            CompactChart.from_bytes(payload[:-1])
+
+    def test_named_access_and_json_view(self):
+        chart = CompactChart.from_arrays(
+            [359.996] + [45.123] * (len(PLANET_TARGETS) - 1), np.arange(12) * 30.0, 95.155,
+        )
+        self.assertEqual(chart["Sun"].degree, 0.0)  # wraps instead of showing 360.0
+        self.assertEqual((chart["Moon"].degree, chart["Moon"].sign), (45.12, "Taurus"))
+        self.assertEqual(chart.house(4).sign, "Cancer")
+        self.assertEqual(chart.ascendant.sign, "Cancer")
+        with self.assertRaises(KeyError):
+            chart["Rahu"]
+
+        as_dict = chart.to_dict()
+        self.assertEqual(as_dict["planets"]["Moon"], {"longitude_deg": 45.12, "sign": "Taurus"})
+        self.assertEqual(as_dict["houses"]["12"], {"degree": 330.0, "sign": "Pisces"})
+        self.assertEqual(CompactChart.from_dict(json.loads(json.dumps(as_dict))), chart)
+
+    def test_array_is_two_bytes_per_value_and_round_trips(self):
+        charts = CompactChartArray.from_batch(self.batch)
+        self.assertEqual(charts.nbytes, 5 * CHART_VALUE_COUNT * 2)
+        restored = CompactChartArray.from_bytes(charts.to_bytes())
+        self.assertEqual(list(restored), list(charts))
+        self.assertEqual(CompactChartArray.from_charts(list(charts)).to_dicts(), charts.to_dicts())
+        bodies = restored.degrees()[:, :len(PLANET_TARGETS)]
+        np.testing.assert_allclose(bodies, self.batch["longitudes"], atol=0.005)
+
+    def test_cache_stores_compact_payloads(self):
+        chart_cache = ChartCache(maxsize=4)
+        chart_cache.clear(shared=True)
+        service = AstroService(chart_cache=chart_cache)
+        chart = CompactChartArray.from_batch(self.batch)[0]
+        with mock.patch.object(service, "calculate_compact_chart_at", return_value=chart) as compute:
+            first = service.get_birth_chart(datetime(1990, 5, 17, 4, 30), 28.6, 77.2)
+            second = service.get_birth_chart(datetime(1990, 5, 17, 4, 30), 28.6, 77.2)
+        compute.assert_called_once()
+        self.assertEqual(first, chart.to_dict())
+        self.assertEqual(second, first)
+        _, stored = next(iter(chart_cache._local.values()))
+        self.assertIsInstance(stored, bytes)
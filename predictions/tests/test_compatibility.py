@@ -0,0 +1,64 @@
+from datetime import date, time
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase, TestCase
+
+from core.organizations.models import Organization
+from core.users.test.factories import UserFactory
+from predictions.services.compatibility import KOOTAS, ashtakoota_matrix
+from profiles.models import UserProfile
+
+
+class AshtakootaTests(SimpleTestCase):
+
+    def test_known_pair(self):
+        # Moon in Ashwini (Aries) and in Bharani (Aries)
+        matrix = ashtakoota_matrix([5.0, 20.0])
+        points = {name: matrix["kootas"][name][0, 1] for name in KOOTAS}
+        self.assertEqual(points, {
+            "varna": 1, "vashya": 2, "tara": 3, "yoni": 2,
+            "graha_maitri": 5, "gana": 5, "bhakoot": 7, "nadi": 8,
+        })
+        self.assertEqual(matrix["total"][0, 1], 33)
+        self.assertEqual(matrix["total"][1, 0], 34)  # gana is directional
+        self.assertEqual(matrix["total"][0, 0], 28)  # same nadi
+
+    def test_family_matrix_in_one_pass(self):
+        moons = np.random.default_rng(5).uniform(0, 360, 50)
+        matrix = ashtakoota_matrix(moons)
+        self.assertEqual(matrix["total"].shape, (50, 50))
+        self.assertTrue(((matrix["total"] >= 0) & (matrix["total"] <= 36)).all())
+        for name in ("tara", "yoni", "graha_maitri", "bhakoot", "nadi"):
+            np.testing.assert_array_equal(matrix["kootas"][name], matrix["kootas"][name].T)
+        single = ashtakoota_matrix(moons[[3, 41]])
+        self.assertEqual(single["total"][0, 1], matrix["total"][3, 41])
+
+
+class OrganizationCompatibilityTests(TestCase):
+
+    def test_scores_members_who_share_their_profile(self):
+        owner, relative, private = (
+            UserFactory(id=f"00000000-0000-0000-0000-00000000000{n}") for n in range(1, 4)
+        )
+        organization = Organization.objects.create(name="The Family")
+        moons = {}
+        for user, moon, shared in ((owner, 5.0, False), (relative, 20.0, True), (private, 100.0, False)):
+            organization.add_user(user)
+            UserProfile.objects.create(
+                user=user, date_of_birth=date(1990, 1, 1), time_of_birth=time(12), allow_org_access=shared,
+            )
+            moons[str(user.pk)] = moon
+
+        def refresh(profiles, astro_service=None):
+            for profile in profiles:
+                profile.birth_chart = {"planets": {"Moon": {"longitude_deg": moons[str(profile.user_id)]}}}
+
+        self.client.force_login(owner)
+        with mock.patch("predictions.services.compatibility.refresh_profile_charts", side_effect=refresh):
+            url = f"/api/v1/organizations/organizations/{organization.pk}/compatibility/"
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["members"], [owner.pk, relative.pk])
+        self.assertEqual(response.json()["scores"], [[28.0, 33.0], [34.0, 28.0]])
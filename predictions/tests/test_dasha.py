@@ -0,0 +1,31 @@
+from datetime import datetime
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from predictions.services.dasha import PERIOD_OFFSETS, DashaTimeline
+
+
+class DashaTimelineTests(SimpleTestCase):
+
+    def test_period_tables_span_one_cycle(self):
+        np.testing.assert_allclose(PERIOD_OFFSETS[:, -1], 120.0)
+        self.assertTrue((np.diff(PERIOD_OFFSETS, axis=1) > 0).all())
+
+    def test_timeline_from_moon_longitude(self):
+        # Moon half way through Pushya (Saturn): 9.5 years of Saturn remain
+        birth = datetime(1990, 5, 17, 6, 30)
+        timeline = DashaTimeline(100.0, birth)
+        mahadashas = timeline.mahadashas()
+        self.assertEqual([m["lord"] for m in mahadashas[:3]], ["Saturn", "Mercury", "Ketu"])
+        self.assertEqual((mahadashas[0]["age_end"], mahadashas[1]["age_end"]), (9.5, 26.5))
+        self.assertEqual(mahadashas[-1]["age_end"], 120.0)
+
+        period = timeline.period_at(datetime(2024, 1, 1))
+        self.assertEqual(period["mahadasha"]["lord"], "Venus")
+        self.assertEqual(period["antardasha"]["lord"], "Venus")
+        self.assertEqual(period["mahadasha"]["start"].date().isoformat(), mahadashas[3]["start"])
+        self.assertLessEqual(period["antardasha"]["end"], period["mahadasha"]["end"])
+
+        with self.assertRaises(ValueError):
+            timeline.period_at(datetime(1980, 1, 1))
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import threading
+from datetime import datetime
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from predictions.services.astro_service import AstroService
+from predictions.services.ephemeris import PLANET_TARGETS, EphemerisRegistry, build_ephemeris_bundle
+from predictions.tests.utils import ephemeris_available
+
+
+class EphemerisRegistryTests(SimpleTestCase):
+    """
+    The registry should hit the Skyfield loader once per resource per process.
+    """
+
+    def test_resources_are_loaded_once_across_threads(self):
+        with mock.patch("predictions.services.ephemeris.Loader") as loader_cls:
+            registry = EphemerisRegistry(data_dir="/tmp/skyfield")
+            threads = [threading.Thread(target=registry.warm_up) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            loader_cls.assert_called_once_with("/tmp/skyfield")
+            loader = loader_cls.return_value
+            loader.timescale.assert_called_once_with()
+            loader.assert_called_once_with("de421.bsp")
+            self.assertEqual(set(registry.planet_refs()), set(PLANET_TARGETS))
+            self.assertIs(registry.ephemeris(), registry.ephemeris("de421.bsp"))
+
+    def test_clear_forces_a_reload(self):
+        with mock.patch("predictions.services.ephemeris.Loader") as loader_cls:
+            registry = EphemerisRegistry(data_dir="/tmp/skyfield")
+            registry.timescale()
+            registry.clear()
+            registry.timescale()
+            self.assertEqual(loader_cls.call_count, 2)
+
+    @skipUnless(ephemeris_available(), "ephemeris file not available")
+    def test_trimmed_bundle_is_used_when_installed(self):
+        source = os.path.join(settings.SKYFIELD_DATA_DIR, settings.SKYFIELD_EPHEMERIS)
+        with tempfile.TemporaryDirectory() as path:
+            bundle = os.path.join(path, "bundle.bsp")
+            summary = build_ephemeris_bundle(source, bundle, 2000, 2001)
+            self.assertLess(summary["bytes"], os.path.getsize(source))
+            self.assertEqual(os.stat(bundle).st_mode & 0o222, 0)  # read-only
+
+            with self.settings(SKYFIELD_EPHEMERIS_BUNDLE=bundle):
+                registry = EphemerisRegistry()
+                self.assertEqual(registry.default_ephemeris, bundle)
+                when = datetime(2000, 6, 1, 12, 0)
+                bundled = AstroService(registry=registry).calculate_chart_at(when, 19.07, 72.88)
+            full = AstroService(registry=EphemerisRegistry()).calculate_chart_at(when, 19.07, 72.88)
+            self.assertEqual(bundled, full)
+
+    @skipUnless(ephemeris_available(), "ephemeris file not available")
+    def test_bundle_keeps_the_source_coverage_by_default(self):
+        source = os.path.join(settings.SKYFIELD_DATA_DIR, settings.SKYFIELD_EPHEMERIS)
+        with tempfile.TemporaryDirectory() as path:
+            bundle = os.path.join(path, "bundle.bsp")
+            build_ephemeris_bundle(source, bundle)
+            with self.settings(SKYFIELD_EPHEMERIS_BUNDLE=bundle):
+                bundled = EphemerisRegistry().coverage()
+        self.assertEqual(bundled, EphemerisRegistry().coverage())
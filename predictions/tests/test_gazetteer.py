@@ -0,0 +1,86 @@
+import os
+import tempfile
+from datetime import date, time
+from unittest import mock
+
+from django.test import TestCase
+
+from core.users.test.factories import UserFactory
+from predictions.services.chart_store import birth_location, get_profile_birth_chart
+from predictions.services.gazetteer import Gazetteer
+from profiles.models import UserProfile
+
+
+GEONAMES_ROWS = [
+    # id, name, asciiname, alternatenames, lat, lon, class, code, country, cc2, admin1,
+    # ..., population, ..., timezone
+    ["1275339", "Mumbai", "Mumbai", "Bombay,Bombaim,ムンバイ", "19.07283", "72.88261", "P", "PPLA", "IN", "",
+     "16", "", "", "", "12691836", "", "8", "Asia/Kolkata", "2019-06-07"],
+    ["3448439", "São Paulo", "Sao Paulo", "Sampa", "-23.5475", "-46.63611", "P", "PPLA", "BR", "", "27",
+     "", "", "", "10021295", "", "769", "America/Sao_Paulo", "2019-06-07"],
+    ["4409896", "Springfield", "Springfield", "", "37.21533", "-93.29824", "P", "PPLA2", "US", "", "MO",
+     "", "", "", "166810", "", "396", "America/Chicago", "2017-05-23"],
+    ["4250542", "Springfield", "Springfield", "", "39.80172", "-89.64371", "P", "PPLA", "US", "", "IL",
+     "", "", "", "116565", "", "180", "America/Chicago", "2017-05-23"],
+]
+
+
+class GazetteerTests(TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".txt")
+        with os.fdopen(handle, "w", encoding="utf-8") as fh:
+            fh.write("".join("\t".join(row) + "\n" for row in GEONAMES_ROWS))
+        self.addCleanup(os.remove, self.path)
+        self.gazetteer = Gazetteer(self.path)
+
+    def test_resolves_names_accents_and_alternate_names(self):
+        self.assertEqual(self.gazetteer.resolve("Bombay").timezone, "Asia/Kolkata")
+        self.assertEqual(self.gazetteer.resolve("  sao  paulo ").name, "São Paulo")
+        self.assertEqual(self.gazetteer.resolve("SÃO PAULO, Brazil").country_code, "BR")
+        self.assertIsNone(self.gazetteer.resolve("Atlantis"))
+
+    def test_qualifiers_pick_between_homonyms(self):
+        self.assertEqual(self.gazetteer.resolve("Springfield").admin1, "MO")  # most populous
+        self.assertEqual(self.gazetteer.resolve("Springfield, IL, US").admin1, "IL")
+
+    def test_qualifiers_match_country_and_region_names(self):
+        homonym = list(GEONAMES_ROWS[0])
+        homonym[0], homonym[8], homonym[10], homonym[14] = "1", "GB", "ENG", "99999999"
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cities15000.txt")
+            with open(path, "w", encoding="utf-8") as fh:
+                fh.write("".join("\t".join(row) + "\n" for row in [GEONAMES_ROWS[0], homonym]))
+            with open(os.path.join(directory, "countryInfo.txt"), "w", encoding="utf-8") as fh:
+                fh.write("#ISO\tISO3\tISO-Numeric\tfips\tCountry\n")
+                fh.write("IN\tIND\t356\tIN\tIndia\nGB\tGBR\t826\tUK\tUnited Kingdom\n")
+            with open(os.path.join(directory, "admin1CodesASCII.txt"), "w", encoding="utf-8") as fh:
+                fh.write("IN.16\tMaharashtra\tMaharashtra\t1264418\n")
+            gazetteer = Gazetteer(path)
+
+        self.assertEqual(gazetteer.resolve("Mumbai").country_code, "GB")  # most populous
+        self.assertEqual(gazetteer.resolve("Mumbai, India").country_code, "IN")
+        self.assertEqual(gazetteer.resolve("Mumbai, Maharashtra").country_code, "IN")
+        self.assertEqual(gazetteer.resolve("Mumbai, United Kingdom").country_code, "GB")
+
+    def test_prefix_search(self):
+        self.assertEqual([place.admin1 for place in self.gazetteer.search("spring")], ["MO", "IL"])
+        self.assertEqual(self.gazetteer.search("zzz"), [])
+
+    def test_resolved_location_is_written_back_with_the_chart(self):
+        profile = UserProfile.objects.create(
+            user=UserFactory(), date_of_birth=date(1990, 5, 17), time_of_birth=time(4, 30),
+            place_of_birth="Bombay",
+        )
+        astro = mock.Mock()
+        astro.get_birth_chart.return_value = {"planets": {}}
+        with mock.patch("predictions.services.chart_store.resolve_place", self.gazetteer.resolve):
+            get_profile_birth_chart(profile, astro)
+
+        profile = UserProfile.objects.get(pk=profile.pk)
+        self.assertEqual((float(profile.latitude), profile.birth_timezone), (19.07283, "Asia/Kolkata"))
+        with mock.patch("predictions.services.chart_store.resolve_place") as resolve:
+            self.assertEqual(birth_location(profile), (19.07283, 72.88261))
+            get_profile_birth_chart(profile, astro)
+            resolve.assert_not_called()
+        astro.get_birth_chart.assert_called_once()
@@ -0,0 +1,60 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from predictions.services.houses import compute_house_cusps
+
+
+class HouseCuspTests(SimpleTestCase):
+    obliquity = 23.44
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.ramc = rng.uniform(0, 360, 500)
+        self.latitudes = rng.uniform(-60, 60, 500)
+
+    def _semi_arc_residual(self, cusps, column, fraction, above_horizon):
+        # Placidus: a cusp's hour angle is a fixed fraction of its own semi-arc
+        eps = np.radians(self.obliquity)
+        lam = np.radians(cusps[:, column])
+        ra = np.arctan2(np.sin(lam) * np.cos(eps), np.cos(lam))
+        dec = np.arcsin(np.sin(eps) * np.sin(lam))
+        ad = np.arcsin(np.tan(np.radians(self.latitudes)) * np.tan(dec))
+        ramc = np.radians(self.ramc)
+        if above_horizon:
+            target = ramc + fraction * (np.pi / 2 + ad)
+        else:
+            target = ramc + np.pi - fraction * (np.pi / 2 - ad)
+        return np.abs((np.degrees(ra - target) + 180) % 360 - 180).max()
+
+    def test_placidus_cusps_trisect_semi_arcs(self):
+        cusps = compute_house_cusps(self.ramc, self.latitudes, "placidus", self.obliquity)
+        self.assertEqual(cusps.shape, (500, 12))
+        self.assertLess(self._semi_arc_residual(cusps, 10, 1 / 3, True), 1e-6)
+        self.assertLess(self._semi_arc_residual(cusps, 11, 2 / 3, True), 1e-6)
+        self.assertLess(self._semi_arc_residual(cusps, 1, 2 / 3, False), 1e-6)
+        self.assertLess(self._semi_arc_residual(cusps, 2, 1 / 3, False), 1e-6)
+        # Ascendant rises: its hour angle is minus its full semi-diurnal arc
+        self.assertLess(self._semi_arc_residual(cusps, 0, 1.0, True), 1e-6)
+        np.testing.assert_allclose((cusps[:, 6] - cusps[:, 0]) % 360, 180)
+
+    def test_whole_sign_and_equal_houses(self):
+        placidus = compute_house_cusps(self.ramc, self.latitudes, "placidus", self.obliquity)
+        whole = compute_house_cusps(self.ramc, self.latitudes, "whole_sign", self.obliquity)
+        equal = compute_house_cusps(self.ramc, self.latitudes, "equal", self.obliquity)
+        np.testing.assert_allclose(whole[:, 0], (placidus[:, 0] // 30) * 30)
+        np.testing.assert_allclose(np.diff(whole, axis=1) % 360, 30)
+        # Cusps are longitudes: houses past Pisces wrap around to Aries
+        late = compute_house_cusps([300.0], [20.0], "whole_sign", self.obliquity)
+        self.assertTrue(((late >= 0) & (late < 360)).all())
+        self.assertIn(0.0, late)
+        np.testing.assert_allclose(equal[:, 0], placidus[:, 0])
+        np.testing.assert_allclose(np.diff(equal, axis=1) % 360, 30)
+
+    def test_polar_latitudes_fall_back_to_quadrant_trisection(self):
+        cusps = compute_house_cusps([100.0, 100.0], [70.0, -80.0], "placidus", self.obliquity)
+        spans = np.diff(np.concatenate([cusps, cusps[:, :1]], axis=1), axis=1) % 360
+        np.testing.assert_allclose(spans.sum(axis=1), 360)
+
+    def test_unknown_system(self):
+        with self.assertRaises(ValueError):
+            compute_house_cusps(0.0, 0.0, "koch")
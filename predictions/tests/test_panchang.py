@@ -0,0 +1,59 @@
+from datetime import date
+from unittest import mock, skipUnless
+
+from django.test import SimpleTestCase
+
+from predictions.services.panchang import (
+    PanchangService,
+    get_daily_panchang,
+    karana,
+    panchang_cache,
+    tithi,
+    yoga,
+)
+from predictions.tests.utils import ephemeris_available
+
+
+class PanchangTests(SimpleTestCase):
+
+    def setUp(self):
+        panchang_cache.clear(shared=True)
+
+    def test_limbs_from_longitudes(self):
+        self.assertEqual(tithi(10.0, 15.0), {"number": 1, "name": "Pratipada", "paksha": "Shukla"})
+        self.assertEqual(tithi(10.0, 185.0)["name"], "Purnima")
+        self.assertEqual(tithi(10.0, 359.0), {"number": 30, "name": "Amavasya", "paksha": "Krishna"})
+        self.assertEqual(karana(0.0, 3.0), "Kimstughna")
+        self.assertEqual(karana(0.0, 9.0), "Bava")
+        self.assertEqual(karana(0.0, 45.0), "Vishti")
+        self.assertEqual(karana(0.0, 355.0), "Naga")
+        self.assertEqual(yoga(350.0, 20.0), {"number": 1, "name": "Vishkambha"})
+
+    def test_locations_in_one_grid_cell_share_a_computation(self):
+        service = PanchangService()
+
+        def cell(day, lat, lon):
+            return {"cell": (lat, lon)}
+
+        with mock.patch.object(service, "compute", side_effect=cell) as compute:
+            first = get_daily_panchang(19.07, 72.88, date(2024, 1, 1), service)
+            second = get_daily_panchang(19.01, 72.96, date(2024, 1, 1), service)
+            get_daily_panchang(19.07, 72.88, date(2024, 1, 2), service)
+        self.assertEqual(first, {"cell": (19.0, 73.0)})
+        self.assertIs(first, second)
+        self.assertEqual(compute.call_count, 2)
+
+    @skipUnless(ephemeris_available(), "ephemeris file not available")
+    def test_sunrise_panchang(self):
+        panchang = PanchangService(zodiac="lahiri").compute(date(2024, 1, 1), 19.0, 72.75)
+        self.assertTrue(panchang["sunrise"].startswith("2024-01-01T01:4"))  # 07:1x IST
+        self.assertEqual(panchang["computed_for"], panchang["sunrise"])
+        self.assertEqual(panchang["tithi"], {"number": 20, "name": "Panchami", "paksha": "Krishna"})
+        self.assertEqual(panchang["nakshatra"]["name"], "Magha")
+        self.assertEqual(panchang["vara"], "Somavara")
+
+    @skipUnless(ephemeris_available(), "ephemeris file not available")
+    def test_polar_night_falls_back_to_noon(self):
+        panchang = PanchangService().compute(date(2024, 12, 21), 78.0, 15.0)
+        self.assertIsNone(panchang["sunrise"])
+        self.assertIn("tithi", panchang)
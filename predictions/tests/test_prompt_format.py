@@ -0,0 +1,91 @@
+from datetime import datetime
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from assistant import openai_utils
+from assistant.openai_utils import count_message_tokens, count_tokens
+from predictions.services.compact_chart import CompactChart
+from predictions.services.dasha import DashaTimeline
+from predictions.services.ephemeris import PLANET_TARGETS
+from predictions.services.prompt_format import (
+    chart_legend,
+    format_chart,
+    format_dasha,
+    format_factors,
+    format_panchang,
+    format_position,
+    format_transits,
+    format_vargas,
+)
+from predictions.services.vargas import divisional_chart_signs
+
+
+class PromptFormatTests(SimpleTestCase):
+    def test_chart_encoding_is_dense_and_stable(self):
+        longitudes = [17.07 + 33.3 * column for column in range(len(PLANET_TARGETS))]
+        chart = CompactChart.from_arrays(longitudes, np.arange(12) * 30.0 + 155.77, 155.77).to_dict()
+
+        self.assertEqual(format_position(17.07), "Ari 17.1")
+        self.assertEqual(format_position(359.99), "Ari 0.0")
+        self.assertEqual(format_position(29.96), "Tau 0.0")
+        encoded = format_chart(chart)
+        self.assertEqual(encoded, format_chart(CompactChart.from_dict(chart).to_dict()))
+        self.assertTrue(encoded.startswith("Asc Vir 5.8\nSu Ari 17.1, Mo Tau 20.4, "))
+        self.assertEqual(format_chart({}), "Unknown (no birth data)")
+        self.assertIn("(sidereal, lahiri ayanamsa)", chart_legend("lahiri"))
+        self.assertIn("(tropical)", chart_legend("tropical"))
+        # At least halves the prompt tokens, legend included
+        self.assertLessEqual(count_tokens(chart_legend("lahiri") + encoded) * 2, count_tokens(str(chart)))
+
+        snapshot = {
+            "date": "2024-01-01",
+            "planets": {"Saturn": {"longitude_deg": 305.0, "retrograde": True}},
+            "moon_nakshatra": {"name": "Hasta", "pada": 2},
+        }
+        self.assertEqual(format_transits(snapshot), "2024-01-01: Sa Aqu 5.0 R\nMoon nakshatra Hasta pada 2")
+
+        vargas = format_vargas(divisional_chart_signs(chart, ("D1", "D9")))
+        rasi, navamsa = vargas.split("\n")
+        self.assertTrue(rasi.startswith("D1: Su Ari, Mo Tau, "))
+        self.assertTrue(rasi.endswith(", Asc Vir"))
+        self.assertTrue(navamsa.startswith("D9: "))
+
+    def test_class_dasha_and_panchang_encodings(self):
+        self.assertEqual(format_factors({"ascendant": "Leo", "moon_nakshatra": "Hasta"}),
+                         "ascendant Leo, moon nakshatra Hasta")
+        self.assertEqual(format_factors({}), "Unknown (no birth data)")
+
+        summary = DashaTimeline(100.0, datetime(1990, 5, 17, 6, 30)).prompt_summary(datetime(2024, 1, 1))
+        encoded = format_dasha(summary)
+        self.assertTrue(encoded.startswith("Mahadashas: Saturn 1990-05-17 to "))
+        self.assertIn("\nNow: mahadasha Venus (", encoded)
+        self.assertLess(count_tokens(encoded), count_tokens(str(summary)))
+
+        panchang = {
+            "date": "2024-01-01", "vara": "Somavara", "sunrise": "2024-01-01T01:42:10+00:00", "sunset": None,
+            "tithi": {"number": 20, "name": "Panchami", "paksha": "Krishna"},
+            "nakshatra": {"name": "Purva Phalguni", "pada": 3}, "yoga": {"number": 12, "name": "Shula"},
+            "karana": "Taitila",
+        }
+        self.assertEqual(
+            format_panchang(panchang),
+            "2024-01-01 Somavara: tithi Krishna Panchami (20), nakshatra Purva Phalguni pada 3, "
+            "yoga Shula, karana Taitila; sunrise 01:42 UTC, sunset none",
+        )
+
+    def test_token_counts_fall_back_when_the_encoding_cannot_load(self):
+        tiktoken = mock.Mock()
+        tiktoken.encoding_for_model.side_effect = OSError("no network")
+        openai_utils._encoding.cache_clear()
+        self.addCleanup(openai_utils._encoding.cache_clear)
+        with mock.patch.object(openai_utils, "tiktoken", tiktoken):
+            self.assertEqual(count_tokens("Su Ari 17.1"), 5)
+
+    def test_message_tokens_include_the_chat_framing(self):
+        messages = [{"role": "system", "content": "Hello"}, {"role": "user", "content": "Sun in Aries"}]
+        self.assertEqual(
+            count_message_tokens(messages),
+            3 + 2 * 4 + count_tokens("Hello") + count_tokens("Sun in Aries"),
+        )
@@ -0,0 +1,79 @@
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from assistant.openai_utils import JSONSectionParser
+from core.users.test.factories import UserFactory
+from predictions.models import Prediction
+from predictions.services.reading_service import ReadingService
+
+
+class ConcurrentReadingTests(SimpleTestCase):
+    def test_sections_run_concurrently_on_one_chart(self):
+        reading_types = ["a", "b", "c", "d"]
+        # Every section waits for all the others: this only completes if they run at the same time
+        barrier = threading.Barrier(len(reading_types), timeout=5)
+
+        def generate(user, reading_type, birth_chart=None):
+            barrier.wait()
+            return {reading_type: birth_chart["ascendant"]}
+
+        with mock.patch("predictions.services.reading_service.OpenAIAPI"):
+            service = ReadingService()
+        user = mock.Mock(id=1)
+        with mock.patch("predictions.services.reading_service.has_birth_data", return_value=True), \
+                mock.patch("predictions.services.reading_service.get_profile_birth_chart",
+                           return_value={"ascendant": "Leo"}) as load_chart, \
+                mock.patch.object(service, "generate_reading", side_effect=generate):
+            results = service.generate_readings(user, reading_types)
+
+        load_chart.assert_called_once_with(user.profile, service.astro_service)
+        self.assertEqual(list(results), reading_types)
+        self.assertEqual(results["c"], {"c": "Leo"})
+
+
+class CombinedReadingTests(TestCase):
+    RESPONSE = (
+        '```json\n{\n  "health_and_wellbeing": {"concerns": ["sleep"], "note": "braces } in \\"text\\""},\n'
+        '  "major_life_periods": {"early_life": "...", "mid_life": "...", "later_years": "..."}\n}\n```'
+    )
+
+    def test_parser_emits_each_section_as_it_closes(self):
+        parser = JSONSectionParser()
+        emitted = []
+        for position, char in enumerate(self.RESPONSE):
+            for key, value in parser.feed(char):
+                emitted.append((key, position))
+        self.assertEqual([key for key, _ in emitted], ["health_and_wellbeing", "major_life_periods"])
+        # The first section is out before the second one starts streaming
+        self.assertLess(emitted[0][1], self.RESPONSE.index('"major_life_periods"'))
+        self.assertTrue(parser.finished)
+
+        parser = JSONSectionParser()
+        self.assertEqual(parser.feed('{"a": 1, "b": "x", "c": [1, {"d": null}]}'), [
+            ("a", 1), ("b", "x"), ("c", [1, {"d": None}]),
+        ])
+
+    def test_sections_are_stored_from_one_streamed_request(self):
+        user = UserFactory()
+        with mock.patch("predictions.services.reading_service.OpenAIAPI"):
+            service = ReadingService()
+        service.openai_api.chat_completion_stream.return_value = iter(
+            self.RESPONSE[i:i + 7] for i in range(0, len(self.RESPONSE), 7)
+        )
+        service.openai_api.chat_completion.return_value = {"challenges_and_remedies": {"challenges": []}}
+        reading_types = ["health_and_wellbeing", "major_life_periods", "challenges_and_remedies"]
+
+        results = service.generate_combined_reading(user, reading_types, birth_chart={})
+
+        service.openai_api.chat_completion_stream.assert_called_once()
+        prompt = service.openai_api.chat_completion_stream.call_args[0][0][1]["content"]
+        self.assertIn('"major_life_periods": {', prompt)
+        self.assertEqual(results["health_and_wellbeing"]["health_and_wellbeing"]["concerns"], ["sleep"])
+        # Missing from the stream: generated on its own
+        service.openai_api.chat_completion.assert_called_once()
+        self.assertEqual(
+            sorted(Prediction.objects.filter(user=user).values_list("prediction_type", flat=True)),
+            sorted(reading_types),
+        )
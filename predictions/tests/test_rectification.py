@@ -0,0 +1,79 @@
+from datetime import datetime
+from unittest import skipUnless
+
+import numpy as np
+from django.test import TestCase
+
+from core.users.test.factories import UserFactory
+from predictions.services.astro_service import AstroService
+from predictions.services.ephemeris import PLANET_TARGETS
+from predictions.services.houses import house_positions
+from predictions.tests.utils import ephemeris_available
+
+
+class BirthTimeSweepTests(TestCase):
+
+    def test_house_positions(self):
+        cusps = np.array([[(15.0 + 30 * i) % 360 for i in range(12)]])
+        houses = house_positions([[15.0, 44.9, 45.0, 10.0, 350.0]], cusps)
+        self.assertEqual(houses.tolist(), [[1, 1, 2, 12, 12]])
+
+    def test_sweep_requires_valid_input(self):
+        self.client.force_login(UserFactory())
+        response = self.client.post(
+            "/api/v1/predictions/rectification/sweep/",
+            {"date_of_birth": "1990-05-17", "time_of_birth": "06:30", "latitude": 123, "longitude": 72.88},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("latitude", response.json()["errors"])
+
+    def test_sweep_rejects_unknown_time_zones(self):
+        self.client.force_login(UserFactory())
+        response = self.client.post(
+            "/api/v1/predictions/rectification/sweep/",
+            {"date_of_birth": "1990-05-17", "time_of_birth": "12:00", "latitude": 19.07, "longitude": 72.88,
+             "timezone": "Mars/Olympus_Mons"},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("timezone", response.json()["errors"])
+
+    @skipUnless(ephemeris_available(), "ephemeris file not available")
+    def test_sweep_converts_local_birth_time(self):
+        self.client.force_login(UserFactory())
+        response = self.client.post(
+            "/api/v1/predictions/rectification/sweep/",
+            {"date_of_birth": "1990-05-17", "time_of_birth": "12:00", "latitude": 19.07, "longitude": 72.88,
+             "timezone": "Asia/Kolkata", "window_minutes": 0},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["message"]["candidates"][0]["time"], "1990-05-17T12:00:00+05:30")
+
+    @skipUnless(ephemeris_available(), "ephemeris file not available")
+    def test_sweep_outside_the_ephemeris_is_rejected(self):
+        self.client.force_login(UserFactory())
+        response = self.client.post(
+            "/api/v1/predictions/rectification/sweep/",
+            {"date_of_birth": "1850-01-01", "time_of_birth": "06:30", "latitude": 19.07, "longitude": 72.88},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("range of the ephemeris", response.json()["errors"]["non_field_errors"][0])
+
+    @skipUnless(ephemeris_available(), "ephemeris file not available")
+    def test_sweep_matches_single_charts(self):
+        self.client.force_login(UserFactory())
+        response = self.client.post(
+            "/api/v1/predictions/rectification/sweep/",
+            {"date_of_birth": "1990-05-17", "time_of_birth": "06:30", "latitude": 19.07, "longitude": 72.88,
+             "window_minutes": 30, "step_minutes": 5},
+        )
+        self.assertEqual(response.status_code, 200)
+        result = response.json()["message"]
+        self.assertEqual(result["count"], 13)
+        center = result["candidates"][6]
+        self.assertTrue(center["time"].startswith("1990-05-17T06:30:00"))
+
+        chart = AstroService().calculate_chart_at(datetime(1990, 5, 17, 6, 30), 19.07, 72.88)
+        self.assertAlmostEqual(center["ascendant"]["degree"], chart["ascendant"]["degree"], places=1)
+        self.assertEqual(set(center["houses"]), set(PLANET_TARGETS))
+        # The ascendant moves about a degree every four minutes
+        self.assertNotEqual(result["candidates"][0]["ascendant"]["degree"], center["ascendant"]["degree"])
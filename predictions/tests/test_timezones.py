@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from django.test import SimpleTestCase
+
+from predictions.services.timezones import local_to_utc, zone_year_table
+
+
+class TimezoneConversionTests(SimpleTestCase):
+
+    def test_matches_zoneinfo_including_historical_offsets(self):
+        from zoneinfo import ZoneInfo
+
+        rows = [
+            (datetime(1942, 6, 1, 12, 0), "Asia/Kolkata"),  # war time, UTC+6:30
+            (datetime(1990, 5, 17, 4, 30), "Asia/Kolkata"),
+            (datetime(1985, 1, 15, 9, 0), "America/New_York"),
+            (datetime(1985, 7, 15, 9, 0), "America/New_York"),
+            (datetime(1995, 10, 29, 1, 30), "America/New_York"),  # repeated hour
+            (datetime(1971, 3, 1, 23, 59, 59), "Europe/London"),  # British Standard Time
+            (datetime(2000, 1, 1, 0, 0), ""),
+        ]
+        converted = local_to_utc([dt for dt, _ in rows], [zone for _, zone in rows])
+        for (local_dt, zone), utc_dt in zip(rows, converted):
+            aware = local_dt.replace(tzinfo=ZoneInfo(zone or "UTC"))
+            expected = aware.astimezone(ZoneInfo("UTC")).replace(tzinfo=None)
+            self.assertEqual(utc_dt, expected, f"{local_dt} {zone}")
+
+    def test_nonexistent_times_use_the_offset_before_the_gap(self):
+        utc_dt, = local_to_utc([datetime(2021, 3, 14, 2, 30)], ["America/New_York"])
+        self.assertEqual(utc_dt, datetime(2021, 3, 14, 7, 30))
+
+    def test_tables_are_cached_per_zone_and_year(self):
+        zone_year_table.cache_clear()
+        local_to_utc([datetime(1990, 1, day) for day in range(1, 29)], ["Asia/Kolkata"] * 28)
+        local_to_utc([datetime(1990, 6, 1), datetime(1991, 6, 1)], ["Asia/Kolkata"] * 2)
+        info = zone_year_table.cache_info()
+        self.assertEqual((info.misses, info.hits), (2, 1))
+
+    def test_unknown_zones_are_treated_as_utc(self):
+        self.assertEqual(local_to_utc([datetime(1990, 1, 1, 6)], ["Mars/Olympus"]), [datetime(1990, 1, 1, 6)])
@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+from datetime import date, datetime
+from unittest import mock, skipUnless
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from predictions.services.julian import datetime_to_jd
+from predictions.services.transit_index import (
+    MANIFEST_NAME,
+    TRANSIT_INDEX_VERSION,
+    TransitIndex,
+    TransitIndexBuilder,
+)
+from predictions.tests.utils import ephemeris_available
+
+
+class TransitIndexTests(SimpleTestCase):
+
+    def _write_index(self, path):
+        start, end = datetime_to_jd(datetime(2000, 1, 1)), datetime_to_jd(datetime(2001, 1, 1))
+        times = np.array([start, datetime_to_jd(datetime(2000, 3, 1)), datetime_to_jd(datetime(2000, 9, 1))])
+        np.save(os.path.join(path, "saturn.sign.times.npy"), times)
+        np.save(os.path.join(path, "saturn.sign.values.npy"), np.array([1, 2, 1], dtype=np.int16))
+        np.save(os.path.join(path, "saturn.station.times.npy"), times)
+        np.save(os.path.join(path, "saturn.station.values.npy"), np.array([0, 1, 0], dtype=np.int8))
+        with open(os.path.join(path, MANIFEST_NAME), "w") as fh:
+            json.dump({
+                "version": TRANSIT_INDEX_VERSION, "zodiac": "lahiri", "start_jd": start, "end_jd": end,
+            }, fh)
+
+    def test_lookups_bisect_the_event_arrays(self):
+        with tempfile.TemporaryDirectory() as path:
+            self._write_index(path)
+            index = TransitIndex(path, zodiac="lahiri")
+            self.assertEqual(index.sign_at("Saturn", datetime(2000, 2, 1)), 1)
+            self.assertEqual(index.sign_at("Saturn", datetime(2000, 3, 2)), 2)
+            self.assertTrue(index.is_retrograde("Saturn", datetime(2000, 5, 1)))
+            self.assertFalse(index.is_retrograde("Sun", datetime(2000, 5, 1)))
+
+            when, sign = index.next_ingress("Saturn", datetime(2000, 4, 1))
+            self.assertEqual((when.date(), sign), (date(2000, 9, 1), 1))
+            self.assertIsNone(index.next_station("Saturn", datetime(2000, 10, 1)))
+            self.assertIsNone(index.previous_event("Saturn", "sign", datetime(2000, 2, 1)))
+
+            with self.assertRaises(ValueError):
+                index.sign_at("Saturn", datetime(2005, 1, 1))
+
+    def test_index_for_another_zodiac_or_version_is_refused(self):
+        with tempfile.TemporaryDirectory() as path:
+            self._write_index(path)
+            with self.assertRaisesMessage(ValueError, "built for the lahiri zodiac, not tropical"):
+                TransitIndex(path, zodiac="tropical")
+            newer = TRANSIT_INDEX_VERSION + 1
+            with mock.patch("predictions.services.transit_index.TRANSIT_INDEX_VERSION", newer), \
+                    self.assertRaisesMessage(ValueError, "rebuild it"):
+                TransitIndex(path, zodiac="lahiri")
+
+    @skipUnless(ephemeris_available(), "ephemeris file not available")
+    def test_builder_finds_mercury_station(self):
+        with tempfile.TemporaryDirectory() as path:
+            TransitIndexBuilder().build(path, 2023, 2023)
+            index = TransitIndex(path)
+            when, retrograde = index.next_station("Mercury", datetime(2023, 12, 1))
+            # Mercury stationed retrograde on 2023-12-13 around 07:09 UTC
+            self.assertEqual(retrograde, 1)
+            expected = datetime(2023, 12, 13, 7, 9, tzinfo=when.tzinfo)
+            self.assertLess(abs((when - expected).total_seconds()), 600)
+            self.assertTrue(index.is_retrograde("Mercury", datetime(2023, 12, 20)))
+
+    @skipUnless(ephemeris_available(), "ephemeris file not available")
+    def test_builder_warns_when_the_range_is_clamped(self):
+        coverage = (datetime_to_jd(datetime(2023, 1, 1)), datetime_to_jd(datetime(2023, 2, 1)))
+        with tempfile.TemporaryDirectory() as path, \
+                mock.patch.object(TransitIndexBuilder, "coverage", return_value=coverage), \
+                self.assertLogs("predictions.services.transit_index", "WARNING") as logs:
+            manifest = TransitIndexBuilder().build(path, 2023, 2023)
+        self.assertIn("2023-01-02 to 2023-01-31", logs.output[0])
+        self.assertEqual(manifest["start_jd"], coverage[0] + 1.0)
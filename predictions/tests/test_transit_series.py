@@ -0,0 +1,65 @@
+import json
+from datetime import date, datetime, timedelta, timezone
+from unittest import skipUnless
+
+import numpy as np
+from django.test import TestCase
+
+from core.users.test.factories import UserFactory
+from predictions.services.ephemeris import PLANET_TARGETS
+from predictions.services.transit_series import TransitSeries, read_binary_series
+from predictions.services.transits import TransitService
+from predictions.tests.utils import ephemeris_available
+
+
+class TransitSeriesTests(TestCase):
+
+    def test_range_and_chunking(self):
+        series = TransitSeries(datetime(2024, 1, 1), datetime(2024, 1, 2), timedelta(hours=1), chunk_size=10)
+        self.assertEqual(series.count, 25)
+
+    @skipUnless(ephemeris_available(), "ephemeris file not available")
+    def test_chunks_stream_and_match_the_snapshot_path(self):
+        series = TransitSeries(datetime(2024, 1, 1), datetime(2024, 1, 2), timedelta(hours=1), chunk_size=10)
+        chunks = list(series.chunks())
+        self.assertEqual([len(offsets) for offsets, _ in chunks], [10, 10, 5])
+        noon = chunks[1][1][2]  # 12:00
+        snapshot = TransitService(zodiac=series.zodiac).compute_snapshot(date(2024, 1, 1))
+        expected = [snapshot["planets"][name]["longitude_deg"] for name in PLANET_TARGETS]
+        np.testing.assert_allclose(noon, expected, atol=0.01)
+
+        lines = b"".join(series.ndjson()).decode().splitlines()
+        self.assertEqual(json.loads(lines[0])["count"], 25)
+        self.assertEqual(json.loads(lines[13])["time"], "2024-01-01T12:00:00Z")
+        np.testing.assert_allclose(json.loads(lines[13])["longitudes"], noon, atol=1e-4)
+
+        times, longitudes = read_binary_series(b"".join(series.binary()))
+        self.assertEqual(times[12], int(datetime(2024, 1, 1, 12, tzinfo=timezone.utc).timestamp()))
+        np.testing.assert_allclose(longitudes[12], noon, atol=1e-3)
+
+        self.client.force_login(UserFactory())
+        response = self.client.get(
+            "/api/v1/predictions/transits/series/",
+            {"start": "2024-01-01T00:00:00Z", "end": "2024-01-02T00:00:00Z", "output": "binary"},
+        )
+        self.assertEqual(response["Content-Type"], "application/octet-stream")
+        self.assertEqual(len(read_binary_series(b"".join(response.streaming_content))[1]), 25)
+
+    def test_endpoint_validates_the_range(self):
+        self.client.force_login(UserFactory())
+        url = "/api/v1/predictions/transits/series/"
+        params = {"start": "2024-01-01T00:00", "end": "2034-01-01T00:00", "step_minutes": 1}
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(url, {"start": "2024-01-02T00:00", "end": "2024-01-01T00:00"})
+        self.assertEqual(response.status_code, 400)
+
+    @skipUnless(ephemeris_available(), "ephemeris file not available")
+    def test_endpoint_rejects_ranges_outside_the_ephemeris(self):
+        self.client.force_login(UserFactory())
+        response = self.client.get(
+            "/api/v1/predictions/transits/series/",
+            {"start": "2060-01-01T00:00:00Z", "end": "2060-01-02T00:00:00Z"},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("range of the ephemeris", response.json()["errors"]["non_field_errors"][0])
@@ -0,0 +1,55 @@
+from datetime import date
+from unittest import mock, skipUnless
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from predictions.services.ephemeris import PLANET_TARGETS
+from predictions.services.transits import TransitService, clear_process_snapshots, get_daily_transit_snapshot
+from predictions.services.zodiac import get_nakshatra
+from predictions.tests.utils import ephemeris_available
+
+
+class TransitSnapshotTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        clear_process_snapshots()
+        self.addCleanup(clear_process_snapshots)
+
+    def test_nakshatra_and_pada(self):
+        self.assertEqual(get_nakshatra(0.0), ("Ashwini", 1))
+        self.assertEqual(get_nakshatra(13.5), ("Bharani", 1))
+        self.assertEqual(get_nakshatra(359.9), ("Revati", 4))
+
+    def test_snapshot_is_computed_once_per_day(self):
+        service = mock.Mock(zodiac="lahiri")
+        service.compute_snapshot.side_effect = lambda day: {"date": day.isoformat()}
+        day = date(2031, 3, 4)
+        first = get_daily_transit_snapshot(day, service=service)
+        second = get_daily_transit_snapshot(day, service=service)
+        self.assertIs(first, second)
+        service.compute_snapshot.assert_called_once_with(day)
+
+    def test_snapshots_are_cached_per_zodiac(self):
+        day = date(2031, 3, 4)
+        services = {}
+        for zodiac in ("lahiri", "tropical"):
+            services[zodiac] = mock.Mock(zodiac=zodiac)
+            services[zodiac].compute_snapshot.return_value = {"zodiac": zodiac}
+        for zodiac, service in services.items():
+            self.assertEqual(get_daily_transit_snapshot(day, service=service), {"zodiac": zodiac})
+        clear_process_snapshots()
+        tropical = services["tropical"]
+        self.assertEqual(get_daily_transit_snapshot(day, service=tropical), {"zodiac": "tropical"})
+        tropical.compute_snapshot.assert_called_once_with(day)
+
+    @skipUnless(ephemeris_available(), "ephemeris file not available")
+    def test_compute_snapshot(self):
+        # Mercury was retrograde on 2023-12-20; the Sun and Moon never are
+        snapshot = TransitService().compute_snapshot(date(2023, 12, 20))
+        self.assertEqual(set(snapshot["planets"]), set(PLANET_TARGETS))
+        self.assertTrue(snapshot["planets"]["Mercury"]["retrograde"])
+        self.assertFalse(snapshot["planets"]["Sun"]["retrograde"])
+        self.assertEqual(snapshot["planets"]["Sun"]["sign"], "Sagittarius")
+        self.assertIn(snapshot["moon_nakshatra"]["pada"], (1, 2, 3, 4))
@@ -0,0 +1,30 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from predictions.services.vargas import VARGAS, divisional_signs
+
+
+class DivisionalChartTests(SimpleTestCase):
+
+    def test_known_positions(self):
+        # 10 Aries (odd sign) and 20 Taurus (even sign)
+        signs = dict(zip(VARGAS, divisional_signs([10.0, 50.0])))
+        self.assertEqual(list(signs["D1"]), [0, 1])
+        self.assertEqual(list(signs["D2"]), [4, 4])  # Leo, Leo
+        self.assertEqual(list(signs["D3"]), [4, 9])  # Leo, Capricorn
+        self.assertEqual(list(signs["D7"]), [2, 11])  # Gemini, Pisces
+        self.assertEqual(list(signs["D9"]), [3, 3])  # Cancer, Cancer
+        self.assertEqual(list(signs["D10"]), [3, 3])  # Cancer, Cancer
+        self.assertEqual(list(signs["D12"]), [4, 9])  # Leo, Capricorn
+        self.assertEqual(list(signs["D30"]), [8, 9])  # Sagittarius, Capricorn
+        self.assertEqual(list(signs["D60"]), [8, 5])  # Sagittarius, Virgo
+
+    def test_batch_shape_matches_rows(self):
+        rng = np.random.default_rng(3)
+        batch = rng.uniform(0, 360, (50, 10))
+        signs = divisional_signs(batch)
+        self.assertEqual(signs.shape, (len(VARGAS), 50, 10))
+        self.assertEqual(signs.dtype, np.int8)
+        np.testing.assert_array_equal(signs[:, 7], divisional_signs(batch[7]))
+        with self.assertRaises(ValueError):
+            divisional_signs(batch, ("D5",))
@@ -0,0 +1,55 @@
+from unittest import mock, skipUnless
+
+from django.test import SimpleTestCase
+
+from predictions.services.warmup import WARM_UP_FAILED, WARM_UP_READY, astronomy_warm_up
+from predictions.tests.utils import ephemeris_available
+
+
+class WarmUpTests(SimpleTestCase):
+
+    def setUp(self):
+        astronomy_warm_up.reset()
+        self.addCleanup(astronomy_warm_up.reset)
+
+    def test_readiness_is_red_until_warm_up_finishes(self):
+        response = self.client.get("/api/v1/predictions/ready/")
+        self.assertEqual(response.status_code, 503)
+
+        with mock.patch.object(astronomy_warm_up.registry, "warm_up", side_effect=OSError("no ephemeris")):
+            status = astronomy_warm_up.run("test")
+        self.assertEqual(status["state"], WARM_UP_FAILED)
+        response = self.client.get("/api/v1/predictions/ready/")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["errors"]["error"], "no ephemeris")
+
+    def test_failed_warm_up_is_retried_from_the_probe_after_a_backoff(self):
+        with mock.patch.object(astronomy_warm_up.registry, "warm_up", side_effect=OSError("download failed")):
+            astronomy_warm_up.run("boot")
+        self.assertFalse(astronomy_warm_up.retry_due())
+
+        with mock.patch("predictions.services.warmup.WARM_UP_RETRY_SECONDS", 0.0), \
+                mock.patch.object(astronomy_warm_up.registry, "warm_up", return_value=0.0), \
+                mock.patch("predictions.services.astro_service.AstroService"):
+            response = self.client.get("/api/v1/predictions/ready/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["message"]["source"], "readiness probe retry")
+
+    def test_first_probe_warms_up_when_boot_warm_up_is_disabled(self):
+        with self.settings(ASTRO_WARM_UP_ON_BOOT=False), \
+                mock.patch.object(astronomy_warm_up.registry, "warm_up", return_value=0.0), \
+                mock.patch("predictions.services.astro_service.AstroService"):
+            response = self.client.get("/api/v1/predictions/ready/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["message"]["source"], "readiness probe")
+
+    @skipUnless(ephemeris_available(), "ephemeris file not available")
+    def test_warm_up_reports_timings(self):
+        status = astronomy_warm_up.run("test")
+        self.assertEqual(status["state"], WARM_UP_READY)
+        self.assertGreater(status["timings"]["total"], 0)
+        self.assertIs(astronomy_warm_up.run("again")["source"], "test")
+
+        response = self.client.get("/api/v1/predictions/ready/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["message"]["state"], WARM_UP_READY)
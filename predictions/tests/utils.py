@@ -0,0 +1,7 @@
+import os
+
+from django.conf import settings
+
+
+def ephemeris_available():
+    return os.path.exists(os.path.join(settings.SKYFIELD_DATA_DIR, settings.SKYFIELD_EPHEMERIS))
@@ -1,6 +1,9 @@
 from django.urls import path
 
-# In a real project you’d typically define or include a ViewSet/Router here.
+from .views import BirthTimeSweepView, ReadinessView, TransitSeriesView
+
 urlpatterns = [
-    # Placeholder. Add your prediction-related endpoints or ViewSets here.
+    path('ready/', ReadinessView.as_view(), name='predictions-ready'),
+    path('rectification/sweep/', BirthTimeSweepView.as_view(), name='predictions-rectification-sweep'),
+    path('transits/series/', TransitSeriesView.as_view(), name='predictions-transit-series'),
 ]
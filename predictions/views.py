@@ -1,3 +1,82 @@
-from django.shortcuts import render
+from datetime import timedelta
 
-# Create your views here.
+from django.http import StreamingHttpResponse
+
+from rest_framework import status
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.views import APIView
+
+from core.mixins import BaseApiMixin
+from .serializers import BirthTimeSweepSerializer, TransitSeriesSerializer
+from .services.astro_service import AstroService
+from .services.transit_series import BINARY_CONTENT_TYPE, NDJSON_CONTENT_TYPE, TransitSeries
+from .services.warmup import astronomy_warm_up, readiness_status
+
+
+class ReadinessView(BaseApiMixin, APIView):
+    """
+    Readiness probe: 200 once this process has finished the astronomy
+    warm-up, 503 while it is pending, running or has failed. With
+    ASTRO_WARM_UP_ON_BOOT = False the first probe runs the warm-up, and
+    failed warm-ups are retried from the probe with backoff.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        warm_up = readiness_status()
+        if astronomy_warm_up.is_ready:
+            return self.successful_response(message=warm_up)
+        return self.error_response(
+            message="Astronomy warm-up has not finished.",
+            errors=warm_up,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+
+
+class BirthTimeSweepView(BaseApiMixin, APIView):
+    """
+    Birth-time rectification: every candidate time in the window around the
+    given birth time, with its ascendant, Moon nakshatra and house placements.
+    POST data: date_of_birth, time_of_birth, latitude, longitude,
+    window_minutes (default 120), step_minutes (default 1), timezone (IANA
+    name of the birth place; blank means the date and time are UTC).
+    Candidate times are returned in that zone, with their UTC offset.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = BirthTimeSweepSerializer(data=request.data)
+        if not serializer.is_valid():
+            return self.error_response(message="Invalid sweep parameters.", errors=serializer.errors)
+
+        data = serializer.validated_data
+        candidates = AstroService().sweep_birth_times(
+            data["birth_datetime"],
+            data["latitude"],
+            data["longitude"],
+            data["window_minutes"],
+            data["step_minutes"],
+            data["timezone"],
+        )
+        return self.successful_response(message={"count": len(candidates), "candidates": candidates})
+
+
+class TransitSeriesView(BaseApiMixin, APIView):
+    """
+    Planetary longitudes over a date range, streamed as computed.
+    GET params: start, end (ISO datetimes, UTC if naive), step_minutes
+    (default 60), output ("ndjson" or "binary", see services.transit_series).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        serializer = TransitSeriesSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return self.error_response(message="Invalid transit series parameters.", errors=serializer.errors)
+
+        data = serializer.validated_data
+        series = TransitSeries(data["start"], data["end"], timedelta(minutes=data["step_minutes"]))
+        if data["output"] == "binary":
+            return StreamingHttpResponse(series.binary(), content_type=BINARY_CONTENT_TYPE)
+        return StreamingHttpResponse(series.ndjson(), content_type=NDJSON_CONTENT_TYPE)
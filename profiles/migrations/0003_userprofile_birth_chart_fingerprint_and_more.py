@@ -0,0 +1,22 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("profiles", "0002_userprofile_allow_org_access"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userprofile",
+            name="birth_chart_fingerprint",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="userprofile",
+            name="birth_chart_version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.5 on 2026-10-18 16:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("profiles", "0003_userprofile_birth_chart_fingerprint_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userprofile",
+            name="birth_timezone",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
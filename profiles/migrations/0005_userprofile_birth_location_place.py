@@ -0,0 +1,25 @@
+# Generated by Django 5.1.5 on 2026-10-18 18:02
+
+from django.db import migrations, models
+
+
+def mark_existing_locations(apps, schema_editor):
+    # Coordinates stored so far were resolved from (or entered with) the current place
+    UserProfile = apps.get_model("profiles", "UserProfile")
+    for profile in UserProfile.objects.filter(latitude__isnull=False).only("pk", "place_of_birth"):
+        UserProfile.objects.filter(pk=profile.pk).update(birth_location_place=profile.place_of_birth.strip())
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("profiles", "0004_userprofile_birth_timezone"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userprofile",
+            name="birth_location_place",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.RunPython(mark_existing_locations, migrations.RunPython.noop),
+    ]
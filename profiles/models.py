@@ -16,10 +16,18 @@ class UserProfile(AuthorTimeStampedModel):
     place_of_birth = models.CharField(max_length=255, blank=True)
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    # IANA zone of the birth place, filled in together with latitude/longitude
+    birth_timezone = models.CharField(max_length=64, blank=True)
+    # The place_of_birth latitude/longitude/birth_timezone belong to; when the
+    # place changes without them they are resolved again
+    birth_location_place = models.CharField(max_length=255, blank=True)
     phone_number = models.CharField(max_length=20, blank=True)
 
     # Optional: store the previously computed birth chart in JSON
     birth_chart = models.JSONField(default=dict, blank=True)
+    # Hash of the birth inputs + chart engine version the stored chart was built from
+    birth_chart_fingerprint = models.CharField(max_length=64, blank=True)
+    birth_chart_version = models.PositiveIntegerField(default=0)
 
     # Language for i18n or prompt usage
     preferred_language = models.CharField(max_length=10, default='en')
@@ -33,6 +33,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
             'place_of_birth',
             'latitude',
             'longitude',
+            'birth_timezone',
             'phone_number',
             'preferred_language',
             'is_deleted',
@@ -55,6 +56,21 @@ class UserProfileSerializer(serializers.ModelSerializer):
         profile = UserProfile.objects.create(user=user, **validated_data)
         return profile
 
+    def update(self, instance, validated_data):
+        # Coordinates resolved from the old place of birth no longer apply
+        new_place = validated_data.get('place_of_birth', instance.place_of_birth)
+        place_changed = new_place != instance.place_of_birth
+        coordinates_given = 'latitude' in validated_data or 'longitude' in validated_data
+        if place_changed:
+            # Location fields sent in the same request are kept
+            validated_data.setdefault('latitude', None)
+            validated_data.setdefault('longitude', None)
+            validated_data.setdefault('birth_timezone', '')
+        if place_changed or coordinates_given:
+            # The stored location fields now belong to this place (see chart_store.birth_location)
+            validated_data['birth_location_place'] = new_place.strip()
+        return super().update(instance, validated_data)
+
 
 class ProfileQuestionSerializer(serializers.ModelSerializer):
     class Meta:
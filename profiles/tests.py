@@ -1,3 +1,43 @@
+from datetime import date, time
+from unittest import mock
+
 from django.test import TestCase
 
-# Create your tests here.
+from core.users.test.factories import UserFactory
+from predictions.services.chart_store import birth_location
+from predictions.services.gazetteer import Place
+from profiles.models import UserProfile
+
+
+class UserProfileSerializerTests(TestCase):
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.profile = UserProfile.objects.create(
+            user=self.user, date_of_birth=date(1990, 5, 17), time_of_birth=time(4, 30),
+            place_of_birth="Mumbai", latitude="19.072830", longitude="72.882610",
+            birth_timezone="Asia/Kolkata", birth_location_place="Mumbai",
+        )
+        self.client.force_login(self.user)
+        self.url = f"/api/v1/profiles/profiles/{self.profile.pk}/"
+
+    def test_new_place_clears_the_derived_location(self):
+        response = self.client.patch(self.url, {"place_of_birth": "London"}, content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        profile = UserProfile.objects.get(pk=self.profile.pk)
+        self.assertEqual((profile.latitude, profile.longitude, profile.birth_timezone), (None, None, ""))
+
+    def test_zone_sent_with_a_new_place_is_kept(self):
+        response = self.client.patch(
+            self.url, {"place_of_birth": "London", "birth_timezone": "Europe/London"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        profile = UserProfile.objects.get(pk=self.profile.pk)
+        self.assertEqual((profile.latitude, profile.birth_timezone), (None, "Europe/London"))
+
+        # Resolving the place fills the coordinates but keeps the zone the client sent
+        london = Place("London", 51.50853, -0.12574, "Europe/Isle_of_Man", "GB", "ENG", 8961989)
+        with mock.patch("predictions.services.chart_store.resolve_place", return_value=london):
+            self.assertEqual(birth_location(profile), (51.50853, -0.12574))
+        self.assertEqual(profile.birth_timezone, "Europe/London")